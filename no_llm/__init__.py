@@ -14,9 +14,11 @@ from no_llm.models.config.parameters import ModelParameters, ValidationMode
 from no_llm.models.registry import ModelRegistry
 from no_llm.providers.registry import ProviderRegistry
 from no_llm.registry import Registry
+from no_llm.watcher import ConfigWatcher
 
 __all__ = [
     "Registry",
+    "ConfigWatcher",
     "ModelRegistry",
     "ModelCapability",
     "ModelMetadata",
@@ -1,3 +1,5 @@
+from dataclasses import dataclass, field
+
 from pydantic import BaseModel
 
 
@@ -8,3 +10,15 @@ class BaseResource(BaseModel):
     def is_valid(self) -> bool:
         msg = "Subclasses must implement this method"
         raise NotImplementedError(msg)
+
+
+@dataclass
+class ChangeSet:
+    """Ids of the resources a reload added, updated or removed"""
+
+    added: set[str] = field(default_factory=set)
+    updated: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
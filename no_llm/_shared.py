@@ -0,0 +1,158 @@
+"""Read-only registry images that worker processes map into memory.
+
+The image holds the same data as a snapshot, laid out so a worker can attach without parsing it all:
+
+    magic | header length (uint64, little endian) | header JSON | model configs
+
+The header lists every model with what the registry indexes it by and where its config JSON sits
+in the image, plus the providers, which are few. A worker maps the file read-only and only decodes
+a model's config when the model is first accessed, so the pages holding configs are shared by all
+workers through the page cache instead of being copied into each of them.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from no_llm._snapshot import FORMAT_VERSION, SnapshotError, SnapshotModelSpec, load_model_class, write_atomically
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from no_llm.models.config import ModelConfiguration
+
+MAGIC = b"NOLLMSHM"
+_LENGTH = struct.Struct("<Q")
+_HEADER_START = len(MAGIC) + _LENGTH.size
+
+
+def write(path: str | Path, source: str, models: list[dict[str, Any]], providers: list[dict[str, Any]]) -> None:
+    """Atomically write an image from ``_snapshot.dump_model`` / ``dump_provider`` entries"""
+    entries = []
+    blobs = []
+    offset = 0
+    for entry in models:
+        spec = SnapshotModelSpec(**entry)
+        blob = json.dumps(spec.config, separators=(",", ":")).encode()
+        entries.append(
+            [
+                spec.model_id,
+                spec.module,
+                spec.class_name,
+                spec.builtin,
+                spec.provider_types,
+                spec.capabilities,
+                spec.privacy_levels,
+                spec.mode,
+                spec.is_active,
+                spec.compatible_provider_types,
+                offset,
+                len(blob),
+            ]
+        )
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = {"format": FORMAT_VERSION, "source": source, "models": entries, "providers": providers}
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    write_atomically(path, b"".join([MAGIC, _LENGTH.pack(len(header_bytes)), header_bytes, *blobs]))
+
+
+@dataclass
+class SharedModelSpec:
+    """A model in a mapped image, decoded and built on first access"""
+
+    model_id: str
+    module: str
+    class_name: str
+    builtin: bool
+    provider_types: tuple[str, ...]
+    capabilities: list[str]
+    privacy_levels: list[str]
+    mode: str
+    is_active: bool
+    compatible_provider_types: tuple[str, ...]
+    buffer: mmap.mmap
+    offset: int
+    length: int
+
+    @property
+    def config(self) -> dict[str, Any]:
+        return json.loads(self.buffer[self.offset : self.offset + self.length])
+
+    def load_class(self) -> type[ModelConfiguration]:
+        return load_model_class(self.module, self.class_name)
+
+    def build(self) -> ModelConfiguration:
+        return self.load_class().model_validate(self.config)
+
+
+def attach(path: str | Path, source: str | None = None) -> tuple[list[SharedModelSpec], list[dict[str, Any]]]:
+    """Map an image read-only, raising ``SnapshotError`` if it is malformed or not built from ``source``
+
+    With ``source=None`` the image is used whatever it was built from.
+    """
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        msg = f"Could not map registry image {path}: {e}"
+        raise SnapshotError(msg) from e
+
+    try:
+        if buffer[: len(MAGIC)] != MAGIC:
+            msg = f"{path} is not a registry image"
+            raise SnapshotError(msg)
+        (header_length,) = _LENGTH.unpack_from(buffer, len(MAGIC))
+        blob_start = _HEADER_START + header_length
+        header = json.loads(buffer[_HEADER_START:blob_start])
+        if not isinstance(header, dict) or header.get("format") != FORMAT_VERSION:
+            msg = f"Unsupported registry image format in {path}"
+            raise SnapshotError(msg)
+        if source is not None and header.get("source") != source:
+            msg = f"Registry image {path} is stale"
+            raise SnapshotError(msg)
+        models = [
+            SharedModelSpec(
+                model_id,
+                module,
+                class_name,
+                builtin,
+                tuple(provider_types),
+                capabilities,
+                privacy_levels,
+                mode,
+                is_active,
+                tuple(compatible_provider_types),
+                buffer,
+                blob_start + offset,
+                length,
+            )
+            for (
+                model_id,
+                module,
+                class_name,
+                builtin,
+                provider_types,
+                capabilities,
+                privacy_levels,
+                mode,
+                is_active,
+                compatible_provider_types,
+                offset,
+                length,
+            ) in header["models"]
+        ]
+        providers = list(header["providers"])
+    except SnapshotError:
+        buffer.close()
+        raise
+    except (KeyError, TypeError, ValueError, struct.error) as e:
+        buffer.close()
+        msg = f"Malformed registry image {path}: {e}"
+        raise SnapshotError(msg) from e
+    return models, providers
@@ -0,0 +1,217 @@
+"""Versioned on-disk snapshots of a fully built ``Registry``.
+
+A snapshot is a compact JSON document holding every model and provider of a registry as plain data,
+together with a fingerprint of everything the registry was built from: the snapshot format, the
+package version, the built-in model manifest, the sources of the built-in models and the YAML files
+of the config directory. Loading a snapshot whose fingerprint still matches skips the YAML parsing
+and config merging entirely, and models are only turned back into configuration objects (importing
+their module) on first access.
+
+Nothing is pickled: model classes are referenced by import path and only accepted if they are
+``ModelConfiguration`` subclasses that are either built in or defined in an already imported module,
+and environment variable references are stored by name, never by value.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from no_llm.models._manifest import BUILTIN_CLASSES
+from no_llm.models.config import ModelConfiguration
+from no_llm.models.config.parameters import _compile_plan
+from no_llm.providers.env_var import EnvVar
+
+if TYPE_CHECKING:
+    from no_llm.models.config.parameters import ConfigurableModelParameters, ParameterValue
+    from no_llm.providers.config import ProviderConfiguration
+
+FORMAT_VERSION = 2
+_MANIFEST = Path(__file__).parent / "models" / "_manifest.py"
+_MODEL_CONFIGS = Path(__file__).parent / "models" / "model_configs"
+
+
+class SnapshotError(ValueError):
+    """The snapshot is unreadable, malformed or was built from different inputs"""
+
+
+def _package_version() -> str:
+    try:
+        return version("no_llm")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def fingerprint(config_dir: str | Path | None) -> str:
+    """Hash of every input a registry is built from"""
+    digest = hashlib.sha256()
+    digest.update(f"{FORMAT_VERSION}:{_package_version()}\0".encode())
+    digest.update(_MANIFEST.read_bytes())
+    for path in sorted(_MODEL_CONFIGS.rglob("*.py")):
+        digest.update(f"\0{path.relative_to(_MODEL_CONFIGS).as_posix()}\0".encode())
+        digest.update(path.read_bytes())
+    if config_dir is not None:
+        for kind in ("models", "providers"):
+            directory = Path(config_dir) / kind
+            if not directory.is_dir():
+                continue
+            for path in sorted(p for ext in ("*.yml", "*.yaml") for p in directory.glob(ext)):
+                digest.update(f"\0{kind}/{path.name}\0".encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def dump_provider(provider: ProviderConfiguration) -> dict[str, Any]:
+    # The provider serializer resolves environment variables; keep the references instead
+    data = {}
+    for field_name in type(provider).model_fields:
+        value = getattr(provider, field_name)
+        data[field_name] = value.var_name if isinstance(value, EnvVar) else value
+    return data
+
+
+def _dump_parameter(value: ParameterValue[Any]) -> dict[str, Any]:
+    # ParameterValue's serializer emits the YAML shorthand, which drops rules and capabilities
+    return {
+        "variant": value.variant.value,
+        "value": value.value,
+        "validation_rule": value.validation_rule.model_dump() if value.validation_rule is not None else None,
+        "required_capability": value.required_capability,
+    }
+
+
+def _dump_parameters(parameters: ConfigurableModelParameters) -> dict[str, Any]:
+    # Parameters left at their class default are filled back in on validation
+    return {
+        field_name: _dump_parameter(getattr(parameters, field_name))
+        for field_name, default in _compile_plan(type(parameters)).items()
+        if getattr(parameters, field_name) != default
+    }
+
+
+def dump_model(model: ModelConfiguration, *, builtin: bool) -> dict[str, Any]:
+    model_cls = type(model)
+    config = model.model_dump(mode="json", exclude={"parameters", "providers"})
+    config["providers"] = [dump_provider(provider) for provider in model.providers]
+    config["parameters"] = _dump_parameters(model.parameters)
+    return {
+        "module": model_cls.__module__,
+        "class_name": model_cls.__qualname__,
+        "builtin": builtin,
+        "compatible_provider_types": model.compatible_provider_types,
+        "config": config,
+    }
+
+
+def load_model_class(module: str, class_name: str) -> type[ModelConfiguration]:
+    """Resolve a model class named by a snapshot, never importing a module the manifest doesn't list"""
+    builtin = BUILTIN_CLASSES.get(class_name)
+    model_cls: object
+    if builtin is not None and builtin.module == module:
+        model_cls = builtin.load_class()
+    elif module in sys.modules:
+        model_cls = getattr(sys.modules[module], class_name, None)
+    else:
+        msg = f"{module}:{class_name} is not a built-in model configuration and {module} is not imported"
+        raise SnapshotError(msg)
+    if not (isinstance(model_cls, type) and issubclass(model_cls, ModelConfiguration)):
+        msg = f"{module}:{class_name} is not a model configuration"
+        raise SnapshotError(msg)
+    return model_cls
+
+
+@dataclass
+class SnapshotModelSpec:
+    """A model restored from a snapshot, built on first access"""
+
+    module: str
+    class_name: str
+    builtin: bool
+    compatible_provider_types: tuple[str, ...]
+    config: dict[str, Any]
+
+    @property
+    def model_id(self) -> str:
+        return self.config["identity"]["id"]
+
+    @property
+    def provider_types(self) -> tuple[str, ...]:
+        return tuple(provider["type"] for provider in self.config["providers"])
+
+    @property
+    def capabilities(self) -> list[str]:
+        return self.config["capabilities"]
+
+    @property
+    def privacy_levels(self) -> list[str]:
+        return self.config["metadata"]["privacy_level"]
+
+    @property
+    def mode(self) -> str:
+        return self.config["mode"]
+
+    @property
+    def is_active(self) -> bool:
+        return self.config.get("is_active", True)
+
+    def load_class(self) -> type[ModelConfiguration]:
+        return load_model_class(self.module, self.class_name)
+
+    def build(self) -> ModelConfiguration:
+        # Validated rather than constructed: model_construct leaves nested models, provider unions
+        # and parameter generics as the raw dicts of the payload
+        return self.load_class().model_validate(self.config)
+
+
+def write_atomically(path: str | Path, data: bytes) -> None:
+    """Replace ``path`` in one step, so concurrent readers never see a partial file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write(path: str | Path, source: str, models: list[dict[str, Any]], providers: list[dict[str, Any]]) -> None:
+    document = {"format": FORMAT_VERSION, "source": source, "models": models, "providers": providers}
+    write_atomically(path, json.dumps(document, separators=(",", ":")).encode())
+
+
+def read(path: str | Path, source: str) -> tuple[list[SnapshotModelSpec], list[dict[str, Any]]]:
+    """Read a snapshot, raising ``SnapshotError`` unless it was built from ``source``"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+    except (OSError, ValueError) as e:
+        msg = f"Could not read snapshot {path}: {e}"
+        raise SnapshotError(msg) from e
+
+    if not isinstance(document, dict) or document.get("format") != FORMAT_VERSION:
+        msg = f"Unsupported snapshot format in {path}"
+        raise SnapshotError(msg)
+    if document.get("source") != source:
+        msg = f"Snapshot {path} is stale"
+        raise SnapshotError(msg)
+
+    try:
+        models = [
+            SnapshotModelSpec(**{**entry, "compatible_provider_types": tuple(entry["compatible_provider_types"])})
+            for entry in document["models"]
+        ]
+        providers = list(document["providers"])
+    except (KeyError, TypeError) as e:
+        msg = f"Malformed snapshot {path}: {e}"
+        raise SnapshotError(msg) from e
+    return models, providers
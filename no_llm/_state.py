@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from typing_extensions import Self
+
+# Shared by every registry, so a generation number identifies one version of one registry
+_generations = itertools.count(1)
+
+
+class RegistryState:
+    """One version of a registry's contents.
+
+    Once published a state is never modified: readers take the current state and use it for as long
+    as they like without locking, and writers build the next version from a ``copy()`` and publish it
+    in a single assignment.
+    """
+
+    def __init__(self) -> None:
+        self.generation = next(_generations)
+        self.dirty = False
+
+    def copy(self) -> Self:
+        raise NotImplementedError
+
+
+S = TypeVar("S", bound=RegistryState)
+
+
+class Published(Generic[S]):
+    """The published state of a registry, and the lock that serializes its writers"""
+
+    def __init__(self, state: S) -> None:
+        self.state = state
+        self._lock = threading.RLock()
+        self._draft: S | None = None
+        self._bump = False
+
+    @contextmanager
+    def writing(self, *, bump: bool = True) -> Iterator[S]:
+        """Yield a draft of the next state and publish it when the block exits without an exception.
+
+        Nested blocks on the same thread share the outer draft, so a multi-step change is published
+        as one. The generation only moves when the draft was modified and ``bump`` is set; building a
+        lazily registered model, which doesn't change what the registry answers, passes False.
+        """
+        with self._lock:
+            if self._draft is not None:
+                self._bump |= bump
+                yield self._draft
+                return
+
+            draft = self._draft = self.state.copy()
+            self._bump = bump
+            try:
+                yield draft
+            finally:
+                self._draft = None
+            if draft.dirty:
+                if self._bump:
+                    draft.generation = next(_generations)
+                draft.dirty = False
+                self.state = draft
+
+    def replace(self, state: S) -> None:
+        """Publish a state built elsewhere, e.g. by a full rebuild"""
+        with self._lock:
+            state.generation = next(_generations)
+            self.state = state
@@ -1,11 +1,26 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Annotated, Any, TypeVar, get_args
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Annotated, Any, Generic, Literal, TypeVar, get_args
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader  # type: ignore[assignment]
 
 if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
     from pathlib import Path
 
 T = TypeVar("T")
+K = TypeVar("K")
+V = TypeVar("V")
 
 
 def _get_annotated_union_members(annotated_type: Annotated[Any, ...]) -> list[Any]:
@@ -27,6 +42,96 @@ def find_yaml_file(base_path: Path, name: str) -> Path:
     return base_path / f"{name}.yml"
 
 
+def list_yaml_files(directory: Path) -> list[Path]:
+    yaml_files: list[Path] = []
+    for ext in ["*.yml", "*.yaml"]:
+        yaml_files.extend(directory.glob(ext))
+    return yaml_files
+
+
+@dataclass
+class SourceFile:
+    """A config file as it was last loaded, and what loading it produced"""
+
+    stamp: tuple[int, int]
+    digest: str
+    resource_id: str | None = None
+    depends_on: frozenset[str] = frozenset()
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_source_file(path: Path) -> SourceFile:
+    return SourceFile(_stamp(path), hashlib.sha256(path.read_bytes()).hexdigest())
+
+
+def scan_source_files(
+    paths: Sequence[Path], sources: dict[Path, SourceFile]
+) -> tuple[dict[Path, SourceFile], list[Path]]:
+    """Compare config files with what ``sources`` recorded when they were last loaded.
+
+    Returns a record for every file that still exists and the files that are new or were edited.
+    Files whose size and modification time match are assumed unchanged without being read; the
+    others are hashed, so touching a file without editing it doesn't count as a change.
+    """
+    current = {}
+    changed = []
+    for path in paths:
+        known = sources.get(path)
+        try:
+            if known is not None and known.stamp == _stamp(path):
+                current[path] = known
+                continue
+            record = read_source_file(path)
+        except OSError:
+            # Removed while scanning, it counts as deleted
+            continue
+        if known is not None and known.digest == record.digest:
+            known.stamp = record.stamp
+            current[path] = known
+            continue
+        current[path] = record
+        changed.append(path)
+    return current, changed
+
+
+def load_yaml(path: Path) -> Any:
+    """``yaml.safe_load`` a file, with the libyaml parser when PyYAML was built with it"""
+    with open(path) as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+def _load_yaml_or_error(path: Path) -> Any:
+    try:
+        return load_yaml(path)
+    except Exception as e:  # noqa: BLE001
+        return e
+
+
+# Below this many files a pool costs more to start than it saves
+_PARALLEL_MIN_FILES = 16
+
+
+def load_yaml_files(
+    paths: Sequence[Path], *, workers: int = 0, executor: Literal["thread", "process"] = "thread"
+) -> list[Any]:
+    """Parse many YAML files, optionally in a pool of ``workers`` threads or processes.
+
+    Results are returned in the order of ``paths``. A file that fails to open or parse yields its
+    exception instead of raising, so one bad file doesn't stop the others from loading.
+    """
+    if workers <= 1 or len(paths) < _PARALLEL_MIN_FILES:
+        return [_load_yaml_or_error(path) for path in paths]
+    pool_cls: type[ThreadPoolExecutor | ProcessPoolExecutor] = (
+        ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    )
+    with pool_cls(max_workers=workers) as pool:
+        return list(pool.map(_load_yaml_or_error, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+
 def merge_configs(base: dict, override: dict) -> dict:
     merged = base.copy()
     for key, value in override.items():
@@ -35,3 +140,53 @@ def merge_configs(base: dict, override: dict) -> dict:
         else:
             merged[key] = value
     return merged
+
+
+def freeze(value: Any) -> Hashable:
+    """Turn nested dicts/lists/sets into an equivalent hashable value, independent of dict ordering"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, list | tuple):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set | frozenset):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+class LRUCache(Generic[K, V]):
+    """Small thread-safe least-recently-used cache"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def resize(self, maxsize: int) -> None:
+        """Change the capacity, dropping the least recently used entries that no longer fit"""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,444 @@
+"""Routes of a ``NoLLMModel`` and the state used to pick between them.
+
+A route is one way to serve a request: the pydantic-ai model of one provider (and location) of a model
+configuration. ``RouteTracker`` keeps an exponentially weighted moving average of the latency and error
+rate of every route, shared by all models using it, and orders attempts so the fastest healthy route
+goes first while routes that are about as fast keep their preference order. ``CircuitBreakers`` stop
+sending requests to a route that keeps failing until it had time to recover, ``HedgePolicy``
+decides when a slow request gets a concurrent one on the next route. ``StreamRace`` opens streams on
+several routes and keeps the first one to produce content, and ``StreamDeadlines`` abandon a stream
+that stalls before its content reaches the caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import TYPE_CHECKING
+
+import httpx
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from pydantic_ai.models import Model
+
+    from no_llm.models.config.model import ModelConfiguration
+    from no_llm.providers.config import ProviderConfiguration
+
+# Model id, provider type, provider id and location
+RouteKey = tuple[str, str, str, "str | None"]
+
+
+# Status codes that blame the provider rather than the request, besides server errors
+_TRANSIENT_STATUS_CODES = frozenset({408, 429})
+
+
+def route_key(model_cfg: ModelConfiguration, provider: ProviderConfiguration) -> RouteKey:
+    return (model_cfg.identity.id, provider.type, provider.id, getattr(provider, "current", None))
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed attempt says something about the health of its route
+
+    Server errors, rate limits, timeouts and connection errors do. Errors caused by the request itself,
+    such as a 400 for an invalid prompt, would fail on any route and don't.
+    """
+    cause: BaseException | None = error
+    seen: set[int] = set()
+    while cause is not None and id(cause) not in seen:
+        seen.add(id(cause))
+        # pydantic-ai's ModelHTTPError as well as the SDKs' status errors
+        status_code = getattr(cause, "status_code", None)
+        if isinstance(status_code, int):
+            return status_code >= 500 or status_code in _TRANSIENT_STATUS_CODES
+        if isinstance(cause, TimeoutError | asyncio.TimeoutError | ConnectionError | httpx.TransportError):
+            return True
+        # SDKs wrap the connection errors of their HTTP client
+        cause = cause.__cause__
+    return False
+
+
+@dataclass
+class Route:
+    """The pydantic-ai model serving a configuration through one provider and location"""
+
+    model: Model
+    config: ModelConfiguration
+    key: RouteKey
+    # Position in the fallback chain, lower is preferred
+    preference: int
+
+
+@dataclass
+class RouteStats:
+    """Moving averages of one route, the error rate counting failures as 1 and successes as 0"""
+
+    latency: float | None = None
+    error_rate: float = 0.0
+    updated_at: float = 0.0
+
+
+class RouteTracker:
+    """Latency and error statistics of routes, used to order the attempts of a request
+
+    Healthy routes are tried first, fastest first. Latencies are compared in buckets ``tolerance`` wide,
+    and routes in the same bucket keep their preference order, so a fallback only overtakes when it is
+    clearly faster. Routes without measurements are assumed to be as fast as the best measured one.
+    Unhealthy routes come last. Without new samples their error rate decays, so they get retried.
+
+    Args:
+        alpha: Weight of the newest sample in the moving averages
+        error_threshold: Error rate from which a route counts as unhealthy
+        error_half_life: Seconds for the error rate of an idle route to halve
+        tolerance: Relative latency difference below which routes keep their preference order
+        window: Latest latencies of each route kept for ``latency_quantile``
+    """
+
+    def __init__(
+        self,
+        *,
+        alpha: float = 0.3,
+        error_threshold: float = 0.5,
+        error_half_life: float = 60.0,
+        tolerance: float = 0.25,
+        window: int = 100,
+    ) -> None:
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.error_half_life = error_half_life
+        self.tolerance = tolerance
+        self.window = window
+        self._stats: dict[RouteKey, RouteStats] = {}
+        self._samples: dict[RouteKey, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def _error_rate(self, stats: RouteStats, now: float) -> float:
+        return stats.error_rate * 0.5 ** ((now - stats.updated_at) / self.error_half_life)
+
+    def record(self, key: RouteKey, latency: float, *, ok: bool) -> None:
+        """Add the outcome of one attempt, only successful attempts count towards the latency"""
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = RouteStats(updated_at=now)
+            error = 0.0 if ok else 1.0
+            stats.error_rate = (1 - self.alpha) * self._error_rate(stats, now) + self.alpha * error
+            stats.updated_at = now
+            if ok:
+                self._add_latency(key, stats, latency)
+
+    def record_latency(self, key: RouteKey, latency: float) -> None:
+        """Add the latency of an attempt that was cancelled before it answered, leaving the error rate alone"""
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = RouteStats(updated_at=time.monotonic())
+            self._add_latency(key, stats, latency)
+
+    def _add_latency(self, key: RouteKey, stats: RouteStats, latency: float) -> None:
+        if stats.latency is None:
+            stats.latency = latency
+        else:
+            stats.latency = (1 - self.alpha) * stats.latency + self.alpha * latency
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def stats(self, key: RouteKey) -> RouteStats | None:
+        """A copy of the statistics of ``key``, with the error rate decayed to now"""
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                return None
+            now = time.monotonic()
+            return RouteStats(stats.latency, self._error_rate(stats, now), now)
+
+    def latency_quantile(self, key: RouteKey, q: float) -> float | None:
+        """The ``q`` quantile of the latest successful latencies of ``key``, None before the first one"""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def is_healthy(self, key: RouteKey) -> bool:
+        stats = self.stats(key)
+        return stats is None or stats.error_rate < self.error_threshold
+
+    def order(self, routes: Sequence[Route]) -> tuple[list[Route], list[Route]]:
+        """Split ``routes`` into the healthy ones, fastest first, and the unhealthy ones, least failing first"""
+        stats = {route.key: self.stats(route.key) for route in routes}
+        healthy = []
+        unhealthy = []
+        for route in routes:
+            route_stats = stats[route.key]
+            if route_stats is None or route_stats.error_rate < self.error_threshold:
+                healthy.append(route)
+            else:
+                unhealthy.append(route)
+
+        measured = [s.latency for r in healthy if (s := stats[r.key]) is not None and s.latency is not None]
+        best = min(measured, default=None)
+
+        def bucket(route: Route) -> int:
+            route_stats = stats[route.key]
+            if best is None or best <= 0 or route_stats is None or route_stats.latency is None:
+                return 0
+            return math.floor(math.log(route_stats.latency / best) / math.log1p(self.tolerance))
+
+        healthy.sort(key=lambda route: (bucket(route), route.preference))
+        unhealthy.sort(key=lambda route: (stats[route.key].error_rate, route.preference))  # type: ignore[union-attr]
+        return healthy, unhealthy
+
+    def reset(self) -> None:
+        """Forget all statistics"""
+        with self._lock:
+            self._stats.clear()
+            self._samples.clear()
+
+
+route_tracker = RouteTracker()
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class BreakerStatus:
+    """The circuit breaker of one route"""
+
+    state: BreakerState = BreakerState.CLOSED
+    # Consecutive failures
+    failures: int = 0
+    opened_at: float | None = None
+    # Whether the one request a half-open breaker lets through is running
+    probing: bool = False
+
+
+class CircuitBreakers:
+    """Circuit breakers of routes, so requests skip a failing route instead of waiting on it
+
+    A breaker opens after ``failure_threshold`` consecutive failures and rejects requests for
+    ``cooldown`` seconds. It then turns half-open and lets one request through: the breaker closes
+    again if that request succeeds and reopens for another cooldown if it fails.
+
+    Args:
+        failure_threshold: Consecutive failures that open a breaker
+        cooldown: Seconds an open breaker rejects requests
+    """
+
+    def __init__(self, *, failure_threshold: int = 5, cooldown: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._status: dict[RouteKey, BreakerStatus] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self, status: BreakerStatus, now: float) -> BreakerStatus:
+        if (
+            status.state == BreakerState.OPEN
+            and status.opened_at is not None
+            and now - status.opened_at >= self.cooldown
+        ):
+            status.state = BreakerState.HALF_OPEN
+        return status
+
+    def acquire(self, key: RouteKey) -> bool:
+        """Whether a request may use the route now
+
+        A half-open breaker lets one request through at a time, the caller must report its outcome with
+        ``record`` or give the slot back with ``release``.
+        """
+        with self._lock:
+            status = self._status.get(key)
+            if status is None:
+                return True
+            state = self._refresh(status, time.monotonic()).state
+            if state == BreakerState.CLOSED:
+                return True
+            if state == BreakerState.HALF_OPEN and not status.probing:
+                status.probing = True
+                return True
+            return False
+
+    def release(self, key: RouteKey) -> None:
+        """Give back a half-open slot without an outcome, e.g. when the request was cancelled"""
+        with self._lock:
+            status = self._status.get(key)
+            if status is not None:
+                status.probing = False
+
+    def record(self, key: RouteKey, *, ok: bool) -> None:
+        with self._lock:
+            status = self._status.get(key)
+            if ok:
+                if status is not None and status.state != BreakerState.CLOSED:
+                    logger.info(f"Circuit closed for {key}")
+                self._status.pop(key, None)
+                return
+            if status is None:
+                status = self._status[key] = BreakerStatus()
+            now = time.monotonic()
+            status.failures += 1
+            status.probing = False
+            if self._refresh(status, now).state == BreakerState.HALF_OPEN or (
+                status.state == BreakerState.CLOSED and status.failures >= self.failure_threshold
+            ):
+                status.state = BreakerState.OPEN
+                status.opened_at = now
+                logger.warning(f"Circuit opened for {key} after {status.failures} failures")
+
+    def state(self, key: RouteKey) -> BreakerState:
+        with self._lock:
+            status = self._status.get(key)
+            return BreakerState.CLOSED if status is None else self._refresh(status, time.monotonic()).state
+
+    def snapshot(self) -> dict[RouteKey, BreakerStatus]:
+        """Copies of the breakers that are not closed or have recent failures, by route"""
+        with self._lock:
+            now = time.monotonic()
+            return {key: replace(self._refresh(status, now)) for key, status in self._status.items()}
+
+    def reset(self, key: RouteKey | None = None) -> None:
+        """Close the breaker of ``key``, or all of them"""
+        with self._lock:
+            if key is None:
+                self._status.clear()
+            else:
+                self._status.pop(key, None)
+
+
+circuit_breakers = CircuitBreakers()
+
+
+class HedgePolicy:
+    """When a request starts a concurrent one on the next route, and how many it may start
+
+    A hedge starts when the latest attempt hasn't answered after ``delay`` seconds, by default the
+    ``quantile`` latency of its route. Hedges are paid from a budget: every request adds ``budget``
+    tokens, up to ``burst``, and every hedge takes one, so on average at most a ``budget`` fraction of
+    requests is sent twice. The budget starts full. ``wins`` counts the route that answered each
+    request, hedged or not.
+
+    Args:
+        delay: Fixed seconds to wait before hedging, None uses the latency of the route
+        quantile: Latency quantile of the route to wait for when ``delay`` is None
+        default_delay: Seconds to wait when the route has no latencies yet
+        max_hedges: Hedges one request starts at most
+        budget: Hedges earned by each request
+        burst: Hedges that can be saved up
+    """
+
+    def __init__(
+        self,
+        *,
+        delay: float | None = None,
+        quantile: float = 0.95,
+        default_delay: float = 2.0,
+        max_hedges: int = 1,
+        budget: float = 0.1,
+        burst: float = 10.0,
+    ) -> None:
+        self.delay = delay
+        self.quantile = quantile
+        self.default_delay = default_delay
+        self.max_hedges = max_hedges
+        self.budget = budget
+        self.burst = burst
+        self.hedged = 0
+        self.hedges_won = 0
+        self.wins: dict[RouteKey, int] = {}
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def delay_for(self, key: RouteKey, tracker: RouteTracker | None) -> float:
+        if self.delay is not None:
+            return self.delay
+        latency = tracker.latency_quantile(key, self.quantile) if tracker is not None else None
+        return self.default_delay if latency is None else latency
+
+    def deposit(self) -> None:
+        """Add the share of hedges one request earns"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+    def spend(self) -> bool:
+        """Take one hedge from the budget, False when it's used up"""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedged += 1
+            return True
+
+    def record_win(self, key: RouteKey, *, is_hedge: bool) -> None:
+        """Count the route that answered a request"""
+        with self._lock:
+            self.wins[key] = self.wins.get(key, 0) + 1
+            if is_hedge:
+                self.hedges_won += 1
+
+
+class StreamRace:
+    """Racing of streams: open ``routes`` streams at once and keep the first one to produce content
+
+    The others are cancelled. Every race adds the time to first token (TTFT) of the winner and the
+    number of wasted streams, opened or still opening when they were cancelled, to the metrics.
+
+    Args:
+        routes: Streams open at the same time, at least 1
+        window: Latest TTFTs kept in ``ttfts``
+    """
+
+    def __init__(self, *, routes: int = 2, window: int = 100) -> None:
+        if routes < 1:
+            msg = f"A stream race needs at least 1 route, got {routes}"
+            raise ValueError(msg)
+        self.routes = routes
+        self.races = 0
+        self.wasted = 0
+        self.ttfts: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, ttft: float, wasted: int) -> None:
+        with self._lock:
+            self.races += 1
+            self.wasted += wasted
+            self.ttfts.append(ttft)
+
+
+@dataclass
+class StreamDeadlines:
+    """Deadlines of a stream until its first content, a stream missing one is cancelled for the next route
+
+    Args:
+        first_token: Seconds from the start of an attempt to its first content
+        idle: Seconds the stream may go without an event, counted from when it opened
+    """
+
+    first_token: float | None = None
+    idle: float | None = None
+
+    def deadline(self, start: float, active_at: float | None, now: float) -> float:
+        """When an attempt that started at ``start`` and last made progress at ``active_at`` expires
+
+        Before the stream opened the idle deadline is counted from ``now``, so it can't expire yet but the
+        caller wakes up in time to count it from the opening.
+        """
+        deadline = math.inf
+        if self.first_token is not None:
+            deadline = start + self.first_token
+        if self.idle is not None:
+            deadline = min(deadline, (now if active_at is None else active_at) + self.idle)
+        return deadline
@@ -4,11 +4,6 @@ import sys
 from typing import TYPE_CHECKING
 
 from loguru import logger
-from pydantic_ai.models.anthropic import AnthropicModel
-from pydantic_ai.models.google import GoogleModel
-from pydantic_ai.models.groq import GroqModel
-from pydantic_ai.models.mistral import MistralModel
-from pydantic_ai.models.openai import OpenAIModel, OpenAIResponsesModel
 
 from no_llm.models.config.enums import ModelMode
 from no_llm.providers import (
@@ -25,16 +20,21 @@ from no_llm.providers import (
     TogetherProvider,
     VertexProvider,
 )
+from no_llm.providers.clients import get_pydantic_provider
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from pydantic_ai.models import (
         Model,
     )
 
     from no_llm.models.config.model import ModelConfiguration
+    from no_llm.providers.config import ProviderConfiguration
 
 
 def pydantic_mistral_gcp_patch():
+    import pydantic_ai.models.mistral  # noqa: F401
     from mistralai_gcp import (
         CompletionChunk as MistralCompletionChunk,
     )
@@ -111,12 +111,8 @@ def pydantic_mistral_gcp_patch():
     # sys.modules['pydantic_ai.models.mistral'].MistralImageURLChunk = MistralImageURLChunk  # type: ignore
 
 
-def _get_pydantic_model(
-    model_cfg: ModelConfiguration,
-) -> list[tuple[Model, ModelConfiguration]]:
-    """Get the appropriate pydantic-ai model based on no_llm.models.configuration."""
-    models: list[tuple[Model, ModelConfiguration]] = []
-
+def _check_pydantic_compatible(model_cfg: ModelConfiguration) -> None:
+    """Raise ``TypeError`` if no pydantic-ai model can be built for ``model_cfg``"""
     if model_cfg.integration_aliases is None:
         msg = "Model must have integration aliases. It is required for pydantic-ai integration."
         raise TypeError(msg)
@@ -126,45 +122,62 @@ def _get_pydantic_model(
     if model_cfg.mode != ModelMode.CHAT:
         msg = f"Model {model_cfg.identity.id} must be a chat model"
         raise TypeError(msg)
-    pyd_model: Model | None = None
+
+
+def _iter_pydantic_models(
+    model_cfg: ModelConfiguration,
+) -> Iterator[tuple[Model, ModelConfiguration, ProviderConfiguration]]:
+    """Build the pydantic-ai model of each provider (and location) of ``model_cfg`` as the iteration reaches it
+
+    Providers whose model can't be built are logged and skipped.
+    """
+    from pydantic_ai.models.anthropic import AnthropicModel
+    from pydantic_ai.models.google import GoogleModel
+    from pydantic_ai.models.groq import GroqModel
+    from pydantic_ai.models.mistral import MistralModel
+    from pydantic_ai.models.openai import OpenAIModel, OpenAIResponsesModel
+
+    _check_pydantic_compatible(model_cfg)
+    assert model_cfg.integration_aliases is not None
     for provider in model_cfg.iter():
+        pyd_model: Model | None = None
         try:
             if isinstance(provider, VertexProvider):
                 if "mistral" in model_cfg.identity.id:
                     pydantic_mistral_gcp_patch()
                     pyd_model = MistralModel(
                         model_name=model_cfg.integration_aliases.pydantic_ai or model_cfg.identity.id,
-                        provider=provider.to_pydantic(),  # type: ignore
+                        provider=get_pydantic_provider(provider, "mistral"),  # type: ignore
                     )
                 elif "claude" in model_cfg.identity.id:
                     pyd_model = AnthropicModel(
                         model_name=model_cfg.integration_aliases.pydantic_ai or model_cfg.identity.id,
-                        provider=provider.to_pydantic(),  # type: ignore
+                        provider=get_pydantic_provider(provider, "claude"),  # type: ignore
                     )
                 elif "gemini" in model_cfg.identity.id:
                     pyd_model = GoogleModel(
                         model_name=model_cfg.integration_aliases.pydantic_ai or model_cfg.identity.id,
-                        provider=provider.to_pydantic(),  # type: ignore
+                        provider=get_pydantic_provider(provider, "gemini"),  # type: ignore
                     )
             elif isinstance(provider, AnthropicProvider):
                 pyd_model = AnthropicModel(
                     model_name=model_cfg.integration_aliases.pydantic_ai or model_cfg.identity.id,
-                    provider=provider.to_pydantic(),
+                    provider=get_pydantic_provider(provider),
                 )
             elif isinstance(provider, MistralProvider):
                 pyd_model = MistralModel(
                     model_name=model_cfg.integration_aliases.pydantic_ai or model_cfg.identity.id,
-                    provider=provider.to_pydantic(),
+                    provider=get_pydantic_provider(provider),
                 )
             elif isinstance(provider, GroqProvider):
                 pyd_model = GroqModel(
                     model_name=model_cfg.integration_aliases.pydantic_ai or model_cfg.identity.id,
-                    provider=provider.to_pydantic(),
+                    provider=get_pydantic_provider(provider),
                 )
             elif isinstance(provider, OpenRouterProvider):
                 pyd_model = OpenAIModel(
                     model_name=model_cfg.integration_aliases.openrouter or model_cfg.identity.id,
-                    provider=provider.to_pydantic(),
+                    provider=get_pydantic_provider(provider),
                 )
             elif isinstance(
                 provider,
@@ -177,19 +190,25 @@ def _get_pydantic_model(
             ):
                 pyd_model = OpenAIModel(
                     model_name=model_cfg.integration_aliases.pydantic_ai or model_cfg.identity.id,
-                    provider=provider.to_pydantic(),
+                    provider=get_pydantic_provider(provider),
                 )
             elif isinstance(provider, OpenAIProvider):
                 pyd_model = OpenAIResponsesModel(
                     model_name=model_cfg.integration_aliases.pydantic_ai or model_cfg.identity.id,
-                    provider=provider.to_pydantic(),
+                    provider=get_pydantic_provider(provider),
                 )
         except Exception as e:  # noqa: BLE001
             logger.opt(exception=e).warning(f"Failed to create model for provider {type(provider).__name__}")
             continue
         if pyd_model is not None:
-            models.append((pyd_model, model_cfg))
+            yield pyd_model, model_cfg, provider
+
 
+def _get_pydantic_model(
+    model_cfg: ModelConfiguration,
+) -> list[tuple[Model, ModelConfiguration]]:
+    """Get the appropriate pydantic-ai model based on no_llm.models.configuration."""
+    models = [(pyd_model, cfg) for pyd_model, cfg, _ in _iter_pydantic_models(model_cfg)]
     if not models:
         msg = "Couldn't build any models for pydantic-ai integration"
         raise RuntimeError(msg)
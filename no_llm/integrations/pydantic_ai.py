@@ -1,12 +1,18 @@
 from __future__ import annotations as _annotations
 
+import asyncio
+import itertools
+import math
+import threading
+import time
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 from no_llm.models.config.parameters import ModelParameters
 
 try:
+    from pydantic_ai.messages import FinalResultEvent, PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta
     from pydantic_ai.models import (
         Model,
         ModelRequestParameters,
@@ -21,17 +27,31 @@ except ImportError as _import_error:
 
 from loguru import logger
 
-from no_llm.integrations._utils import _get_pydantic_model
+from no_llm.integrations._routing import (
+    CircuitBreakers,
+    HedgePolicy,
+    Route,
+    RouteTracker,
+    StreamDeadlines,
+    StreamRace,
+    circuit_breakers,
+    is_transient,
+    route_key,
+    route_tracker,
+)
+from no_llm.integrations._utils import _check_pydantic_compatible, _iter_pydantic_models
 from no_llm.models.config.model import ModelConfiguration
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Iterator
 
     from pydantic_ai.messages import (
+        AgentStreamEvent,
         ModelMessage,
         ModelResponse,
     )
     from pydantic_ai.settings import ModelSettings as PydanticModelSettings
+    from pydantic_ai.tools import RunContext
 
 ToolName = str
 ModelPair = tuple[Model, ModelConfiguration]
@@ -39,13 +59,117 @@ ModelPair = tuple[Model, ModelConfiguration]
 
 @dataclass
 class NoLLMModel(Model):
+    """A pydantic-ai model that falls back through the providers of several model configurations
+
+    Only the first model of the chain is built up front, the fallbacks are built (once) when a request
+    first reaches them. With a ``tracker`` the attempts of each request are ordered by the recent latency
+    and error rate of every route (configuration, provider and location), fastest healthy route first;
+    without one they follow the chain. With ``breakers`` a route that keeps failing is skipped without
+    a request until its cooldown has passed. With ``hedge`` a request that is slower than usual gets a
+    concurrent one on the next route, and the first response wins. With ``race`` streams are opened on
+    several routes and the first one to produce content is kept. With ``deadlines`` a stream that stalls
+    before its first content is cancelled and the next route takes over.
+
+    Args:
+        default_model: Preferred configuration
+        fallback_models: Configurations to fall back to, in order of preference
+        tracker: Statistics to order attempts by, shared by all models by default. None keeps the chain order
+        breakers: Circuit breakers of the routes, shared by all models by default. None tries every route
+        hedge: Hedging of slow requests, off by default
+        race: Racing of streams for the first token, off by default
+        deadlines: Deadlines of streams until their first content, off by default
+    """
+
     def __init__(
         self,
         default_model: ModelConfiguration,
         *fallback_models: ModelConfiguration,
+        tracker: RouteTracker | None = route_tracker,
+        breakers: CircuitBreakers | None = circuit_breakers,
+        hedge: HedgePolicy | None = None,
+        race: StreamRace | None = None,
+        deadlines: StreamDeadlines | None = None,
     ):
-        self.models: list[ModelPair] = self._get_pydantic_models([default_model, *fallback_models])
-        self._current_model: ModelPair = self.models[0]
+        model_cfgs = [default_model, *fallback_models]
+        for model_cfg in model_cfgs:
+            _check_pydantic_compatible(model_cfg)
+        self.tracker = tracker
+        self.breakers = breakers
+        self.hedge = hedge
+        self.race = race
+        self.deadlines = deadlines
+        self._pending = itertools.chain.from_iterable(map(_iter_pydantic_models, model_cfgs))
+        self._routes: list[Route] = []
+        self._build_lock = threading.Lock()
+        first = next(self._iter_routes(), None)
+        if first is None:
+            msg = "Couldn't build any models for pydantic-ai integration"
+            raise RuntimeError(msg)
+        self._current_model: ModelPair = (first.model, first.config)
+
+    @property
+    def models(self) -> list[ModelPair]:
+        """Every model of the fallback chain, building the ones no request has reached yet"""
+        return [(route.model, route.config) for route in self._iter_routes()]
+
+    def _iter_routes(self, start: int = 0) -> Iterator[Route]:
+        """The routes in chain order from ``start``, each built when the iteration first reaches it"""
+        index = start
+        while True:
+            if index >= len(self._routes):
+                with self._build_lock:
+                    if index >= len(self._routes):
+                        built = next(self._pending, None)
+                        if built is None:
+                            return
+                        pyd_model, model_cfg, provider = built
+                        self._routes.append(Route(pyd_model, model_cfg, route_key(model_cfg, provider), index))
+            yield self._routes[index]
+            index += 1
+
+    def _attempts(self) -> Iterator[Route]:
+        """The routes in the order a request tries them"""
+        if self.tracker is None:
+            yield from self._iter_routes()
+            return
+        built = list(self._routes)
+        healthy, unhealthy = self.tracker.order(built)
+        yield from healthy
+        # Routes not built yet have no say in the ordering, they go after the healthy ones in chain order
+        for route in self._iter_routes(len(built)):
+            if self.tracker.is_healthy(route.key):
+                yield route
+            else:
+                unhealthy.append(route)
+        yield from unhealthy
+
+    def _acquire(self, route: Route) -> bool:
+        return self.breakers is None or self.breakers.acquire(route.key)
+
+    def _release(self, route: Route) -> None:
+        if self.breakers is not None:
+            self.breakers.release(route.key)
+
+    def _record(self, route: Route, start: float, *, ok: bool) -> None:
+        if self.tracker is not None:
+            self.tracker.record(route.key, time.perf_counter() - start, ok=ok)
+        if self.breakers is not None:
+            self.breakers.record(route.key, ok=ok)
+
+    def _record_error(self, route: Route, start: float, error: BaseException) -> None:
+        """Count a failed attempt against its route, unless the request itself was at fault"""
+        if is_transient(error):
+            self._record(route, start, ok=False)
+        else:
+            self._release(route)
+
+    @staticmethod
+    def _all_failed(last_error: Exception | None, skipped: list[Route]) -> RuntimeError:
+        if last_error is None and skipped:
+            msg = f"All models failed. Circuits are open for: {', '.join(str(route.key) for route in skipped)}"
+        else:
+            msg = f"All models failed. Last error: {last_error}"
+        return RuntimeError(msg)
 
     @property
     def current_model(self) -> Model:
@@ -65,30 +189,15 @@ class NoLLMModel(Model):
         """The system / model provider, ex: openai."""
         return "no_llm"
 
-    def _get_pydantic_models(
-        self,
-        model_cfgs: list[ModelConfiguration],
-    ) -> list[tuple[Model, ModelConfiguration]]:
-        """Get the appropriate pydantic-ai model based on no_llm.models.configuration."""
-        models: list[tuple[Model, ModelConfiguration]] = []
-
-        for model_cfg in model_cfgs:
-            models.extend(_get_pydantic_model(model_cfg))
-        if not models:
-            msg = "Couldn't build any models for pydantic-ai integration"
-            raise RuntimeError(msg)
-        return models
-
     def _get_model_settings(
         self,
         model: ModelConfiguration,
         user_settings: PydanticModelSettings | None = None,
     ) -> PydanticModelSettings:
         """Get merged model settings from no_llm.models.config and user settings."""
-        new_model = model.model_copy(deep=True)
-        if user_settings is not None:
-            new_model.set_parameters(ModelParameters.from_pydantic(user_settings))
-        return new_model.to_pydantic_settings()
+        if user_settings is None:
+            return model.resolve_settings()
+        return model.resolve_settings(ModelParameters.from_pydantic(user_settings))
 
     async def request(
         self,
@@ -96,20 +205,147 @@ class NoLLMModel(Model):
         model_settings: PydanticModelSettings | None,
         model_request_parameters: ModelRequestParameters,
     ) -> ModelResponse:
+        if self.hedge is not None:
+            return await self._hedged_request(self.hedge, messages, model_settings, model_request_parameters)
         last_error = None
-        for pyd_model, model in self.models:
+        skipped: list[Route] = []
+        for route in self._attempts():
+            if not self._acquire(route):
+                skipped.append(route)
+                continue
+            pyd_model, model = route.model, route.config
+            start = time.perf_counter()
             try:
                 self._current_model = (pyd_model, model)
                 merged_settings = self._get_model_settings(model, model_settings)
                 customized_request_parameters = pyd_model.customize_request_parameters(model_request_parameters)
-                return await pyd_model.request(messages, merged_settings, customized_request_parameters)
+                response = await pyd_model.request(messages, merged_settings, customized_request_parameters)
             except Exception as e:  # noqa: BLE001
+                self._record_error(route, start, e)
                 last_error = e
                 logger.warning(f"Model {model.identity.id} failed, trying next fallback. Error: {e}")
                 continue
+            except BaseException:
+                # Cancelled, the route didn't get to fail
+                self._release(route)
+                raise
+            self._record(route, start, ok=True)
+            return response
+
+        raise self._all_failed(last_error, skipped) from last_error
+
+    async def _attempt(
+        self,
+        route: Route,
+        messages: list[ModelMessage],
+        model_settings: PydanticModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        merged_settings = self._get_model_settings(route.config, model_settings)
+        customized_request_parameters = route.model.customize_request_parameters(model_request_parameters)
+        return await route.model.request(messages, merged_settings, customized_request_parameters)
+
+    async def _hedged_request(
+        self,
+        hedge: HedgePolicy,
+        messages: list[ModelMessage],
+        model_settings: PydanticModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        """Like ``request``, but starts the next route too when the latest attempt is slow"""
+        hedge.deposit()
+        routes = self._attempts()
+        # Attempt of each task: its route, when it started and whether it is a hedge
+        running: dict[asyncio.Task[ModelResponse], tuple[Route, float, bool]] = {}
+        skipped: list[Route] = []
+        last_error = None
+        hedges = 0
+        latest: Route | None = None
+        hedge_at: float | None = None
+        # A route taken from ``routes`` but not started, because the hedge budget ran out
+        spare: Route | None = None
+
+        def next_route() -> Route | None:
+            nonlocal spare
+            for route in itertools.chain([spare] if spare is not None else [], routes):
+                spare = None
+                if self._acquire(route):
+                    return route
+                skipped.append(route)
+            return None
+
+        def start(route: Route, *, is_hedge: bool = False) -> None:
+            nonlocal latest, hedge_at
+            started = time.perf_counter()
+            task = asyncio.ensure_future(self._attempt(route, messages, model_settings, model_request_parameters))
+            running[task] = (route, started, is_hedge)
+            latest = route
+            hedge_at = started + hedge.delay_for(route.key, self.tracker)
+
+        def start_next() -> None:
+            nonlocal hedge_at
+            route = next_route()
+            if route is None:
+                hedge_at = None
+            else:
+                start(route)
 
-        msg = f"All models failed. Last error: {last_error}"
-        raise RuntimeError(msg) from last_error
+        try:
+            start_next()
+            while running:
+                timeout = None
+                if hedge_at is not None and hedges < hedge.max_hedges:
+                    timeout = max(0.0, hedge_at - time.perf_counter())
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge_at = None
+                    # Only a hedge that actually starts is paid for
+                    route = next_route()
+                    if route is not None and hedge.spend():
+                        hedges += 1
+                        logger.debug(f"Route {latest.key if latest else None} is slow, hedging on the next one")
+                        start(route, is_hedge=True)
+                    elif route is not None:
+                        self._release(route)
+                        spare = route
+                    continue
+                # Attempts finishing together are all recorded, the most preferred success wins
+                won: tuple[Route, float, bool, ModelResponse] | None = None
+                for task in done:
+                    route, started, is_hedge = running.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:  # noqa: BLE001
+                        self._record_error(route, started, e)
+                        last_error = e
+                        logger.warning(f"Model {route.config.identity.id} failed, trying next fallback. Error: {e}")
+                        continue
+                    self._record(route, started, ok=True)
+                    if won is None or route.preference < won[0].preference:
+                        won = (route, started, is_hedge, response)
+                if won is not None:
+                    route, started, is_hedge, response = won
+                    self._current_model = (route.model, route.config)
+                    hedge.record_win(route.key, is_hedge=is_hedge)
+                    if is_hedge:
+                        logger.debug(f"Hedge on {route.key} won")
+                    if self.tracker is not None:
+                        # Attempts that started earlier and are still running were at least this slow
+                        now = time.perf_counter()
+                        for other, other_start, _ in running.values():
+                            if other_start < started:
+                                self.tracker.record_latency(other.key, now - other_start)
+                    return response
+                if not running:
+                    start_next()
+        finally:
+            for task, (route, _, _) in running.items():
+                task.cancel()
+                self._release(route)
+            # Wait for the losers to unwind, so none outlives the request
+            await asyncio.gather(*running, return_exceptions=True)
+
+        raise self._all_failed(last_error, skipped) from last_error
 
     @asynccontextmanager
     async def request_stream(  # type: ignore
@@ -117,22 +353,228 @@ class NoLLMModel(Model):
         messages: list[ModelMessage],
         model_settings: PydanticModelSettings | None,
         model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None = None,
     ) -> AsyncIterator[StreamedResponse]:
+        # Older pydantic-ai versions don't pass (nor accept) the run context
+        extra = () if run_context is None else (run_context,)
+        if self.race is not None or self.deadlines is not None:
+            async with self._raced_stream(
+                self.race, self.deadlines, messages, model_settings, model_request_parameters, *extra
+            ) as response:
+                yield response
+            return
         last_error = None
-        for pyd_model, model in self.models:
+        skipped: list[Route] = []
+        for route in self._attempts():
+            if not self._acquire(route):
+                skipped.append(route)
+                continue
+            pyd_model, model = route.model, route.config
+            start = time.perf_counter()
+            opened = False
             try:
                 self._current_model = (pyd_model, model)
                 merged_settings = self._get_model_settings(model, model_settings)
                 customized_request_parameters = pyd_model.customize_request_parameters(model_request_parameters)
                 async with pyd_model.request_stream(
-                    messages, merged_settings, customized_request_parameters
+                    messages, merged_settings, customized_request_parameters, *extra
                 ) as response:
+                    # Latency of a stream is the time it took to open
+                    self._record(route, start, ok=True)
+                    opened = True
                     yield response
                     return
-            except Exception as e:  # noqa: BLE001
+            except Exception as e:
+                if opened:
+                    # The response was handed out, another model can't take over anymore
+                    raise
+                self._record_error(route, start, e)
                 last_error = e
                 logger.warning(f"Model {model.identity.id} failed, trying next fallback. Error: {e}")
                 continue
+            except BaseException:
+                self._release(route)
+                raise
+
+        raise self._all_failed(last_error, skipped)
+
+    async def _hold_stream(
+        self,
+        attempt: _StreamAttempt,
+        messages: list[ModelMessage],
+        model_settings: PydanticModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        done: asyncio.Event,
+        *extra: Any,
+    ) -> None:
+        """Open the stream of an attempt and keep it open until ``done``, setting ``ready`` at its first content
+
+        The stream is opened and closed in this task, so the SDK's context managers are left in the task that
+        entered them however the race ends.
+        """
+        route, ready = attempt.route, attempt.ready
+        try:
+            merged_settings = self._get_model_settings(route.config, model_settings)
+            customized_request_parameters = route.model.customize_request_parameters(model_request_parameters)
+            async with route.model.request_stream(
+                messages, merged_settings, customized_request_parameters, *extra
+            ) as response:
+                attempt.active_at = time.perf_counter()
+                events = aiter(response)
+                buffered = []
+                async for event in events:
+                    attempt.active_at = time.perf_counter()
+                    buffered.append(event)
+                    if _has_content(event):
+                        break
+                # Hand the events read so far back to whoever iterates the response next. This replaces
+                # StreamedResponse._event_iterator, a private attribute of pydantic-ai (checked against 0.7.2,
+                # the lower bound in pyproject.toml): ``__aiter__`` returns it once it is set
+                response._event_iterator = _replay(buffered, events)
+                ready.set_result(response)
+                await done.wait()
+        except Exception as e:
+            if ready.done():
+                raise
+            ready.set_exception(e)
+
+    @asynccontextmanager
+    async def _raced_stream(
+        self,
+        race: StreamRace | None,
+        deadlines: StreamDeadlines | None,
+        messages: list[ModelMessage],
+        model_settings: PydanticModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        *extra: Any,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Like ``request_stream``, but each stream runs in its own task until its first content
+
+        That lets ``race.routes`` streams race each other, and streams that miss one of the ``deadlines``
+        be cancelled. Without ``race`` one stream runs at a time.
+        """
+        routes = self._attempts()
+        width = 1 if race is None else race.routes
+        racing: dict[asyncio.Future[StreamedResponse], _StreamAttempt] = {}
+        skipped: list[Route] = []
+        last_error: Exception | None = None
+        done = asyncio.Event()
+        winner: asyncio.Task[None] | None = None
+        cancelled: list[asyncio.Task[None]] = []
+
+        def start_next() -> bool:
+            for route in routes:
+                if not self._acquire(route):
+                    skipped.append(route)
+                    continue
+                attempt = _StreamAttempt(route, time.perf_counter(), asyncio.get_running_loop().create_future())
+                attempt.task = asyncio.ensure_future(
+                    self._hold_stream(attempt, messages, model_settings, model_request_parameters, done, *extra)
+                )
+                racing[attempt.ready] = attempt
+                return True
+            return False
+
+        def cancel(attempt: _StreamAttempt) -> None:
+            attempt.task.cancel()
+            cancelled.append(attempt.task)
+            self._release(attempt.route)
+
+        try:
+            while len(racing) < width and start_next():
+                pass
+            while racing:
+                timeout = None
+                if deadlines is not None:
+                    now = time.perf_counter()
+                    expires = min(deadlines.deadline(a.start, a.active_at, now) for a in racing.values())
+                    timeout = None if expires == math.inf else max(0.0, expires - now)
+                finished, _ = await asyncio.wait(racing, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for ready in [ready for ready in finished if ready.exception() is not None]:
+                    attempt = racing.pop(ready)
+                    last_error = ready.exception()  # type: ignore[assignment]
+                    self._record_error(attempt.route, attempt.start, last_error)  # type: ignore[arg-type]
+                    logger.warning(
+                        f"Model {attempt.route.config.identity.id} failed, trying next fallback. Error: {last_error}"
+                    )
+                won = [ready for ready in finished if ready in racing]
+                if not won and deadlines is not None:
+                    now = time.perf_counter()
+                    for ready, attempt in list(racing.items()):
+                        if deadlines.deadline(attempt.start, attempt.active_at, now) <= now:
+                            del racing[ready]
+                            cancel(attempt)
+                            self._record(attempt.route, attempt.start, ok=False)
+                            first_token = deadlines.first_token
+                            late = first_token is not None and attempt.start + first_token <= now
+                            stage = "first token" if late else "next event"
+                            last_error = asyncio.TimeoutError(f"Stream stalled waiting for its {stage}")
+                            logger.warning(
+                                f"Model {attempt.route.config.identity.id} stalled waiting for its {stage}, "
+                                "trying next fallback"
+                            )
+                if not won:
+                    while len(racing) < width and start_next():
+                        pass
+                    continue
+                ready = min(won, key=lambda ready: racing[ready].route.preference)
+                attempt = racing.pop(ready)
+                winner = attempt.task
+                ttft = time.perf_counter() - attempt.start
+                self._record(attempt.route, attempt.start, ok=True)
+                self._current_model = (attempt.route.model, attempt.route.config)
+                wasted = len(racing)
+                for other in racing.values():
+                    cancel(other)
+                    if self.tracker is not None:
+                        # Streams that lost were at least this slow to their first token
+                        self.tracker.record_latency(other.route.key, time.perf_counter() - other.start)
+                racing.clear()
+                if race is not None:
+                    race.record(ttft, wasted)
+                    logger.debug(
+                        f"Stream of {attempt.route.key} won the race, time to first token {ttft:.3f}s, {wasted} wasted"
+                    )
+                yield ready.result()
+                return
+        finally:
+            done.set()
+            for attempt in racing.values():
+                cancel(attempt)
+            # Let the cancelled streams close their connections
+            await asyncio.gather(*cancelled, return_exceptions=True)
+            if winner is not None:
+                await winner
+
+        raise self._all_failed(last_error, skipped)
+
+
+@dataclass
+class _StreamAttempt:
+    """A stream opened by ``NoLLMModel._raced_stream``, ``ready`` is set once it has content"""
+
+    route: Route
+    start: float
+    ready: asyncio.Future[StreamedResponse]
+    task: asyncio.Task[None] = field(init=False)
+    # Last time the stream opened or produced an event
+    active_at: float | None = None
+
+
+def _has_content(event: AgentStreamEvent) -> bool:
+    """Whether an event carries content, as opposed to e.g. the start of a text part without text"""
+    if isinstance(event, FinalResultEvent):
+        # Only marks which part holds the output, pydantic-ai sends it right after the part starts
+        return False
+    if isinstance(event, PartStartEvent):
+        return not isinstance(event.part, TextPart) or bool(event.part.content)
+    if isinstance(event, PartDeltaEvent):
+        return not isinstance(event.delta, TextPartDelta) or bool(event.delta.content_delta)
+    return True
+
 
-        msg = f"All models failed. Last error: {last_error}"
-        raise RuntimeError(msg)
+async def _replay(buffered: list[Any], events: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    for event in buffered:
+        yield event
+    async for event in events:
+        yield event
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from no_llm.models.config.enums import capability_mask
+from no_llm.models.config.metadata import privacy_level_mask
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from no_llm.models.registry import SetFilter
+
+
+# Provider types, capability mask, privacy level mask, mode and compatible provider types of a slot
+_Keys = tuple[tuple[str, ...], int, int, str, tuple[str, ...]]
+
+
+def _bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low
+        mask ^= low
+
+
+def _union(masks: dict[int, int], keys: int) -> int:
+    mask = 0
+    for key in _bits(keys):
+        mask |= masks.get(key, 0)
+    return mask
+
+
+def _intersection(masks: dict[int, int], keys: int, universe: int) -> int:
+    mask = universe
+    for key in _bits(keys):
+        mask &= masks.get(key, 0)
+    return mask
+
+
+class ModelIndex:
+    """Inverted indexes over the models of a registry.
+
+    Every model id gets a slot, and every index maps a key (provider type, compatible provider type,
+    capability bit, privacy level bit, mode) to an integer bitset of the slots that have it, so filtering is a handful of
+    integer ANDs/ORs regardless of how many models are registered. Slots are handed out in
+    registration order and kept when a model is re-registered, so iterating a bitset yields models
+    in the same order as the registry's dict. Discarding a model leaves a hole, once holes make up
+    half of the slots they are compacted away, so reload churn doesn't grow the bitsets.
+    """
+
+    def __init__(self) -> None:
+        self._slots: dict[str, int] = {}
+        self._ids: list[str | None] = []
+        self._holes = 0
+        self._keys: dict[int, _Keys] = {}
+        self.all = 0
+        self.active = 0
+        self.by_provider: dict[str, int] = {}
+        self.by_compatible_provider: dict[str, int] = {}
+        self.by_capability: dict[int, int] = {}
+        self.by_privacy: dict[int, int] = {}
+        self.by_mode: dict[str, int] = {}
+
+    def copy(self) -> ModelIndex:
+        index = ModelIndex.__new__(ModelIndex)
+        index._slots = dict(self._slots)
+        index._ids = list(self._ids)
+        index._holes = self._holes
+        index._keys = dict(self._keys)
+        index.all = self.all
+        index.active = self.active
+        index.by_provider = dict(self.by_provider)
+        index.by_compatible_provider = dict(self.by_compatible_provider)
+        index.by_capability = dict(self.by_capability)
+        index.by_privacy = dict(self.by_privacy)
+        index.by_mode = dict(self.by_mode)
+        return index
+
+    def add(
+        self,
+        model_id: str,
+        *,
+        provider_types: Iterable[str],
+        capabilities: int,
+        privacy_levels: int,
+        mode: str,
+        compatible_provider_types: Iterable[str] = (),
+        is_active: bool = True,
+    ) -> None:
+        slot = self._slots.get(model_id)
+        if slot is None:
+            slot = len(self._ids)
+            self._slots[model_id] = slot
+            self._ids.append(model_id)
+        else:
+            self._clear(slot)
+        keys = (tuple(provider_types), capabilities, privacy_levels, mode, tuple(compatible_provider_types))
+        self._fill(slot, keys, is_active=is_active)
+
+    def _fill(self, slot: int, keys: _Keys, *, is_active: bool) -> None:
+        bit = 1 << slot
+        capabilities, privacy_levels, mode = keys[1], keys[2], keys[3]
+        self._keys[slot] = keys
+        for provider_type in keys[0]:
+            self.by_provider[provider_type] = self.by_provider.get(provider_type, 0) | bit
+        for provider_type in keys[4]:
+            self.by_compatible_provider[provider_type] = self.by_compatible_provider.get(provider_type, 0) | bit
+        for index, mask in ((self.by_capability, capabilities), (self.by_privacy, privacy_levels)):
+            for key in _bits(mask):
+                index[key] = index.get(key, 0) | bit
+        self.by_mode[mode] = self.by_mode.get(mode, 0) | bit
+        self.all |= bit
+        if is_active:
+            self.active |= bit
+
+    def discard(self, model_id: str) -> None:
+        slot = self._slots.pop(model_id, None)
+        if slot is None:
+            return
+        self._clear(slot)
+        self._ids[slot] = None
+        self._holes += 1
+        if self._holes * 2 > len(self._ids):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Renumber the slots of the remaining models, keeping their order"""
+        live = [
+            (model_id, self._keys[slot], bool(self.active >> slot & 1))
+            for slot, model_id in enumerate(self._ids)
+            if model_id is not None
+        ]
+        self._slots = {}
+        self._ids = []
+        self._holes = 0
+        self._keys = {}
+        self.all = 0
+        self.active = 0
+        for index in (self.by_provider, self.by_compatible_provider, self.by_capability, self.by_privacy, self.by_mode):
+            index.clear()
+        for slot, (model_id, keys, is_active) in enumerate(live):
+            self._slots[model_id] = slot
+            self._ids.append(model_id)
+            self._fill(slot, keys, is_active=is_active)
+
+    def _clear(self, slot: int) -> None:
+        keys = self._keys.pop(slot, None)
+        if keys is None:
+            return
+        bit = ~(1 << slot)
+        for provider_type in keys[0]:
+            self.by_provider[provider_type] &= bit
+        for provider_type in keys[4]:
+            self.by_compatible_provider[provider_type] &= bit
+        for index, mask in ((self.by_capability, keys[1]), (self.by_privacy, keys[2])):
+            for key in _bits(mask):
+                index[key] &= bit
+        self.by_mode[keys[3]] &= bit
+        self.all &= bit
+        self.active &= bit
+
+    def select(
+        self,
+        *,
+        provider: str | None = None,
+        compatible_provider: str | None = None,
+        capabilities: SetFilter | None = None,
+        privacy_levels: SetFilter | None = None,
+        mode: str | None = None,
+        only_active: bool = False,
+    ) -> int:
+        """Bitset of the slots matching every given filter"""
+        mask = self.active if only_active else self.all
+        if provider:
+            mask &= self.by_provider.get(provider, 0)
+        if compatible_provider:
+            mask &= self.by_compatible_provider.get(compatible_provider, 0)
+        if capabilities:
+            required = capability_mask(capabilities.values)
+            if capabilities.mode == "any":
+                mask &= _union(self.by_capability, required)
+            else:
+                mask = _intersection(self.by_capability, required, mask)
+        if privacy_levels:
+            required = privacy_level_mask(privacy_levels.values)
+            if privacy_levels.mode == "any":
+                mask &= _union(self.by_privacy, required)
+            else:
+                mask = _intersection(self.by_privacy, required, mask)
+        if mode:
+            mask &= self.by_mode.get(mode, 0)
+        return mask
+
+    def compatible_provider_types(self, model_id: str) -> tuple[str, ...] | None:
+        """Provider types the model can run on, None if it isn't indexed"""
+        slot = self._slots.get(model_id)
+        if slot is None:
+            return None
+        return self._keys[slot][4]
+
+    def ids(self, mask: int) -> Iterator[str]:
+        """Model ids of the slots set in ``mask``, in slot order"""
+        for bit in _bits(mask):
+            model_id = self._ids[bit.bit_length() - 1]
+            if model_id is not None:
+                yield model_id
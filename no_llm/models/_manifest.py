@@ -0,0 +1,757 @@
+"""Static manifest of the built-in model configurations.
+
+The manifest lets the registry know which built-in models exist, and enough about them to filter
+on, without importing a single configuration module (and, through them, the provider SDKs).
+
+The block between the ``BEGIN GENERATED`` / ``END GENERATED`` markers is produced from the
+configuration classes themselves; regenerate it after adding or changing a built-in model with::
+
+    python -m no_llm.models._manifest
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from no_llm.models.config import ModelConfiguration
+
+LINE_LENGTH = 120
+
+
+@dataclass(frozen=True)
+class BuiltinModelSpec:
+    """Where a built-in configuration lives and what it declares, as plain strings"""
+
+    module: str
+    class_name: str
+    provider_types: tuple[str, ...]
+    capabilities: frozenset[str]
+    mode: str
+    privacy_levels: tuple[str, ...]
+    compatible_provider_types: tuple[str, ...]
+
+    @property
+    def builtin(self) -> bool:
+        return True
+
+    @property
+    def is_active(self) -> bool:
+        return True
+
+    def load_class(self) -> type[ModelConfiguration]:
+        return getattr(import_module(self.module), self.class_name)
+
+    def build(self) -> ModelConfiguration:
+        # Built-in configurations declare a default for every field
+        factory = cast("Callable[[], ModelConfiguration]", self.load_class())
+        return factory()
+
+
+# --- BEGIN GENERATED ---
+BUILTIN_MODELS: dict[str, BuiltinModelSpec] = {
+    "claude-3-haiku": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_3_haiku",
+        class_name="Claude3HaikuConfiguration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "tools", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "claude-3-opus": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_3_opus",
+        class_name="Claude3OpusConfiguration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "claude-3-sonnet": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_3_sonnet",
+        class_name="Claude3SonnetConfiguration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "claude-3.5-haiku": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_3_5_haiku",
+        class_name="Claude35HaikuConfiguration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "tools", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "claude-3.5-sonnet-v2": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_3_5_sonnet_v2",
+        class_name="Claude35SonnetV2Configuration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "tools", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "claude-3.7-sonnet": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_3_7_sonnet",
+        class_name="Claude37SonnetConfiguration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "json_mode",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "claude-3.5-sonnet": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_3_5_sonnet",
+        class_name="Claude35SonnetConfiguration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "tools", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "claude-4-opus": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_4_opus",
+        class_name="Claude4OpusConfiguration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "claude-4-sonnet": BuiltinModelSpec(
+        module="no_llm.models.model_configs.claude.claude_4_sonnet",
+        class_name="Claude4SonnetConfiguration",
+        provider_types=("vertex", "bedrock", "anthropic", "openrouter"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("anthropic", "bedrock", "openrouter", "vertex"),
+    ),
+    "deepseek-chat": BuiltinModelSpec(
+        module="no_llm.models.model_configs.deepseek.deepseek_chat",
+        class_name="DeepseekChatConfiguration",
+        provider_types=("openrouter", "deepseek"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "tools"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("deepseek", "openrouter"),
+    ),
+    "deepseek-r1-llama-70b-distilled": BuiltinModelSpec(
+        module="no_llm.models.model_configs.deepseek.deepseek_r1_llama_70b_distilled",
+        class_name="DeepseekR1Llama70BDistilledConfiguration",
+        provider_types=("openrouter", "groq"),
+        capabilities=frozenset({"reasoning", "streaming"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("deepseek", "openrouter"),
+    ),
+    "deepseek-reasoner": BuiltinModelSpec(
+        module="no_llm.models.model_configs.deepseek.deepseek_reasoner",
+        class_name="DeepseekReasonerConfiguration",
+        provider_types=("openrouter", "deepseek"),
+        capabilities=frozenset({"reasoning", "streaming"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("deepseek", "openrouter"),
+    ),
+    "gemini-1.5-flash": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_1_5_flash",
+        class_name="Gemini15FlashConfiguration",
+        provider_types=("vertex", "openrouter"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "gemini-1.5-pro": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_1_5_pro",
+        class_name="Gemini15ProConfiguration",
+        provider_types=("vertex", "openrouter"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "gemini-2.0-flash-lite": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_2_0_flash_lite",
+        class_name="Gemini20FlashLiteConfiguration",
+        provider_types=("vertex", "openrouter"),
+        capabilities=frozenset(
+            {
+                "audio_in",
+                "function_calling",
+                "json_mode",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "video_in",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "gemini-2.0-flash": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_2_0_flash",
+        class_name="Gemini20FlashConfiguration",
+        provider_types=("vertex", "openrouter"),
+        capabilities=frozenset(
+            {
+                "audio_in",
+                "audio_out",
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "video_in",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "gemini-2.0-flash-thinking": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_2_0_flash_thinking",
+        class_name="Gemini20FlashThinkingConfiguration",
+        provider_types=("vertex", "openrouter"),
+        capabilities=frozenset({"streaming", "system_prompt"}),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "gemini-2.0-pro": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_2_0_pro",
+        class_name="Gemini20ProConfiguration",
+        provider_types=("vertex",),
+        capabilities=frozenset(
+            {
+                "audio_in",
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "video_in",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "gemini-2.5-flash": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_2_5_flash",
+        class_name="Gemini25FlashConfiguration",
+        provider_types=("vertex", "openrouter"),
+        capabilities=frozenset(
+            {
+                "audio_in",
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "video_in",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "gemini-2.5-flash-lite": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_2_5_flash_lite",
+        class_name="Gemini25FlashLiteConfiguration",
+        provider_types=("vertex", "openrouter"),
+        capabilities=frozenset(
+            {
+                "audio_in",
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "video_in",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "gemini-2.5-pro": BuiltinModelSpec(
+        module="no_llm.models.model_configs.gemini.gemini_2_5_pro",
+        class_name="Gemini25ProConfiguration",
+        provider_types=("vertex", "openrouter"),
+        capabilities=frozenset(
+            {
+                "audio_in",
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "video_in",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=(),
+        compatible_provider_types=("gemini", "openrouter", "vertex"),
+    ),
+    "groq-mixtral": BuiltinModelSpec(
+        module="no_llm.models.model_configs.groq.groq_mixtral",
+        class_name="GroqMixtralConfiguration",
+        provider_types=("groq",),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("groq", "openrouter"),
+    ),
+    "gpt-3.5-turbo": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_3_5_turbo",
+        class_name="GPT35TurboConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset({"streaming", "system_prompt"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "gpt-4": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_4",
+        class_name="GPT4Configuration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset({"function_calling", "parallel_function_calling", "streaming", "system_prompt"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "gpt-4o": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_4o",
+        class_name="GPT4OConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("gdpr", "hipaa", "soc2"),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "gpt-4o-mini": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_4o_mini",
+        class_name="GPT4OMiniConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "json_mode",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "tools",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "llama-3.1-405b": BuiltinModelSpec(
+        module="no_llm.models.model_configs.llama.llama_3_1_405b",
+        class_name="Llama31405BConfiguration",
+        provider_types=("together", "openrouter", "fireworks", "groq"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "vision"}),
+        mode="chat",
+        privacy_levels=("gdpr", "hipaa", "soc2"),
+        compatible_provider_types=("fireworks", "groq", "openrouter", "together"),
+    ),
+    "llama-3.3-70b": BuiltinModelSpec(
+        module="no_llm.models.model_configs.llama.llama_3_3_70b",
+        class_name="Llama3370BConfiguration",
+        provider_types=("fireworks", "together", "groq", "openrouter"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("fireworks", "groq", "openrouter", "together"),
+    ),
+    "mistral-large": BuiltinModelSpec(
+        module="no_llm.models.model_configs.mistral.mistral_large",
+        class_name="MistralLargeConfiguration",
+        provider_types=("vertex", "bedrock", "openrouter", "fireworks", "together", "mistral", "groq"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("bedrock", "fireworks", "groq", "mistral", "openrouter", "together", "vertex"),
+    ),
+    "mistral-nemo": BuiltinModelSpec(
+        module="no_llm.models.model_configs.mistral.mistral_nemo",
+        class_name="MistralNemoConfiguration",
+        provider_types=("vertex", "bedrock", "openrouter", "mistral", "fireworks", "groq", "together"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("bedrock", "fireworks", "groq", "mistral", "openrouter", "together", "vertex"),
+    ),
+    "o1-mini": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.o1_mini",
+        class_name="O1MiniConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset({"reasoning", "streaming"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "o3-mini": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.o3_mini",
+        class_name="O3MiniConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset({"function_calling", "json_mode", "reasoning", "tools", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "perplexity-sonar-large": BuiltinModelSpec(
+        module="no_llm.models.model_configs.perplexity.perplexity_sonar_large",
+        class_name="PerplexitySonarLargeConfiguration",
+        provider_types=("openrouter", "perplexity"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "web_search"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("openrouter", "perplexity"),
+    ),
+    "perplexity-sonar-small": BuiltinModelSpec(
+        module="no_llm.models.model_configs.perplexity.perplexity_sonar_small",
+        class_name="PerplexitySonarSmallConfiguration",
+        provider_types=("openrouter", "perplexity"),
+        capabilities=frozenset({"function_calling", "json_mode", "streaming", "system_prompt", "web_search"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("openrouter", "perplexity"),
+    ),
+    "gpt-4.1": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_4_1",
+        class_name="GPT41Configuration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "gpt-4.1-nano": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_4_1_nano",
+        class_name="GPT41NanoConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "gpt-4.1-mini": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_4_1_mini",
+        class_name="GPT41MiniConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "o4-mini": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.o4_mini",
+        class_name="O4MiniConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset({"function_calling", "json_mode", "reasoning", "tools", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "o3": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.o3",
+        class_name="O3Configuration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset({"function_calling", "json_mode", "reasoning", "tools", "vision"}),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "grok-3": BuiltinModelSpec(
+        module="no_llm.models.model_configs.grok.grok3",
+        class_name="Grok3Configuration",
+        provider_types=("grok", "openrouter"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "parallel_function_calling",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("grok", "openrouter"),
+    ),
+    "grok-4": BuiltinModelSpec(
+        module="no_llm.models.model_configs.grok.grok4",
+        class_name="Grok4Configuration",
+        provider_types=("grok", "openrouter"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("grok", "openrouter"),
+    ),
+    "gpt-5": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_5",
+        class_name="GPT5Configuration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "gpt-5-mini": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_5_mini",
+        class_name="GPT5MiniConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+    "gpt-5-nano": BuiltinModelSpec(
+        module="no_llm.models.model_configs.openai.gpt_5_nano",
+        class_name="GPT5NanoConfiguration",
+        provider_types=("azure", "openrouter", "openai"),
+        capabilities=frozenset(
+            {
+                "function_calling",
+                "parallel_function_calling",
+                "reasoning",
+                "streaming",
+                "system_prompt",
+                "vision",
+            }
+        ),
+        mode="chat",
+        privacy_levels=("basic",),
+        compatible_provider_types=("azure", "openai", "openrouter"),
+    ),
+}
+# --- END GENERATED ---
+
+BUILTIN_CLASSES: dict[str, BuiltinModelSpec] = {spec.class_name: spec for spec in BUILTIN_MODELS.values()}
+
+
+def load_builtin_class(class_name: str) -> type[ModelConfiguration]:
+    """Import a built-in configuration class by name, raising AttributeError if it is unknown"""
+    spec = BUILTIN_CLASSES.get(class_name)
+    if spec is None:
+        msg = f"Unknown built-in model configuration: {class_name}"
+        raise AttributeError(msg)
+    return spec.load_class()
+
+
+def generate_manifest() -> dict[str, BuiltinModelSpec]:
+    """Build the manifest by importing and instantiating every built-in configuration"""
+    import pkgutil
+
+    from no_llm.models import __all__ as class_names
+    from no_llm.models import model_configs
+
+    families = [
+        import_module(f"{model_configs.__name__}.{module_info.name}")
+        for module_info in pkgutil.iter_modules(model_configs.__path__)
+    ]
+
+    manifest: dict[str, BuiltinModelSpec] = {}
+    for class_name in class_names:
+        config_class = next(getattr(family, class_name) for family in families if hasattr(family, class_name))
+        model = config_class()
+        manifest[model.identity.id] = BuiltinModelSpec(
+            module=config_class.__module__,
+            class_name=class_name,
+            provider_types=tuple(dict.fromkeys(provider.type for provider in model.providers)),
+            capabilities=frozenset(capability.value for capability in model.capabilities),
+            mode=model.mode.value,
+            privacy_levels=tuple(level.value for level in model.metadata.privacy_level),
+            compatible_provider_types=model.compatible_provider_types,
+        )
+    return manifest
+
+
+def _render_strings(values: tuple[str, ...]) -> str:
+    if len(values) == 1:
+        return f'("{values[0]}",)'
+    return "(" + ", ".join(f'"{value}"' for value in values) + ")"
+
+
+def render_manifest(manifest: dict[str, BuiltinModelSpec]) -> str:
+    lines = ["BUILTIN_MODELS: dict[str, BuiltinModelSpec] = {"]
+    for model_id, spec in manifest.items():
+        capabilities = sorted(spec.capabilities)
+        capabilities_line = "        capabilities=frozenset({" + ", ".join(f'"{c}"' for c in capabilities) + "}),"
+        if len(capabilities_line) > LINE_LENGTH:
+            capabilities_lines = [
+                "        capabilities=frozenset(",
+                "            {",
+                *(f'                "{capability}",' for capability in capabilities),
+                "            }",
+                "        ),",
+            ]
+        else:
+            capabilities_lines = [capabilities_line]
+        lines.extend(
+            [
+                f'    "{model_id}": BuiltinModelSpec(',
+                f'        module="{spec.module}",',
+                f'        class_name="{spec.class_name}",',
+                f"        provider_types={_render_strings(spec.provider_types)},",
+                *capabilities_lines,
+                f'        mode="{spec.mode}",',
+                f"        privacy_levels={_render_strings(spec.privacy_levels)},",
+                f"        compatible_provider_types={_render_strings(spec.compatible_provider_types)},",
+                "    ),",
+            ]
+        )
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def write_manifest(path: Path | None = None) -> None:
+    path = path or Path(__file__)
+    source = path.read_text()
+    head, _, rest = source.partition("# --- BEGIN GENERATED ---\n")
+    _, _, tail = rest.partition("# --- END GENERATED ---\n")
+    body = render_manifest(generate_manifest())
+    path.write_text(f"{head}# --- BEGIN GENERATED ---\n{body}\n# --- END GENERATED ---\n{tail}")
+
+
+if __name__ == "__main__":
+    write_manifest()
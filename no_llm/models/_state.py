@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from no_llm._snapshot import SnapshotError
+from no_llm._state import RegistryState
+from no_llm.models._index import ModelIndex
+from no_llm.models.config.enums import capability_mask
+from no_llm.models.config.metadata import privacy_level_mask
+
+if TYPE_CHECKING:
+    from no_llm._shared import SharedModelSpec
+    from no_llm._snapshot import SnapshotModelSpec
+    from no_llm.models._manifest import BuiltinModelSpec
+    from no_llm.models.config import ModelConfiguration
+
+
+class ModelState(RegistryState):
+    """The models of a ``ModelRegistry`` at one generation"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.models: dict[str, ModelConfiguration] = {}
+        self.builtin_models: dict[str, type[ModelConfiguration]] = {}
+        self.pending_models: dict[str, BuiltinModelSpec | SnapshotModelSpec | SharedModelSpec] = {}
+        self.index = ModelIndex()
+
+    def copy(self) -> ModelState:
+        state = ModelState.__new__(ModelState)
+        state.generation = self.generation
+        state.dirty = False
+        state.models = dict(self.models)
+        state.builtin_models = dict(self.builtin_models)
+        state.pending_models = dict(self.pending_models)
+        state.index = self.index.copy()
+        return state
+
+    def get(self, model_id: str | None) -> ModelConfiguration | None:
+        """The model, building it first if it was registered lazily"""
+        if model_id is None:
+            return None
+        spec = self.pending_models.pop(model_id, None)
+        if spec is not None:
+            self.dirty = True
+            self._build(model_id, spec)
+        return self.models.get(model_id)
+
+    def _build(self, model_id: str, spec: BuiltinModelSpec | SnapshotModelSpec | SharedModelSpec) -> None:
+        try:
+            model_config = spec.build()
+        except ImportError as e:
+            logger.debug(f"Could not import module {spec.module}: {e}")
+            self.index.discard(model_id)
+            return
+        except SnapshotError as e:
+            logger.warning(f"Could not restore model {model_id} from snapshot: {e}")
+            self.index.discard(model_id)
+            return
+        self.register(model_config, builtin=spec.builtin)
+        logger.debug(f"Registered model configuration: {spec.class_name}")
+
+    def add_pending(self, model_id: str, spec: BuiltinModelSpec | SnapshotModelSpec | SharedModelSpec) -> None:
+        self.dirty = True
+        self.pending_models[model_id] = spec
+        self.index.add(
+            model_id,
+            provider_types=spec.provider_types,
+            capabilities=capability_mask(spec.capabilities),
+            privacy_levels=privacy_level_mask(spec.privacy_levels),
+            mode=spec.mode,
+            compatible_provider_types=spec.compatible_provider_types,
+            is_active=spec.is_active,
+        )
+
+    def register(self, model: ModelConfiguration, builtin: bool = False) -> None:
+        if model.identity.id in self.models:
+            logger.debug(f"Overriding existing model configuration: {model.identity.id}")
+        self.dirty = True
+        self.pending_models.pop(model.identity.id, None)
+
+        self.models[model.identity.id] = model
+        self.index.add(
+            model.identity.id,
+            provider_types=[p.type for p in model.providers],
+            capabilities=model.capability_mask,
+            privacy_levels=model.metadata.privacy_mask,
+            mode=model.mode,
+            compatible_provider_types=model.compatible_provider_types,
+            is_active=model.is_active,
+        )
+        logger.debug(f"Registered model: {model.identity.id}")
+        if builtin:
+            self.builtin_models[model.identity.id] = model.__class__
+
+    def discard(self, model_id: str) -> bool:
+        """Remove a model, returning whether it was registered"""
+        if self.pending_models.pop(model_id, None) is None and self.models.pop(model_id, None) is None:
+            return False
+        self.dirty = True
+        self.index.discard(model_id)
+        return True
@@ -1,4 +1,12 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Set as AbstractSet
 from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
 
 
 class ModelMode(str, Enum):
@@ -25,3 +33,87 @@ class ModelCapability(str, Enum):
     AUDIO_SPEECH = "audio_out"
     VIDEO_TRANSCRIPTION = "video_in"
     VIDEO_GENERATION = "video_out"
+
+
+CAPABILITY_BITS: dict[ModelCapability, int] = {capability: 1 << i for i, capability in enumerate(ModelCapability)}
+# Set for capabilities that are not part of the enum, so no configuration can ever satisfy them
+UNKNOWN_CAPABILITY_BIT = 1 << len(CAPABILITY_BITS)
+
+
+def capability_mask(capabilities: Iterable[ModelCapability | str]) -> int:
+    """Integer bitmask with one bit per capability"""
+    mask = 0
+    for capability in capabilities:
+        mask |= CAPABILITY_BITS.get(capability, UNKNOWN_CAPABILITY_BIT)  # type: ignore[arg-type]
+    return mask
+
+
+class CapabilitySet(set[ModelCapability]):
+    """A set of capabilities that keeps its bitmask in sync, so checks against it are a single AND"""
+
+    __slots__ = ("mask",)
+
+    def __init__(self, capabilities: Iterable[ModelCapability] = ()) -> None:
+        super().__init__(capabilities)
+        self.mask = capability_mask(self)
+
+    def _sync(self) -> None:
+        self.mask = capability_mask(self)
+
+    def add(self, capability: ModelCapability) -> None:
+        super().add(capability)
+        self.mask |= CAPABILITY_BITS.get(capability, UNKNOWN_CAPABILITY_BIT)
+
+    def discard(self, capability: object) -> None:
+        if capability in self:
+            super().discard(capability)
+            self._sync()
+
+    def remove(self, capability: ModelCapability) -> None:
+        super().remove(capability)
+        self._sync()
+
+    def pop(self) -> ModelCapability:
+        capability = super().pop()
+        self._sync()
+        return capability
+
+    def clear(self) -> None:
+        super().clear()
+        self.mask = 0
+
+    def update(self, *others: Iterable[ModelCapability]) -> None:
+        super().update(*others)
+        self._sync()
+
+    def intersection_update(self, *others: Iterable[Any]) -> None:
+        super().intersection_update(*others)
+        self._sync()
+
+    def difference_update(self, *others: Iterable[Any]) -> None:
+        super().difference_update(*others)
+        self._sync()
+
+    def symmetric_difference_update(self, other: Iterable[ModelCapability]) -> None:
+        super().symmetric_difference_update(other)
+        self._sync()
+
+    def __ior__(self, other: AbstractSet[ModelCapability]) -> Self:  # type: ignore[override,misc]
+        super().__ior__(other)
+        self._sync()
+        return self
+
+    def __iand__(self, other: AbstractSet[object]) -> Self:
+        super().__iand__(other)
+        self._sync()
+        return self
+
+    def __isub__(self, other: AbstractSet[object]) -> Self:
+        super().__isub__(other)
+        self._sync()
+        return self
+
+    def __ixor__(self, other: AbstractSet[ModelCapability]) -> Self:  # type: ignore[override,misc]
+        super().__ixor__(other)
+        self._sync()
+        return self
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from typing import TYPE_CHECKING
 
 from pydantic import BaseModel, Field, model_validator
 
 from no_llm.errors import InvalidPricingConfigError
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
 
 class PrivacyLevel(str, Enum):
     BASIC = "basic"
@@ -16,6 +20,19 @@ class PrivacyLevel(str, Enum):
     SOC2 = "soc2"
 
 
+PRIVACY_LEVEL_BITS: dict[PrivacyLevel, int] = {level: 1 << i for i, level in enumerate(PrivacyLevel)}
+# Set for privacy levels that are not part of the enum, so no configuration can ever satisfy them
+UNKNOWN_PRIVACY_LEVEL_BIT = 1 << len(PRIVACY_LEVEL_BITS)
+
+
+def privacy_level_mask(levels: Iterable[PrivacyLevel | str]) -> int:
+    """Integer bitmask with one bit per privacy level"""
+    mask = 0
+    for level in levels:
+        mask |= PRIVACY_LEVEL_BITS.get(level, UNKNOWN_PRIVACY_LEVEL_BIT)  # type: ignore[arg-type]
+    return mask
+
+
 class TokenPrices(BaseModel):
     input_price_per_1k: float = Field(ge=0, description="Price per 1k input tokens")
     output_price_per_1k: float = Field(ge=0, description="Price per 1k output tokens")
@@ -63,3 +80,8 @@ class ModelMetadata(BaseModel):
     pricing: ModelPricing = Field(description="Pricing information")
     release_date: datetime = Field(description="Model release date")
     data_cutoff_date: datetime | None = Field(default=None, description="Training data cutoff date")
+
+    @property
+    def privacy_mask(self) -> int:
+        # Computed from the list every time, it is a few levels and can be edited in place
+        return privacy_level_mask(self.privacy_level)
@@ -1,29 +1,44 @@
 from __future__ import annotations
 
-from collections.abc import Iterator, Sequence
-from typing import TYPE_CHECKING, Any, Literal
+import copy
+import itertools
+from collections.abc import Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Literal, cast
 
-from pydantic import BaseModel, Field, PrivateAttr
-from pydantic_ai.settings import ModelSettings
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
 from no_llm._base import BaseResource
+from no_llm._utils import LRUCache, freeze
 from no_llm.models.config.benchmarks import BenchmarkScores
-from no_llm.models.config.enums import ModelCapability, ModelMode
+from no_llm.models.config.enums import CapabilitySet, ModelCapability, ModelMode, capability_mask
 from no_llm.models.config.errors import MissingCapabilitiesError
 from no_llm.models.config.integrations import IntegrationAliases
 from no_llm.models.config.metadata import ModelMetadata
 from no_llm.models.config.parameters import (
     NOT_GIVEN,
+    BatchResult,
     ConfigurableModelParameters,
     ModelParameters,
 )
 from no_llm.models.config.properties import ModelProperties
 from no_llm.providers import AnyProvider, Provider, Providers
+from no_llm.settings import settings as no_llm_settings
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Hashable, Iterator
 
     from pydantic_ai.models import Model
+    from pydantic_ai.settings import ModelSettings
+    from typing_extensions import Self
+
+
+_revisions = itertools.count()
+_settings_cache: LRUCache[tuple[Any, ...], dict[str, Any]] = LRUCache(maxsize=no_llm_settings.settings_cache_size)
+
+
+def clear_settings_cache() -> None:
+    """Drop every memoized result of ``ModelConfiguration.resolve_settings``"""
+    _settings_cache.clear()
 
 
 class ModelIdentity(BaseModel):
@@ -48,6 +63,8 @@ class ModelConstraints(BaseModel):
 
 class ModelConfiguration(BaseResource):
     _compatible_providers: set[type[AnyProvider]] = PrivateAttr(default_factory=set)
+    # Changes whenever a field is reassigned, so resolved settings can be cached per revision
+    _revision: int = PrivateAttr(default_factory=lambda: next(_revisions))
     identity: ModelIdentity
     providers: Sequence[Providers] = Field(default_factory=list, description="Provider configuration", min_length=1)
     mode: ModelMode
@@ -64,6 +81,33 @@ class ModelConfiguration(BaseResource):
     extra: dict[str, Any] = Field(default_factory=dict, description="Extra model configuration")
     model_config = {"json_encoders": {set[ModelCapability]: lambda x: sorted(x, key=lambda c: c.value)}}
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "capabilities" and not isinstance(value, CapabilitySet):
+            value = CapabilitySet(value)
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            super().__setattr__("_revision", next(_revisions))
+
+    @model_validator(mode="after")
+    def _to_capability_set(self) -> ModelConfiguration:
+        # Validated input and class-level defaults (which skip validation) both arrive as plain sets
+        if not isinstance(self.capabilities, CapabilitySet):
+            self.capabilities = CapabilitySet(self.capabilities)
+        return self
+
+    @property
+    def capability_mask(self) -> int:
+        capabilities = self.capabilities
+        # Always a CapabilitySet once validated, see _to_capability_set
+        if isinstance(capabilities, CapabilitySet):
+            return capabilities.mask
+        return capability_mask(capabilities)
+
+    @property
+    def compatible_provider_types(self) -> tuple[str, ...]:
+        """Types of the providers this model can run on, read off the provider classes"""
+        return tuple(sorted(provider.model_fields["type"].default for provider in self._compatible_providers))
+
     @property
     def is_valid(self) -> bool:
         if len(self.providers) == 0:
@@ -74,10 +118,12 @@ class ModelConfiguration(BaseResource):
         for provider in self.providers:
             yield from provider.iter()
 
-    def check_capabilities(self, capabilities: set[ModelCapability], mode: Literal["any", "all"] = "any") -> bool:
+    def check_capabilities(self, capabilities: set[ModelCapability] | int, mode: Literal["any", "all"] = "any") -> bool:
+        """Check capabilities given either as a set or as a mask from ``capability_mask``"""
+        required = capabilities if isinstance(capabilities, int) else capability_mask(capabilities)
         if mode == "any":
-            return bool(capabilities.intersection(self.capabilities))
-        return capabilities.issubset(self.capabilities)
+            return bool(required & self.capability_mask)
+        return not required & ~self.capability_mask
 
     def assert_capabilities(self, capabilities: set[ModelCapability], mode: Literal["any", "all"] = "any") -> None:
         if not self.check_capabilities(capabilities, mode):
@@ -102,24 +148,93 @@ class ModelConfiguration(BaseResource):
         parameters = param_cls.from_config(parameters_cfg)
         return cls(**config, parameters=parameters)
 
-    def set_parameters(self, parameters: ModelParameters) -> None:
-        """Set parameters from a dictionary"""
-        copied_parameters = parameters.model_copy(deep=True)
+    def _parameter_updates(self, parameters: ModelParameters) -> dict[str, Any]:
         if (
-            copied_parameters.model_override
-            and copied_parameters.model_override != NOT_GIVEN
-            and self.identity.id in copied_parameters.model_override
+            parameters.model_override
+            and parameters.model_override != NOT_GIVEN
+            and self.identity.id in parameters.model_override
         ):
-            copied_parameters = copied_parameters & copied_parameters.model_override[self.identity.id]
+            parameters = parameters & parameters.model_override[self.identity.id]
+        return parameters.model_dump(exclude_defaults=True)
 
-        for key, value in copied_parameters.model_dump(exclude_defaults=True).items():
-            if key in self.parameters.model_fields:
-                self.parameters._validate_and_update_parameter(  # noqa: SLF001
-                    key, value, capabilities=self.capabilities
-                )
-                # setattr(self.parameters, key, value)
+    def set_parameters(self, parameters: ModelParameters) -> None:
+        """Set parameters from a dictionary"""
+        self.parameters = self.parameters.overlay(
+            self._parameter_updates(parameters), capabilities=self.capability_mask
+        )
+
+    def with_parameters(self, parameters: ModelParameters) -> Self:
+        """Return a copy with ``parameters`` applied, leaving this configuration untouched.
+
+        The copy is shallow: identity, providers, metadata, etc. are shared with this configuration and
+        only the parameters are new, so this is cheap enough to call per request.
+        """
+        overlaid = self.parameters.overlay(self._parameter_updates(parameters), capabilities=self.capability_mask)
+        return self.model_copy(update={"parameters": overlaid})
+
+    def resolve_settings(self, parameters: ModelParameters | None = None) -> ModelSettings:
+        """``to_pydantic_settings`` for this configuration with ``parameters`` applied on top.
+
+        Results are memoized in a bounded LRU keyed by model id, configuration and parameter revisions,
+        capabilities, validation mode and the given parameters, so repeated combinations skip validation.
+        """
+        # Sized on use, so settings_cache_size can be changed at runtime
+        if _settings_cache.maxsize != no_llm_settings.settings_cache_size:
+            _settings_cache.resize(no_llm_settings.settings_cache_size)
+        key = (
+            self.identity.id,
+            type(self),
+            self._revision,
+            self.parameters._revision,
+            self.capability_mask,
+            no_llm_settings.validation_mode,
+            freeze(parameters.model_dump(exclude_defaults=True)) if parameters is not None else None,
+        )
+        settings = _settings_cache.get(key)
+        if settings is None:
+            model = self if parameters is None else self.with_parameters(parameters)
+            settings = cast("dict[str, Any]", model.to_pydantic_settings())
+            _settings_cache.put(key, settings)
+        # Callers get their own copy, nested lists and dicts included, so they can't modify the cached entry
+        return cast(
+            "ModelSettings",
+            {
+                name: copy.deepcopy(value) if isinstance(value, dict | list | set) else value
+                for name, value in settings.items()
+            },
+        )
+
+    def resolve_settings_batch(
+        self,
+        rows: Sequence[ModelParameters | Mapping[str, Any]] | Mapping[str, Sequence[Any]],
+    ) -> BatchResult:
+        """Validate many parameter sets and resolve each of them to pydantic-ai settings.
+
+        Takes the same inputs as ``ConfigurableModelParameters.validate_batch``. The result's values are
+        the resolved settings, or None for rows that failed under ``ValidationMode.ERROR``. Identical
+        rows are only resolved once.
+        """
+        if not isinstance(rows, Mapping):
+            rows = [self._parameter_updates(row) if isinstance(row, ModelParameters) else row for row in rows]
+        validated = self.parameters.validate_batch(rows, capabilities=self.capability_mask)
+
+        resolved: dict[Hashable, dict[str, Any]] = {}
+        settings: list[dict[str, Any] | None] = []
+        for values in validated.values:
+            if values is None:
+                settings.append(None)
+                continue
+            key = freeze(values)
+            if key not in resolved:
+                overlaid = self.parameters.overlay(values, capabilities=self.capability_mask)
+                model = self.model_copy(update={"parameters": overlaid})
+                resolved[key] = cast("dict[str, Any]", model.to_pydantic_settings())
+            settings.append(dict(resolved[key]))
+        return BatchResult(values=settings, errors=validated.errors)
 
     def to_pydantic_settings(self) -> ModelSettings:
+        from pydantic_ai.settings import ModelSettings
+
         return ModelSettings(**self.parameters.model_dump())  # type: ignore
 
     def to_pydantic_model(self) -> Model:
@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import functools
+import itertools
+from collections.abc import Mapping
+from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
 
 from loguru import logger
-from pydantic import BaseModel, ConfigDict, Field, model_serializer, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_serializer, model_validator
 
-from no_llm.models.config.enums import ModelCapability
+from no_llm.models.config.enums import CAPABILITY_BITS, UNKNOWN_CAPABILITY_BIT, ModelCapability
 from no_llm.models.config.errors import (
     FixedParameterError,
     InvalidEnumError,
     InvalidRangeError,
+    ParameterError,
     UnsupportedParameterError,
 )
 from no_llm.settings import ValidationMode
 from no_llm.settings import settings as no_llm_settings
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from pydantic_ai.settings import ModelSettings
+    from typing_extensions import Self
 
 V = TypeVar("V")
 NotGiven = Literal["NOT_GIVEN"]
@@ -31,6 +39,8 @@ class ParameterVariant(str, Enum):
 
 
 class ValidationRule(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     def validate_value(self, value: Any) -> None:
         pass
 
@@ -87,8 +97,13 @@ class ParameterValue(BaseModel, Generic[V]):
         fixed: 0.7
         variable: 0.7
         unsupported: true
+
+    Values are frozen, changing one means replacing it, e.g. with ``model_copy(update=...)``. That lets
+    copies of a parameters object share them.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     variant: ParameterVariant
     value: V | None = None
     validation_rule: RangeValidation | EnumValidation | None = None
@@ -123,11 +138,19 @@ class ParameterValue(BaseModel, Generic[V]):
             required_capability=required_capability,
         )
 
-    def check_capability(self, capabilities: set[ModelCapability]) -> ParameterValue[V]:
-        """Check if this parameter is supported given the capabilities.
+    def supports(self, capabilities: set[ModelCapability] | int) -> bool:
+        """Whether the capabilities (a set or a capability mask) include the required capability"""
+        if not self.required_capability:
+            return True
+        if isinstance(capabilities, int):
+            return bool(capabilities & CAPABILITY_BITS.get(self.required_capability, UNKNOWN_CAPABILITY_BIT))
+        return self.required_capability in capabilities
+
+    def check_capability(self, capabilities: set[ModelCapability] | int) -> ParameterValue[V]:
+        """Check if this parameter is supported given the capabilities (a set or a capability mask).
         Returns a new ParameterValue with variant=UNSUPPORTED if not supported.
         """
-        if self.required_capability and self.required_capability not in capabilities:
+        if not self.supports(capabilities):
             return ParameterValue(
                 variant=ParameterVariant.UNSUPPORTED,
                 value=None,
@@ -169,9 +192,78 @@ class ParameterValue(BaseModel, Generic[V]):
         return result
 
 
+_revisions = itertools.count()
+
+
+@functools.cache
+def _compile_plan(cls: type[ConfigurableModelParameters]) -> dict[str, ParameterValue[Any]]:
+    """Call every field's default factory once per parameters class.
+
+    The resulting defaults are shared by all instances of the class, which is safe because a
+    ``ParameterValue`` is frozen.
+    """
+    plan = {}
+    for field_name, field in cls.model_fields.items():
+        if field.default_factory is None:
+            continue
+        default = field.default_factory()  # type: ignore[call-arg]
+        if isinstance(default, ParameterValue):
+            plan[field_name] = default
+    return plan
+
+
+# Below this many rows the NumPy conversion costs more than it saves
+_NUMPY_MIN_ROWS = 32
+
+
+@functools.cache
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _out_of_range(values: list[Any], min_value: float, max_value: float) -> list[bool | None]:
+    """Whether each value is outside the range, None for values that can't be compared to numbers"""
+    np = _numpy() if len(values) >= _NUMPY_MIN_ROWS else None
+    if np is not None:
+        try:
+            array = np.asarray(values)
+        except (TypeError, ValueError):
+            pass
+        else:
+            # Anything but booleans, integers and floats, e.g. strings, is checked one value at a time
+            if array.dtype.kind in "biuf":
+                return (~((array >= min_value) & (array <= max_value))).tolist()
+    flags: list[bool | None] = []
+    for value in values:
+        try:
+            flags.append(not (min_value <= value <= max_value))
+        except TypeError:
+            flags.append(None)
+    return flags
+
+
+@dataclass
+class BatchResult:
+    """Per-row outcome of a batch validation.
+
+    ``values[i]`` is None when row ``i`` failed under ``ValidationMode.ERROR``. ``errors[i]`` lists
+    every problem found in the row, including the ones that were clamped or dropped in other modes.
+    """
+
+    values: list[dict[str, Any] | None]
+    errors: list[list[ParameterError]]
+
+
 class ConfigurableModelParameters(BaseModel):
     """Complete set of model parameters"""
 
+    # Changes whenever a parameter value is replaced, so resolved settings can be cached per revision
+    _revision: int = PrivateAttr(default_factory=lambda: next(_revisions))
+
     temperature: ParameterValue[float | NotGiven] = Field(
         default_factory=lambda: ParameterValue[float | NotGiven](
             variant=ParameterVariant.VARIABLE,
@@ -294,60 +386,55 @@ class ConfigurableModelParameters(BaseModel):
         if not isinstance(data, dict):
             return data
 
-        for field_name, field in cls.model_fields.items():
-            # Get capability and validation rule from field's default factory if it exists
-            default_factory = getattr(field, "default_factory", None)
-            if default_factory is not None and callable(default_factory):
-                default = default_factory()
-                if isinstance(default, ParameterValue):  # noqa: SIM102
-                    # If we have a value in the data, parse it and add capabilities
-                    if field_name in data:
-                        value = data[field_name]
-
-                        # Handle shorthand formats
-                        if value == "unsupported":
-                            data[field_name] = {
-                                "variant": ParameterVariant.UNSUPPORTED,
-                                "value": None,
-                            }
-                            continue
-
-                        if not isinstance(value, dict):
-                            data[field_name] = {
-                                "variant": ParameterVariant.FIXED,
-                                "value": value,
-                            }
-                            continue
-
-                        result = {}
-
-                        # Handle variant
-                        if "variant" in value:
-                            result["variant"] = value["variant"]
-                        elif "fixed" in value:
-                            result["variant"] = ParameterVariant.FIXED
-                            result["value"] = value["fixed"]
-                        else:
-                            result["variant"] = ParameterVariant.VARIABLE
-
-                        # Handle value
-                        if "value" in value:
-                            result["value"] = value["value"]
-
-                        # Handle validation rule
-                        if "range" in value:
-                            min_val, max_val = value["range"]
-                            result["validation_rule"] = RangeValidation(min_value=min_val, max_value=max_val)
-                        elif default.validation_rule:
-                            result["validation_rule"] = default.validation_rule
-
-                        # Handle capability
-                        if "required_capability" in value:
-                            result["required_capability"] = value["required_capability"]
-                        elif default.required_capability:
-                            result["required_capability"] = default.required_capability
-
-                        data[field_name] = result
+        for field_name, default in _compile_plan(cls).items():
+            # If we have a value in the data, parse it and add capabilities from the field's default
+            if field_name in data:
+                value = data[field_name]
+
+                # Handle shorthand formats
+                if value == "unsupported":
+                    data[field_name] = {
+                        "variant": ParameterVariant.UNSUPPORTED,
+                        "value": None,
+                    }
+                    continue
+
+                if not isinstance(value, dict):
+                    data[field_name] = {
+                        "variant": ParameterVariant.FIXED,
+                        "value": value,
+                    }
+                    continue
+
+                result = {}
+
+                # Handle variant
+                if "variant" in value:
+                    result["variant"] = value["variant"]
+                elif "fixed" in value:
+                    result["variant"] = ParameterVariant.FIXED
+                    result["value"] = value["fixed"]
+                else:
+                    result["variant"] = ParameterVariant.VARIABLE
+
+                # Handle value
+                if "value" in value:
+                    result["value"] = value["value"]
+
+                # Handle validation rule
+                if "range" in value:
+                    min_val, max_val = value["range"]
+                    result["validation_rule"] = RangeValidation(min_value=min_val, max_value=max_val)
+                elif default.validation_rule:
+                    result["validation_rule"] = default.validation_rule
+
+                # Handle capability
+                if "required_capability" in value:
+                    result["required_capability"] = value["required_capability"]
+                elif default.required_capability:
+                    result["required_capability"] = default.required_capability
+
+                data[field_name] = result
 
         return cls(**data)
 
@@ -355,7 +442,7 @@ class ConfigurableModelParameters(BaseModel):
         self,
         field_name: str,
         value: Any,
-        capabilities: set[ModelCapability] | None = None,
+        capabilities: set[ModelCapability] | int | None = None,
     ) -> Any:
         """Validate a single parameter value, raising errors if invalid."""
         if not hasattr(self, field_name):
@@ -367,8 +454,7 @@ class ConfigurableModelParameters(BaseModel):
             return value
 
         # Check capabilities
-        current_value = current_value.check_capability(capabilities or set())
-        if current_value.is_unsupported():
+        if current_value.is_unsupported() or not current_value.supports(capabilities or 0):
             raise UnsupportedParameterError(
                 param_name=field_name,
                 required_capability=str(current_value.required_capability),
@@ -407,12 +493,7 @@ class ConfigurableModelParameters(BaseModel):
             if no_llm_settings.validation_mode == ValidationMode.CLAMP:
                 logger.info(f"Clamping invalid parameter value for {field_name}: {error}")
                 clamped_value = error.valid_range[0] if value < error.valid_range[0] else error.valid_range[1]
-                return ParameterValue(
-                    variant=param_value.variant,
-                    value=clamped_value,
-                    validation_rule=param_value.validation_rule,
-                    required_capability=param_value.required_capability,
-                )
+                return param_value.model_copy(update={"value": clamped_value})
             return None
 
         if isinstance(error, InvalidEnumError | UnsupportedParameterError):
@@ -427,22 +508,15 @@ class ConfigurableModelParameters(BaseModel):
         self,
         field_name: str,
         value: Any,
-        capabilities: set[ModelCapability] | None = None,
+        capabilities: set[ModelCapability] | int | None = None,
     ) -> None:
         """Validate and update a parameter value, handling any validation errors."""
         current_value = getattr(self, field_name)
         try:
             validated_value = self.validate_parameter(field_name, value, capabilities)
-            if isinstance(current_value, ParameterValue):
-                super().__setattr__(
-                    field_name,
-                    ParameterValue(
-                        variant=current_value.variant,
-                        value=validated_value,
-                        validation_rule=current_value.validation_rule,
-                        required_capability=current_value.required_capability,
-                    ),
-                )
+            # The value is already validated, so copy instead of building (and re-validating) a new model
+            if isinstance(current_value, ParameterValue) and validated_value is not current_value.value:
+                self._replace_value(field_name, current_value.model_copy(update={"value": validated_value}))
         except (
             FixedParameterError,
             InvalidRangeError,
@@ -451,24 +525,165 @@ class ConfigurableModelParameters(BaseModel):
         ) as e:
             new_value = self._handle_validation_error(e, field_name, value, current_value)
             if new_value is not None:
-                super().__setattr__(field_name, new_value)
+                self._replace_value(field_name, new_value)
+
+    def _replace_value(self, field_name: str, value: ParameterValue[Any]) -> None:
+        super().__setattr__(field_name, value)
+        self._revision = next(_revisions)
+
+    def overlay(self, values: dict[str, Any], capabilities: set[ModelCapability] | int | None = None) -> Self:
+        """Return a copy with ``values`` validated and applied on top of these parameters.
+
+        Only the field mapping is copied, untouched ``ParameterValue`` objects are shared with this
+        instance. That is safe because they are frozen.
+        """
+        overlaid = self.model_copy()
+        for key, value in values.items():
+            if key in self.model_fields:
+                overlaid._validate_and_update_parameter(key, value, capabilities=capabilities)
+        return overlaid
+
+    def validate_batch(
+        self,
+        rows: Sequence[Mapping[str, Any] | ModelParameters] | Mapping[str, Sequence[Any]],
+        capabilities: set[ModelCapability] | int | None = None,
+    ) -> BatchResult:
+        """Validate many parameter sets at once, without modifying these parameters.
+
+        Args:
+            rows: Either a sequence of rows (``ModelParameters`` or dicts) or a columnar mapping of
+                parameter name to one value per row. ``NOT_GIVEN`` or None means the row leaves that
+                parameter untouched.
+            capabilities: Model capabilities, as a set or a capability mask
+        """
+        columns = self._to_columns(rows)
+        row_count = len(next(iter(columns.values()), ()))
+        mode = no_llm_settings.validation_mode
+        result = BatchResult(
+            values=[{} for _ in range(row_count)],
+            errors=[[] for _ in range(row_count)],
+        )
+        failed = [False] * row_count
+
+        for field_name, column in columns.items():
+            if field_name not in self.model_fields:
+                continue
+            param_value = self.__dict__[field_name]
+            rows_given = [i for i, value in enumerate(column) if value is not None and value != NOT_GIVEN]
+            if not rows_given:
+                continue
+            if not isinstance(param_value, ParameterValue):
+                for i in rows_given:
+                    result.values[i][field_name] = column[i]  # type: ignore[index]
+                continue
+
+            accepted = {i: column[i] for i in rows_given}
+            problems: dict[int, ParameterError] = {}
+            if param_value.is_unsupported() or not param_value.supports(capabilities or 0):
+                error: ParameterError = UnsupportedParameterError(
+                    param_name=field_name,
+                    required_capability=str(param_value.required_capability),
+                    description=self.model_fields[field_name].description,
+                )
+                problems = dict.fromkeys(rows_given, error)
+            else:
+                for i in rows_given:
+                    if param_value.is_fixed() and column[i] != param_value.value:
+                        problems[i] = FixedParameterError(
+                            param_name=field_name, current_value=param_value.value, attempted_value=column[i]
+                        )
+                rule = param_value.validation_rule
+                checked = [i for i in rows_given if i not in problems]
+                if isinstance(rule, RangeValidation):
+                    flags = _out_of_range([column[i] for i in checked], rule.min_value, rule.max_value)
+                    for i, out_of_range in zip(checked, flags):
+                        if out_of_range is None:
+                            problems[i] = ParameterError(
+                                param_name=field_name, message=f"Value {column[i]!r} is not a number"
+                            )
+                        elif out_of_range:
+                            problems[i] = InvalidRangeError(
+                                param_name=field_name,
+                                value=column[i],
+                                reason=f"Value {column[i]} outside range [{rule.min_value}, {rule.max_value}]",
+                                valid_range=(rule.min_value, rule.max_value),
+                            )
+                elif rule is not None:
+                    for i in checked:
+                        try:
+                            rule.validate_value(column[i])
+                        except ParameterError as e:
+                            e.param_name = field_name
+                            problems[i] = e
+
+            for i, error in problems.items():
+                result.errors[i].append(error)
+                if mode == ValidationMode.CLAMP and isinstance(error, InvalidRangeError):
+                    low, high = error.valid_range
+                    accepted[i] = low if column[i] < low else high
+                    continue
+                del accepted[i]
+                if mode == ValidationMode.ERROR:
+                    failed[i] = True
+            for i, value in accepted.items():
+                result.values[i][field_name] = value  # type: ignore[index]
+
+        for i in range(row_count):
+            if failed[i]:
+                result.values[i] = None
+        invalid_rows = sum(1 for errors in result.errors if errors)
+        if invalid_rows:
+            msg = f"Batch validation found invalid parameters in {invalid_rows} of {row_count} rows"
+            if mode == ValidationMode.WARN:
+                logger.warning(msg)
+            else:
+                logger.debug(msg)
+        return result
+
+    @staticmethod
+    def _to_columns(
+        rows: Sequence[Mapping[str, Any] | ModelParameters] | Mapping[str, Sequence[Any]],
+    ) -> dict[str, Sequence[Any]]:
+        if isinstance(rows, Mapping):
+            lengths = {len(column) for column in rows.values()}
+            if len(lengths) > 1:
+                msg = f"All columns must have the same length, got lengths {sorted(lengths)}"
+                raise ValueError(msg)
+            return dict(rows)
+
+        dicts = [row.model_dump(exclude_defaults=True) if isinstance(row, BaseModel) else row for row in rows]
+        names = dict.fromkeys(name for row in dicts for name in row)
+        return {name: [row.get(name, NOT_GIVEN) for row in dicts] for name in names}
 
     def __setattr__(self, name: str, value: Any) -> None:
         """Override setattr to validate parameters when set directly."""
         if name in self.model_fields:
             if isinstance(value, ParameterValue):
-                super().__setattr__(name, value)
+                self._replace_value(name, value)
                 return
             self._validate_and_update_parameter(name, value)
             return
         super().__setattr__(name, value)
 
+    @model_validator(mode="before")
+    @classmethod
+    def _fill_defaults(cls, data: Any) -> Any:
+        """Use the class's shared default values instead of calling every default factory per instance."""
+        if not isinstance(data, dict):
+            return data
+        plan = _compile_plan(cls)
+        missing = plan.keys() - data.keys()
+        if not missing:
+            return data
+        return {**{field_name: plan[field_name] for field_name in missing}, **data}
+
     @model_validator(mode="after")
     def validate_parameters(self) -> ConfigurableModelParameters:
         """Validate all parameters during model initialization."""
-        for field_name in self.model_fields:
-            value = getattr(self, field_name)
-            if isinstance(value, ParameterValue) and value.value != NOT_GIVEN:
+        values = self.__dict__
+        for field_name in _compile_plan(type(self)):
+            value = values[field_name]
+            if value.value != NOT_GIVEN:
                 self._validate_and_update_parameter(field_name, value.value)
         return self
 
@@ -1,54 +1,61 @@
-from no_llm.models.model_configs.claude import (
-    Claude3HaikuConfiguration,
-    Claude3OpusConfiguration,
-    Claude3SonnetConfiguration,
-    Claude4OpusConfiguration,
-    Claude4SonnetConfiguration,
-    Claude35HaikuConfiguration,
-    Claude35SonnetConfiguration,
-    Claude35SonnetV2Configuration,
-    Claude37SonnetConfiguration,
-)
-from no_llm.models.model_configs.deepseek import (
-    DeepseekChatConfiguration,
-    DeepseekR1Llama70BDistilledConfiguration,
-    DeepseekReasonerConfiguration,
-)
-from no_llm.models.model_configs.gemini import (
-    Gemini15FlashConfiguration,
-    Gemini15ProConfiguration,
-    Gemini20FlashConfiguration,
-    Gemini20FlashLiteConfiguration,
-    Gemini20FlashThinkingConfiguration,
-    Gemini20ProConfiguration,
-    Gemini25FlashConfiguration,
-    Gemini25FlashLiteConfiguration,
-    Gemini25ProConfiguration,
-)
-from no_llm.models.model_configs.grok import Grok3Configuration, Grok4Configuration
-from no_llm.models.model_configs.groq import GroqMixtralConfiguration
-from no_llm.models.model_configs.llama import Llama3370BConfiguration, Llama31405BConfiguration
-from no_llm.models.model_configs.mistral import MistralLargeConfiguration, MistralNemoConfiguration
-from no_llm.models.model_configs.openai import (
-    GPT4Configuration,
-    GPT4OConfiguration,
-    GPT4OMiniConfiguration,
-    GPT5Configuration,
-    GPT5MiniConfiguration,
-    GPT5NanoConfiguration,
-    GPT35TurboConfiguration,
-    GPT41Configuration,
-    GPT41MiniConfiguration,
-    GPT41NanoConfiguration,
-    O1MiniConfiguration,
-    O3Configuration,
-    O3MiniConfiguration,
-    O4MiniConfiguration,
-)
-from no_llm.models.model_configs.perplexity import (
-    PerplexitySonarLargeConfiguration,
-    PerplexitySonarSmallConfiguration,
-)
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from no_llm.models._manifest import load_builtin_class
+
+if TYPE_CHECKING:
+    from no_llm.models.model_configs.claude import (
+        Claude3HaikuConfiguration,
+        Claude3OpusConfiguration,
+        Claude3SonnetConfiguration,
+        Claude4OpusConfiguration,
+        Claude4SonnetConfiguration,
+        Claude35HaikuConfiguration,
+        Claude35SonnetConfiguration,
+        Claude35SonnetV2Configuration,
+        Claude37SonnetConfiguration,
+    )
+    from no_llm.models.model_configs.deepseek import (
+        DeepseekChatConfiguration,
+        DeepseekR1Llama70BDistilledConfiguration,
+        DeepseekReasonerConfiguration,
+    )
+    from no_llm.models.model_configs.gemini import (
+        Gemini15FlashConfiguration,
+        Gemini15ProConfiguration,
+        Gemini20FlashConfiguration,
+        Gemini20FlashLiteConfiguration,
+        Gemini20FlashThinkingConfiguration,
+        Gemini20ProConfiguration,
+        Gemini25FlashConfiguration,
+        Gemini25FlashLiteConfiguration,
+        Gemini25ProConfiguration,
+    )
+    from no_llm.models.model_configs.grok import Grok3Configuration, Grok4Configuration
+    from no_llm.models.model_configs.groq import GroqMixtralConfiguration
+    from no_llm.models.model_configs.llama import Llama3370BConfiguration, Llama31405BConfiguration
+    from no_llm.models.model_configs.mistral import MistralLargeConfiguration, MistralNemoConfiguration
+    from no_llm.models.model_configs.openai import (
+        GPT4Configuration,
+        GPT4OConfiguration,
+        GPT4OMiniConfiguration,
+        GPT5Configuration,
+        GPT5MiniConfiguration,
+        GPT5NanoConfiguration,
+        GPT35TurboConfiguration,
+        GPT41Configuration,
+        GPT41MiniConfiguration,
+        GPT41NanoConfiguration,
+        O1MiniConfiguration,
+        O3Configuration,
+        O3MiniConfiguration,
+        O4MiniConfiguration,
+    )
+    from no_llm.models.model_configs.perplexity import (
+        PerplexitySonarLargeConfiguration,
+        PerplexitySonarSmallConfiguration,
+    )
 
 __all__ = [
     "Claude3HaikuConfiguration",
@@ -96,3 +103,14 @@ __all__ = [
     "GPT5MiniConfiguration",
     "GPT5NanoConfiguration",
 ]
+
+
+def __getattr__(name: str) -> type:
+    # Configuration classes are imported on first access so that importing this package does not pull
+    # in every model family (and the provider SDKs behind them).
+    if name not in __all__:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    config_class = load_builtin_class(name)
+    globals()[name] = config_class
+    return config_class
@@ -16,6 +16,7 @@ from no_llm.models.config import (
 )
 from no_llm.models.config.parameters import NOT_GIVEN
 from no_llm.providers import AnthropicProvider, AnyProvider, BedrockProvider, OpenRouterProvider, VertexProvider
+from no_llm.providers.clients import get_pydantic_provider
 
 if TYPE_CHECKING:
     from pydantic_ai.models import Model
@@ -49,14 +50,14 @@ class ClaudeBaseConfiguration(ModelConfiguration):
                 models.append(
                     AnthropicModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, VertexProvider):
                 models.append(
                     AnthropicModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(model_family="claude"),  # type: ignore
+                        provider=get_pydantic_provider(provider, "claude"),  # type: ignore
                     )
                 )
             elif isinstance(provider, OpenRouterProvider):
@@ -64,14 +65,14 @@ class ClaudeBaseConfiguration(ModelConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=model_name,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, BedrockProvider):
                 models.append(
                     AnthropicModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),  # type: ignore
+                        provider=get_pydantic_provider(provider),  # type: ignore
                     )
                 )
 
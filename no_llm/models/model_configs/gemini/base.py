@@ -13,6 +13,7 @@ from no_llm.models.config import (
 )
 from no_llm.models.config.parameters import NOT_GIVEN
 from no_llm.providers import AnyProvider, GeminiProvider, OpenRouterProvider, VertexProvider
+from no_llm.providers.clients import get_pydantic_provider
 
 if TYPE_CHECKING:
     from pydantic_ai.models import Model
@@ -46,7 +47,7 @@ class GeminiBaseConfiguration(ModelConfiguration):
                 models.append(
                     GoogleModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(model_family="gemini"),  # type: ignore
+                        provider=get_pydantic_provider(provider, "gemini"),  # type: ignore
                     )
                 )
             elif isinstance(provider, OpenRouterProvider):
@@ -54,7 +55,7 @@ class GeminiBaseConfiguration(ModelConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=model_name,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
 
@@ -7,6 +7,7 @@ from pydantic_ai.models.fallback import FallbackModel
 
 from no_llm.models.model_configs.openai.base import OpenaiBaseConfiguration
 from no_llm.providers import AnyProvider, GrokProvider, OpenRouterProvider
+from no_llm.providers.clients import get_pydantic_provider
 
 if TYPE_CHECKING:
     from pydantic_ai.models import Model
@@ -32,7 +33,7 @@ class GrokBaseConfiguration(OpenaiBaseConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, OpenRouterProvider):
@@ -40,7 +41,7 @@ class GrokBaseConfiguration(OpenaiBaseConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=model_name,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
 
@@ -9,6 +9,7 @@ from no_llm.models.config import (
     ModelConfiguration,
 )
 from no_llm.providers import AnyProvider, FireworksProvider, GroqProvider, OpenRouterProvider, TogetherProvider
+from no_llm.providers.clients import get_pydantic_provider
 
 if TYPE_CHECKING:
     from pydantic_ai.models import Model
@@ -37,7 +38,7 @@ class LlamaBaseConfiguration(ModelConfiguration):
                 models.append(
                     GroqModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, OpenRouterProvider):
@@ -45,14 +46,14 @@ class LlamaBaseConfiguration(ModelConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=model_name,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, TogetherProvider | FireworksProvider):
                 models.append(
                     OpenAIModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
 
@@ -18,6 +18,7 @@ from no_llm.providers import (
     TogetherProvider,
     VertexProvider,
 )
+from no_llm.providers.clients import get_pydantic_provider
 
 if TYPE_CHECKING:
     from pydantic_ai.models import Model
@@ -55,7 +56,7 @@ class MistralBaseConfiguration(ModelConfiguration):
                 models.append(
                     MistralModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, VertexProvider):
@@ -66,14 +67,14 @@ class MistralBaseConfiguration(ModelConfiguration):
                 models.append(
                     MistralModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(model_family="mistral"),  # type: ignore
+                        provider=get_pydantic_provider(provider, "mistral"),  # type: ignore
                     )
                 )
             elif isinstance(provider, GroqProvider):
                 models.append(
                     GroqModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, OpenRouterProvider):
@@ -81,14 +82,14 @@ class MistralBaseConfiguration(ModelConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=model_name,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, BedrockProvider | FireworksProvider | TogetherProvider):
                 models.append(
                     OpenAIModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),  # type: ignore
+                        provider=get_pydantic_provider(provider),  # type: ignore
                     )
                 )
 
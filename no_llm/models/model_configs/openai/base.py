@@ -12,6 +12,7 @@ from no_llm.models.config import (
 )
 from no_llm.models.config.parameters import NOT_GIVEN
 from no_llm.providers import AnyProvider, AzureProvider, OpenAIProvider, OpenRouterProvider
+from no_llm.providers.clients import get_pydantic_provider
 
 if TYPE_CHECKING:
     from pydantic_ai.models import Model
@@ -38,7 +39,7 @@ class OpenaiBaseConfiguration(ModelConfiguration):
                 models.append(
                     OpenAIResponsesModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, OpenRouterProvider):
@@ -46,14 +47,14 @@ class OpenaiBaseConfiguration(ModelConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=model_name,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, AzureProvider):
                 models.append(
                     OpenAIModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
         if len(models) == 0:
@@ -9,6 +9,7 @@ from no_llm.models.config import (
     ModelConfiguration,
 )
 from no_llm.providers import AnyProvider, OpenRouterProvider, PerplexityProvider
+from no_llm.providers.clients import get_pydantic_provider
 
 if TYPE_CHECKING:
     from pydantic_ai.models import Model
@@ -34,7 +35,7 @@ class PerplexityBaseConfiguration(ModelConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=self.integration_aliases.pydantic_ai,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
             elif isinstance(provider, OpenRouterProvider):
@@ -42,7 +43,7 @@ class PerplexityBaseConfiguration(ModelConfiguration):
                 models.append(
                     OpenAIModel(
                         model_name=model_name,
-                        provider=provider.to_pydantic(),
+                        provider=get_pydantic_provider(provider),
                     )
                 )
 
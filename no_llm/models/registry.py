@@ -1,28 +1,89 @@
 from __future__ import annotations
 
-import pkgutil
+import builtins
+import heapq
 from dataclasses import dataclass
-from importlib import import_module
 from pathlib import Path
-from typing import TYPE_CHECKING, Generic, Literal, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
 
-import yaml
 from loguru import logger
 
-from no_llm._utils import find_yaml_file, merge_configs
+from no_llm._base import ChangeSet
+from no_llm._state import Published
+from no_llm._utils import (
+    find_yaml_file,
+    list_yaml_files,
+    load_yaml,
+    load_yaml_files,
+    merge_configs,
+    scan_source_files,
+)
 from no_llm.errors import (
     ConfigurationLoadError,
     ModelNotFoundError,
 )
-from no_llm.models import __all__ as model_configs
+from no_llm.models._manifest import BUILTIN_MODELS
+from no_llm.models._state import ModelState
 from no_llm.models.config import ModelCapability, ModelConfiguration, ModelMode, PrivacyLevel
+from no_llm.models.config.model import clear_settings_cache
+from no_llm.settings import settings as no_llm_settings
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterable, Iterator
+
+    from no_llm._shared import SharedModelSpec
+    from no_llm._snapshot import SnapshotModelSpec
+    from no_llm._utils import SourceFile
 
 T = TypeVar("T")
 
 
+def _base_config_id(config: Any) -> str | None:
+    try:
+        return config["identity"].get("base_config")
+    except (KeyError, TypeError, AttributeError):
+        return None
+
+
+def _inheritance_order(yaml_files: list[Path], configs: list[Any]) -> tuple[list[int], list[int]]:
+    """Order model files so every file comes after the files defining its ``base_config``.
+
+    Files are otherwise kept in directory order. Returns the indexes of the files that can be loaded,
+    in load order, and those that are part of, or inherit from, a ``base_config`` cycle.
+    """
+    defined_by: dict[str, list[int]] = {}
+    for i, (path, config) in enumerate(zip(yaml_files, configs)):
+        defined_by.setdefault(path.stem, []).append(i)
+        try:
+            model_id = config["identity"]["id"]
+        except (KeyError, TypeError):
+            continue
+        if isinstance(model_id, str) and model_id != path.stem:
+            defined_by.setdefault(model_id, []).append(i)
+
+    # A file whose base_config is its own id overrides an existing model, it doesn't inherit from itself
+    children: list[list[int]] = [[] for _ in yaml_files]
+    pending = [0] * len(yaml_files)
+    for i, config in enumerate(configs):
+        base_config = _base_config_id(config)
+        for parent in defined_by.get(base_config, ()) if base_config else ():
+            if parent != i:
+                children[parent].append(i)
+                pending[i] += 1
+
+    ready = [i for i, count in enumerate(pending) if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        i = heapq.heappop(ready)
+        order.append(i)
+        for child in children[i]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                heapq.heappush(ready, child)
+    return order, [i for i, count in enumerate(pending) if count > 0]
+
+
 @dataclass
 class SetFilter(Generic[T]):
     values: set[T]
@@ -30,37 +91,97 @@ class SetFilter(Generic[T]):
 
 
 class ModelRegistry:
-    def __init__(self, config_dir: str | Path | None = None):
-        self._models: dict[str, ModelConfiguration] = {}
-        self._builtin_models: dict[str, type[ModelConfiguration]] = {}
-        self._config_dir = Path(config_dir) if config_dir else None
+    def __init__(self, config_dir: str | Path | None = None, *, lazy: bool = False):
+        """
+        Args:
+            config_dir: Optional directory with ``models/*.yml`` overrides
+            lazy: If True, built-in configurations are only imported and instantiated on first access,
+                using the static manifest to answer everything else
+        """
+        self._setup(config_dir, lazy=lazy)
 
         logger.debug("Initializing ModelRegistry")
 
-        self._register_builtin_models()
+        with self._published.writing() as draft:
+            self._register_builtin_models(draft)
 
-        if config_dir:
-            logger.debug(f"Using config directory: {config_dir}")
-            self._load_configurations()
+            if config_dir:
+                logger.debug(f"Using config directory: {config_dir}")
+                self._load_configurations(draft)
 
-    def _register_builtin_models(self) -> None:
+    def _setup(self, config_dir: str | Path | None, *, lazy: bool) -> None:
+        self._published = Published(ModelState())
+        self._sources: dict[Path, SourceFile] = {}
+        self._config_dir = Path(config_dir) if config_dir else None
+        self._lazy = lazy
+        # Dumps of the models other files were merged onto, reused while the model is unchanged
+        self._base_dumps: dict[str, tuple[ModelConfiguration, dict]] = {}
+
+    @property
+    def state(self) -> ModelState:
+        """The current contents of the registry.
+
+        A state is never modified once published, so it can be read from any thread or task without
+        locking while writers publish newer ones.
+        """
+        return self._published.state
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever a model is added, replaced or removed, so caches can key on it"""
+        return self._published.state.generation
+
+    @property
+    def _models(self) -> dict[str, ModelConfiguration]:
+        return self._published.state.models
+
+    @property
+    def _builtin_models(self) -> dict[str, type[ModelConfiguration]]:
+        return self._published.state.builtin_models
+
+    @classmethod
+    def _restore(
+        cls,
+        specs: Iterable[SnapshotModelSpec | SharedModelSpec],
+        config_dir: str | Path | None = None,
+        *,
+        lazy: bool = False,
+    ) -> ModelRegistry:
+        """Rebuild a registry from snapshot entries, without loading built-ins or config files"""
+        registry = cls.__new__(cls)
+        registry._setup(config_dir, lazy=lazy)
+        logger.debug("Restoring ModelRegistry from snapshot")
+        with registry._published.writing() as draft:
+            for spec in specs:
+                draft.add_pending(spec.model_id, spec)
+            if not lazy:
+                for model_id in list(draft.pending_models):
+                    draft.get(model_id)
+        return registry
+
+    def _register_builtin_models(self, draft: ModelState) -> None:
         logger.debug("Loading built-in model configurations")
 
-        for config_class_name in model_configs:
-            from no_llm import models
-
-            for module_info in pkgutil.iter_modules(models.__path__):
-                try:
-                    module = import_module(f".models.{module_info.name}", package="no_llm")
-                    if hasattr(module, config_class_name):
-                        config_class: type[ModelConfiguration] = getattr(module, config_class_name)
-                        model_config = config_class()  # type: ignore
-                        self.register(model_config, builtin=True)
-                        logger.debug(f"Registered model configuration: {config_class_name}")
-                        break
-                except ImportError as e:
-                    logger.debug(f"Could not import module {module_info.name}: {e}")
-                    continue
+        for model_id, spec in BUILTIN_MODELS.items():
+            draft.add_pending(model_id, spec)
+            if not self._lazy:
+                draft.get(model_id)
+
+    def _materialize(self, model_id: str | None) -> ModelConfiguration | None:
+        """The model, building it first if it was registered lazily"""
+        state = self._published.state
+        if model_id is None or model_id not in state.pending_models:
+            return state.models.get(model_id) if model_id is not None else None
+        with self._published.writing(bump=False) as draft:
+            return draft.get(model_id)
+
+    def _materialize_all(self, model_ids: builtins.list[str]) -> ModelState:
+        """A state in which every lazily registered model of ``model_ids`` is built, published at once"""
+        with self._published.writing(bump=False) as draft:
+            for model_id in model_ids:
+                if model_id in draft.pending_models:
+                    draft.get(model_id)
+            return draft
 
     def _load_model_config(self, model_id: str) -> ModelConfiguration:
         if not self._config_dir:
@@ -71,17 +192,14 @@ class ModelRegistry:
         logger.debug(f"Loading model config from: {model_file}")
 
         try:
-            with open(model_file) as f:
-                config = yaml.safe_load(f)
-            logger.debug(f"Loaded YAML config: {config}")
+            config = load_yaml(model_file)
+            logger.opt(lazy=True).debug("Loaded YAML config: {}", lambda: config)
 
-            if model_id in self._models:
+            base_model = self._materialize(model_id)
+            if base_model is not None:
                 logger.debug(f"Found existing model {model_id}, merging configs")
-                base_model = self._models[model_id]
-                base_config = base_model.model_dump()
-                base_config["parameters"] = {}
-                merged_config = merge_configs(base_config, config)
-                logger.debug(f'Merged config description: {merged_config["identity"]["description"]}')
+                merged_config = merge_configs(self._base_dump(base_model), config)
+                logger.debug(f"Merged config description: {merged_config['identity']['description']}")
                 return ModelConfiguration.from_config(merged_config)
 
             return ModelConfiguration.from_config(config)
@@ -89,85 +207,151 @@ class ModelRegistry:
             logger.opt(exception=e).error(f"Error loading config from {model_file}: {e}")
             raise ConfigurationLoadError(str(model_file), e) from e
 
-    def register_models_from_directory(self, models_dir: Path | str) -> None:
+    def register_models_from_directory(self, models_dir: Path | str, *, workers: int | None = None) -> None:
+        """
+        Args:
+            models_dir: Directory with one ``*.yml``/``*.yaml`` file per model
+            workers: Parse the files with this many workers, defaults to ``settings.yaml_workers``
+        """
         models_dir = Path(models_dir)
         if not models_dir.exists():
             logger.warning(f"Models directory not found: {models_dir}")
             return
 
         logger.debug(f"Loading models from {models_dir}")
-        logger.debug(f"Models directory contents: {list(models_dir.iterdir())}")
-
-        yaml_files = []
-        for ext in ["*.yml", "*.yaml"]:
-            yaml_files.extend(list(models_dir.glob(ext)))
-
-        logger.debug(f"Found {len(yaml_files)} YAML files: {[f.name for f in yaml_files]}")
+        logger.opt(lazy=True).debug("Models directory contents: {}", lambda: list(models_dir.iterdir()))
+        with self._published.writing() as draft:
+            self._load_model_files(draft, list_yaml_files(models_dir), workers=workers)
 
-        for model_file in yaml_files:
+    def _model_from_config(
+        self,
+        draft: ModelState,
+        model_id: str,
+        config: dict,
+        resolve: Callable[[str | None], ModelConfiguration | None],
+    ) -> ModelConfiguration:
+        base_config = config["identity"].get("base_config", None)
+        if resolve(model_id) is not None or resolve(base_config) is not None:
+            normalized_id = base_config or model_id
+            logger.debug(f"Found existing model {normalized_id}, merging configs")
+            base_model = resolve(normalized_id)
+            if base_model is None:
+                raise ModelNotFoundError(normalized_id)
+            merged_config = merge_configs(self._base_dump(base_model), config)
+            # Chained models keep the class of the built-in at the root of the chain
+            base_model_class = draft.builtin_models.get(normalized_id) or type(base_model)
+            return base_model_class.from_config(merged_config)
+
+        builtin_class = draft.builtin_models.get(model_id)
+        if builtin_class is not None:
+            return builtin_class.from_config(config)
+        return ModelConfiguration.from_config(config)
+
+    def _base_dump(self, model: ModelConfiguration) -> dict:
+        cached = self._base_dumps.get(model.identity.id)
+        if cached is None or cached[0] is not model:
+            dump = model.model_dump()
+            dump["parameters"] = {}
+            cached = self._base_dumps[model.identity.id] = (model, dump)
+        return cached[1]
+
+    def _load_model_files(
+        self,
+        draft: ModelState,
+        yaml_files: list[Path],
+        *,
+        workers: int | None = None,
+        staged: dict[str, ModelConfiguration | None] | None = None,
+    ) -> dict[Path, tuple[str | None, frozenset[str]]]:
+        """Build a model from each file and register it.
+
+        Files are loaded in directory order, except that a file whose ``base_config`` is defined by
+        another of the files is loaded after it, so chains of any depth resolve in one pass. Files
+        in a ``base_config`` cycle fail to load. With ``staged``, models are looked up in and written to ``staged`` first instead of being
+        registered. Returns the id each file produced (None if it failed) and the ids it depends on.
+        """
+
+        def resolve(model_id: str | None) -> ModelConfiguration | None:
+            if staged is not None and model_id in staged:
+                return staged[model_id]
+            return draft.get(model_id)
+
+        logger.opt(lazy=True).debug(
+            "Found {} YAML files: {}", lambda: len(yaml_files), lambda: [f.name for f in yaml_files]
+        )
+        configs = load_yaml_files(
+            yaml_files,
+            workers=no_llm_settings.yaml_workers if workers is None else workers,
+            executor=no_llm_settings.yaml_executor,
+        )
+        order, cyclic = _inheritance_order(yaml_files, configs)
+        results: dict[Path, tuple[str | None, frozenset[str]]] = {}
+        for i in cyclic:
+            model_id = yaml_files[i].stem
+            logger.error(f"Error loading model {model_id}: base_config {_base_config_id(configs[i])} forms a cycle")
+            results[yaml_files[i]] = (None, frozenset(filter(None, (model_id, _base_config_id(configs[i])))))
+
+        for i in order:
+            model_file, config = yaml_files[i], configs[i]
             model_id = model_file.stem
+            depends_on = frozenset({model_id})
             try:
-                logger.debug(f"Loading model config from file: {model_file}")
-                with open(model_file) as f:
-                    config = yaml.safe_load(f)
-                logger.debug(f"Loaded YAML config: {config}")
-
-                base_config = config["identity"].get("base_config", None)
-                if model_id in self._models or base_config in self._models:
-                    normalized_id = base_config or model_id
-                    logger.debug(f"Found existing model {normalized_id}, merging configs")
-                    base_model = self._models[normalized_id]
-                    base_config = base_model.model_dump()
-                    base_config["parameters"] = {}
-                    merged_config = merge_configs(base_config, config)
-                    base_model_class = self._builtin_models.get(normalized_id)
-                    if base_model_class:
-                        model = base_model_class.from_config(merged_config)
-                    else:
-                        model = ModelConfiguration.from_config(merged_config)
-                else:
-                    base_model_class = self._builtin_models.get(model_id)
-                    if base_model_class:
-                        model = base_model_class.from_config(config)
-                    else:
-                        model = ModelConfiguration.from_config(config)
-
-                self.register(model)
-                logger.debug(f"Registered model: {model_id} with description: {model.identity.description}")
+                if isinstance(config, Exception):
+                    raise config
+                # The lambdas are called right away, if at all, so binding the loop variables late is fine
+                logger.opt(lazy=True).debug(
+                    "Loaded YAML config from {}: {}",
+                    lambda: model_file,  # noqa: B023
+                    lambda: config,  # noqa: B023
+                )
+                depends_on = frozenset(filter(None, (model_id, config["identity"].get("base_config"))))
+                model = self._model_from_config(draft, model_id, config, resolve)
             except Exception as e:  # noqa: BLE001
                 logger.opt(exception=e).error(f"Error loading model {model_id}")
+                results[model_file] = (None, depends_on)
+                continue
 
-    def _load_configurations(self) -> None:
+            if staged is None:
+                draft.register(model)
+            else:
+                staged[model.identity.id] = model
+            logger.debug(f"Registered model: {model_id} with description: {model.identity.description}")
+            results[model_file] = (model.identity.id, depends_on)
+        return {path: results[path] for path in yaml_files}
+
+    def _load_configurations(self, draft: ModelState) -> None:
         if not self._config_dir:
             logger.warning("No config directory set")
             return
 
         models_dir = self._config_dir / "models"
         logger.debug(f"Models directory path: {models_dir}")
-        logger.debug(f"Models directory exists: {models_dir.exists()}")
-        if models_dir.exists():
-            logger.debug(f"Models directory contents: {list(models_dir.iterdir())}")
-        self.register_models_from_directory(models_dir)
+        if not models_dir.exists():
+            logger.warning(f"Models directory not found: {models_dir}")
+            return
 
-    def register(self, model: ModelConfiguration, builtin: bool = False) -> None:
-        if model.identity.id in self._models:
-            logger.debug(f"Overriding existing model configuration: {model.identity.id}")
+        # Recorded before parsing, so an edit made while loading is picked up by the next reload
+        self._sources, _ = scan_source_files(list_yaml_files(models_dir), {})
+        for path, (model_id, depends_on) in self._load_model_files(draft, list(self._sources)).items():
+            self._sources[path].resource_id = model_id
+            self._sources[path].depends_on = depends_on
 
-        self._models[model.identity.id] = model
-        logger.debug(f"Registered model: {model.identity.id}")
-        if builtin:
-            self._builtin_models[model.identity.id] = model.__class__
+    def register(self, model: ModelConfiguration, builtin: bool = False) -> None:
+        with self._published.writing() as draft:
+            draft.register(model, builtin=builtin)
 
     def get(self, model_id: str) -> ModelConfiguration:
-        if model_id not in self._models:
+        model = self._materialize(model_id)
+        if model is None:
             logger.error(f"Model {model_id} not found")
             raise ModelNotFoundError(model_id)
-        return self._models[model_id]
+        return model
 
     def list(
         self,
         *,
         provider: str | None = None,
+        compatible_provider: str | None = None,
         capabilities: set[ModelCapability] | SetFilter[ModelCapability] | None = None,
         privacy_levels: set[PrivacyLevel] | SetFilter[PrivacyLevel] | None = None,
         mode: ModelMode | None = None,
@@ -180,63 +364,173 @@ class ModelRegistry:
             privacy_levels = SetFilter(privacy_levels)
 
         logger.debug(
-            f"Listing models with filters: provider={provider}, capabilities={capabilities}, "
+            f"Listing models with filters: provider={provider}, compatible_provider={compatible_provider}, "
+            f"capabilities={capabilities}, "
             f"mode={mode}, privacy_levels={privacy_levels}, only_valid={only_valid}, only_active={only_active}"
         )
 
-        for model in self._models.values():
-            # Filter by active status
+        # Everything is answered from the state current when listing started, whatever writers do meanwhile
+        state = self._published.state
+        mask = state.index.select(
+            provider=provider,
+            compatible_provider=compatible_provider,
+            capabilities=capabilities,
+            privacy_levels=privacy_levels,
+            mode=mode,
+        )
+        model_ids = list(state.index.ids(mask))
+        if only_active:
+            # The index knows the status a model was registered with. That is current for models that aren't
+            # built yet, a built one can have is_active set in place and is checked below instead
+            inactive = set(state.index.ids(mask & ~state.index.active))
+            model_ids = [
+                model_id for model_id in model_ids if model_id not in inactive or model_id not in state.pending_models
+            ]
+        if any(model_id in state.pending_models for model_id in model_ids):
+            # One publish for all the models built here, rather than a copy of the state for each
+            state = self._materialize_all(model_ids)
+        for model_id in model_ids:
+            model = state.models.get(model_id)
+            if model is None:
+                continue
             if only_active and not model.is_active:
-                logger.debug(f"Skipping model {model.identity.id} - inactive")
                 continue
-
-            # Filter by valid status
             if only_valid and not model.is_valid:
-                logger.debug(f"Skipping model {model.identity.id} - invalid")
-                continue
-
-            if provider and not any(p.type == provider for p in model.providers):
-                continue
-
-            if capabilities:
-                model_caps = set(model.capabilities)
-                if capabilities.mode == "any":
-                    if not (model_caps & capabilities.values):
-                        continue
-                elif not (capabilities.values <= model_caps):
-                    continue
-
-            if privacy_levels:
-                model_privacy = set(model.metadata.privacy_level)
-                if privacy_levels.mode == "any":
-                    if not (model_privacy & privacy_levels.values):
-                        continue
-                elif not (privacy_levels.values <= model_privacy):
-                    continue
-
-            if mode and model.mode != mode:
                 continue
-
             yield model
 
-    def set_active(self, model_id: str, is_active: bool) -> None:
-        """Set the active status of a model"""
-        if model_id not in self._models:
-            logger.error(f"Cannot set active status: model {model_id} not found")
+    def compatible_provider_types(self, model_id: str) -> tuple[str, ...]:
+        """Types of the providers a model can run on, without building it"""
+        provider_types = self._published.state.index.compatible_provider_types(model_id)
+        if provider_types is None:
             raise ModelNotFoundError(model_id)
+        return provider_types
 
-        self._models[model_id].is_active = is_active
+    def set_active(self, model_id: str, is_active: bool) -> None:
+        """Set the active status of a model"""
+        with self._published.writing() as draft:
+            model = draft.get(model_id)
+            if model is None:
+                logger.error(f"Cannot set active status: model {model_id} not found")
+                raise ModelNotFoundError(model_id)
+
+            # Registered models are shared with readers of older states, so they are replaced, not modified
+            draft.register(model.model_copy(update={"is_active": is_active}))
         logger.debug(f"Set model {model_id} active status to: {is_active}")
 
     def remove(self, model_id: str) -> None:
-        if model_id not in self._models:
-            logger.error(f"Cannot remove: model {model_id} not found")
-            raise ModelNotFoundError(model_id)
-        del self._models[model_id]
+        with self._published.writing() as draft:
+            if not draft.discard(model_id):
+                logger.error(f"Cannot remove: model {model_id} not found")
+                raise ModelNotFoundError(model_id)
         logger.debug(f"Removed model: {model_id}")
 
-    def reload(self) -> None:
+    def reload(self, *, full: bool = False) -> ChangeSet:
+        """Bring the registry in line with its config directory.
+
+        Only the files that were added, edited or deleted since the last load are parsed again, and
+        only the models they define, plus the models merged onto those through ``base_config``, are
+        rebuilt. Every other model is left as it is, active status included, and models being rebuilt
+        stay readable until their replacement is registered.
+
+        Args:
+            full: Rebuild every model, built-ins included, into a fresh registry and swap it in
+
+        Returns:
+            The ids of the models that were added, updated or removed
+        """
+        if full:
+            return self._full_reload()
+        if not self._config_dir:
+            return ChangeSet()
+
+        models_dir = self._config_dir / "models"
+        yaml_files = list_yaml_files(models_dir) if models_dir.exists() else []
+        sources, changed = scan_source_files(yaml_files, self._sources)
+        deleted = self._sources.keys() - sources.keys()
+        if not changed and not deleted:
+            logger.debug("Model configurations unchanged")
+            return ChangeSet()
+        logger.debug(f"Reloading model configurations: {len(changed)} changed, {len(deleted)} deleted")
+
+        # Models the changed files defined before, or may define now, go back to their built-in state
+        affected = {path.stem for path in changed}
+        for path in [*changed, *deleted]:
+            known = self._sources.get(path)
+            if known is not None and known.resource_id is not None:
+                affected.add(known.resource_id)
+
+        with self._published.writing() as draft:
+            changes = self._reload_files(draft, sources, changed, affected)
+        self._sources = sources
+        logger.debug(
+            f"Reloaded models: added={sorted(changes.added)}, updated={sorted(changes.updated)}, "
+            f"removed={sorted(changes.removed)}"
+        )
+        return changes
+
+    def _reload_files(
+        self, draft: ModelState, sources: dict[Path, SourceFile], changed: builtins.list[Path], affected: set[str]
+    ) -> ChangeSet:
+        while True:
+            # Re-apply, in directory order, every file that defines or was merged onto an affected model
+            reapply = set(changed)
+            grown = True
+            while grown:
+                grown = False
+                for path, record in sources.items():
+                    if path not in reapply and (record.resource_id in affected or record.depends_on & affected):
+                        reapply.add(path)
+                        affected.add(record.resource_id or path.stem)
+                        grown = True
+
+            staged = {model_id: self._fresh_builtin(draft, model_id) for model_id in affected}
+            results = self._load_model_files(draft, [path for path in sources if path in reapply], staged=staged)
+            new_ids = {model_id for model_id, _ in results.values() if model_id is not None} - affected
+            if not new_ids:
+                break
+            affected |= new_ids
+
+        for path, (model_id, depends_on) in results.items():
+            sources[path].resource_id = model_id
+            sources[path].depends_on = depends_on
+        return self._apply_staged(draft, staged)
+
+    def _fresh_builtin(self, draft: ModelState, model_id: str) -> ModelConfiguration | None:
+        spec = BUILTIN_MODELS.get(model_id)
+        if spec is None:
+            return None
+        try:
+            model = spec.build()
+        except ImportError as e:
+            logger.debug(f"Could not import module {spec.module}: {e}")
+            return None
+        # Files merged onto this model are built with its class
+        draft.builtin_models[model_id] = type(model)
+        return model
+
+    def _apply_staged(self, draft: ModelState, staged: dict[str, ModelConfiguration | None]) -> ChangeSet:
+        changes = ChangeSet()
+        for model_id, model in staged.items():
+            current = draft.get(model_id)
+            if model is None:
+                if draft.discard(model_id):
+                    changes.removed.add(model_id)
+                continue
+            if current is not None and type(current) is type(model) and current.model_dump() == model.model_dump():
+                continue
+            draft.register(model)
+            (changes.updated if current is not None else changes.added).add(model_id)
+        return changes
+
+    def _full_reload(self) -> ChangeSet:
         logger.debug("Reloading all configurations")
-        self._models.clear()
-        self._register_builtin_models()
-        self._load_configurations()
+        fresh = type(self)(self._config_dir, lazy=self._lazy)
+        before = self._published.state
+        self._published.replace(fresh.state)
+        self._sources = fresh._sources
+        self._base_dumps = fresh._base_dumps
+        clear_settings_cache()
+        before_ids = before.models.keys() | before.pending_models.keys()
+        after_ids = fresh.state.models.keys() | fresh.state.pending_models.keys()
+        return ChangeSet(added=after_ids - before_ids, updated=after_ids & before_ids, removed=before_ids - after_ids)
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 
 from no_llm import ModelCapability, ModelConfiguration, ModelParameters, ModelRegistry
 from no_llm.errors import ModelNotFoundError
+from no_llm.models.config.enums import capability_mask
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -42,6 +43,7 @@ class ModelPreset(BaseModel):
         return list(set(models))
 
     def iter(self, registry: ModelRegistry) -> Iterator[ModelConfiguration]:
+        required_mask = capability_mask(self.required_capabilities)
         for model in self.models:
             if isinstance(model, str):
                 try:
@@ -50,21 +52,20 @@ class ModelPreset(BaseModel):
                     logger.warning(f"Model {model} not found in registry: {e}. Skipping.")
                     continue
 
-                if len(self.required_capabilities) > 0 and not model_cfg.check_capabilities(self.required_capabilities):
+                if required_mask and not model_cfg.check_capabilities(required_mask):
                     logger.warning(
                         f"Model {model} does not have the required capabilities: {self.required_capabilities}. Skipping."
                     )
                     continue
 
                 if self.parameters is not None:
-                    model_cfg.set_parameters(self.parameters)
+                    model_cfg = model_cfg.with_parameters(self.parameters)
 
                 for provider in model_cfg.iter():
                     providers = provider.iter() if self.data_center_fallback else [provider]
                     for provider_i in providers:
-                        copied_cfg = model_cfg.model_copy(deep=True)
-                        copied_cfg.providers = (
-                            [provider_i] if self.data_center_fallback else [provider]  # type: ignore
+                        copied_cfg = model_cfg.model_copy(
+                            update={"providers": [provider_i] if self.data_center_fallback else [provider]}
                         )
                         self._current_model = copied_cfg
                         yield copied_cfg
@@ -15,6 +15,17 @@ from no_llm.providers.provider_configs.openrouter import OpenRouterProvider
 from no_llm.providers.provider_configs.perplexity import PerplexityProvider
 from no_llm.providers.provider_configs.together import TogetherProvider
 from no_llm.providers.provider_configs.vertex import VertexProvider
+from no_llm.providers.secrets import (
+    CommandBackend,
+    EnvBackend,
+    FileBackend,
+    SecretBackend,
+    SecretResolver,
+    get_secret_resolver,
+    prefetch_secrets,
+    refresh_env,
+    set_secret_resolver,
+)
 
 __all__ = [
     "EnvVar",
@@ -34,6 +45,15 @@ __all__ = [
     "FireworksProvider",
     "GeminiProvider",
     "ProviderConfiguration",
+    "refresh_env",
+    "SecretResolver",
+    "SecretBackend",
+    "EnvBackend",
+    "FileBackend",
+    "CommandBackend",
+    "get_secret_resolver",
+    "set_secret_resolver",
+    "prefetch_secrets",
 ]
 
 Provider = ProviderConfiguration
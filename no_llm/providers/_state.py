@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from no_llm._state import RegistryState
+
+if TYPE_CHECKING:
+    from no_llm.providers.config import ProviderConfiguration
+
+
+class ProviderState(RegistryState):
+    """The providers of a ``ProviderRegistry`` at one generation"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.providers: dict[str, ProviderConfiguration] = {}
+        # Provider ids by type, in registration order; a bucket is replaced rather than modified
+        self.by_type: dict[str, dict[str, None]] = {}
+
+    def copy(self) -> ProviderState:
+        state = ProviderState.__new__(ProviderState)
+        state.generation = self.generation
+        state.dirty = False
+        state.providers = dict(self.providers)
+        state.by_type = dict(self.by_type)
+        return state
+
+    def register(self, provider: ProviderConfiguration) -> None:
+        existing = self.providers.get(provider.id)
+        if existing is not None:
+            logger.debug(f"Overriding existing provider: {provider.id}")
+            if existing.type != provider.type:
+                self._unindex(existing)
+        self.dirty = True
+        self.providers[provider.id] = provider
+        bucket = self.by_type.get(provider.type, {})
+        if provider.id not in bucket:
+            # A replaced provider keeps its position among the providers of its type
+            self.by_type[provider.type] = {**bucket, provider.id: None}
+        logger.debug(f"Registered provider: {provider.id} ({provider.name}) type={provider.type}")
+
+    def discard(self, provider_id: str) -> bool:
+        """Remove a provider, returning whether it was registered"""
+        provider = self.providers.pop(provider_id, None)
+        if provider is None:
+            return False
+        self._unindex(provider)
+        self.dirty = True
+        return True
+
+    def _unindex(self, provider: ProviderConfiguration) -> None:
+        bucket = self.by_type.get(provider.type, {})
+        if provider.id in bucket:
+            self.by_type[provider.type] = {provider_id: None for provider_id in bucket if provider_id != provider.id}
@@ -0,0 +1,177 @@
+"""Reuse of pydantic-ai providers and their HTTP connections.
+
+Building a pydantic-ai provider builds an SDK client, and without help every ``NoLLMModel`` gets its
+own. ``ClientPool`` keeps the providers it built in a bounded LRU cache keyed by
+``ProviderConfiguration.client_key()``, and hands all SDKs one ``httpx.AsyncClient`` so TLS
+connections are shared between agents.
+
+httpx connection pools belong to the event loop they were opened on, while SDK clients are usually
+built outside of any loop. The shared client therefore keeps one pool per event loop and sends each
+request through the pool of the loop it runs on, so a cached provider works in every loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from loguru import logger
+
+from no_llm._utils import LRUCache
+from no_llm.settings import settings as no_llm_settings
+
+if TYPE_CHECKING:
+    from pydantic_ai.providers import Provider as PydanticProvider
+    from typing_extensions import Self
+
+    from no_llm.providers.config import ProviderConfiguration
+
+# Same as the defaults of pydantic-ai's cached client
+_TIMEOUT = httpx.Timeout(timeout=600, connect=5)
+
+# How long aclose waits for another thread's event loop to close its connections
+_CLOSE_TIMEOUT = 5.0
+
+
+class _LoopTransport(httpx.AsyncBaseTransport):
+    """Sends requests through a connection pool owned by the running event loop"""
+
+    def __init__(self, limits: httpx.Limits, http2: bool) -> None:
+        self._limits = limits
+        self._http2 = http2
+        self._transports: dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = {}
+        self._lock = threading.Lock()
+
+    def _new_transport(self) -> httpx.AsyncHTTPTransport:
+        if self._http2:
+            try:
+                return httpx.AsyncHTTPTransport(limits=self._limits, http2=True)
+            except ImportError:
+                logger.warning("HTTP/2 needs the h2 package (`pip install httpx[http2]`), using HTTP/1.1")
+                self._http2 = False
+        return httpx.AsyncHTTPTransport(limits=self._limits)
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is not None:
+            return transport
+        with self._lock:
+            # A closed loop's connections can't be used or closed anymore, let them go with it
+            for closed in [other for other in self._transports if other.is_closed()]:
+                del self._transports[closed]
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self._transports[loop] = self._new_transport()
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the pools of every event loop"""
+        with self._lock:
+            transports, self._transports = self._transports, {}
+        running = asyncio.get_running_loop()
+        for loop, transport in transports.items():
+            try:
+                if loop is not running and loop.is_running():
+                    # Owned by a loop running on another thread, which has to close it itself
+                    future = asyncio.run_coroutine_threadsafe(transport.aclose(), loop)
+                    await asyncio.wait_for(asyncio.wrap_future(future), _CLOSE_TIMEOUT)
+                else:
+                    await transport.aclose()
+            except (RuntimeError, asyncio.TimeoutError) as e:
+                # A closed loop can't shut its connections down, their sockets are freed with the pool
+                logger.debug(f"Could not close the connections of an event loop: {e}")
+
+
+class ClientPool:
+    """Process-wide cache of pydantic-ai providers sharing one HTTP client
+
+    Args:
+        maxsize: Providers to keep, the least recently used ones are dropped first
+        limits: Connection limits of each event loop's pool
+        http2: Use HTTP/2 where the server supports it
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool | None = None,
+    ) -> None:
+        self.limits = limits or httpx.Limits(
+            max_connections=no_llm_settings.http_max_connections,
+            max_keepalive_connections=no_llm_settings.http_max_keepalive_connections,
+            keepalive_expiry=no_llm_settings.http_keepalive_expiry,
+        )
+        self.http2 = no_llm_settings.http2 if http2 is None else http2
+        self._providers: LRUCache[tuple[Any, ...], PydanticProvider] = LRUCache(
+            no_llm_settings.client_cache_size if maxsize is None else maxsize
+        )
+        self._http_client: httpx.AsyncClient | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The client every provider of the pool sends its requests with"""
+        client = self._http_client
+        if client is not None and not client.is_closed:
+            return client
+        with self._lock:
+            if self._http_client is None or self._http_client.is_closed:
+                if self._http_client is not None:
+                    # Somebody closed the shared client, providers holding it can't be used anymore
+                    logger.debug("Shared HTTP client was closed, building a new one")
+                    self._providers.clear()
+                self._http_client = httpx.AsyncClient(
+                    transport=_LoopTransport(self.limits, self.http2),
+                    timeout=_TIMEOUT,
+                )
+            return self._http_client
+
+    def provider(self, config: ProviderConfiguration, *args: Any) -> Any:
+        """The pydantic-ai provider for ``config``, built with ``config.to_pydantic(*args)`` on first use"""
+        http_client = self.http_client
+        key = (*config.client_key(), *args)
+        provider = self._providers.get(key)
+        if provider is None:
+            provider = config.to_pydantic(*args, http_client=http_client)
+            self._providers.put(key, provider)
+            logger.opt(lazy=True).debug("Built pydantic-ai provider for {}", lambda: key[:3])
+        return provider
+
+    def clear(self) -> None:
+        """Forget the cached providers, they are rebuilt on next use"""
+        self._providers.clear()
+
+    async def aclose(self) -> None:
+        """Drop the cached providers and close the shared HTTP client"""
+        with self._lock:
+            client, self._http_client = self._http_client, None
+            self._providers.clear()
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.aclose()
+
+
+client_pool = ClientPool()
+
+
+def get_pydantic_provider(config: ProviderConfiguration, *args: Any) -> Any:
+    """Shared pydantic-ai provider for ``config``, see ``ClientPool.provider``"""
+    return client_pool.provider(config, *args)
+
+
+async def aclose_clients() -> None:
+    """Close the shared HTTP connections, e.g. when the application shuts down"""
+    await client_pool.aclose()
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from abc import abstractmethod
+from functools import cache
 from typing import TYPE_CHECKING, Any, Literal, get_args
 
-from pydantic import Field, model_serializer, model_validator
+from pydantic import Field, PrivateAttr, model_serializer, model_validator
 
 from no_llm._base import BaseResource
 from no_llm.providers.env_var import EnvVar
+from no_llm.providers.secrets import env_generation
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -14,12 +18,26 @@ if TYPE_CHECKING:
     from pydantic_ai.providers import Provider as PydanticProvider
 
 
+@cache
+def _env_var_fields(cls: type[ProviderConfiguration]) -> tuple[str, ...]:
+    return tuple(name for name, field in cls.model_fields.items() if field.annotation == EnvVar[str])
+
+
 class ProviderConfiguration(BaseResource):
     """Base provider configuration"""
 
     type: Literal["provider"] = "provider"
     id: str = Field(description="Provider ID")
     name: str = Field(description="Provider name for display")
+    # (env generation, result) of the last has_valid_env and client_key checks, reset when a field is reassigned
+    _env_validity: tuple[int, bool] | None = PrivateAttr(default=None)
+    _fingerprint: tuple[int, str] | None = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            super().__setattr__("_env_validity", None)
+            super().__setattr__("_fingerprint", None)
 
     @property
     def is_valid(self) -> bool:
@@ -35,16 +53,38 @@ class ProviderConfiguration(BaseResource):
             yield self
 
     def has_valid_env(self) -> bool:
-        """Check if all required environment variables are set"""
-        # TODO; very fickle implementation, should be improved
-        for field_name, field in self.__class__.model_fields.items():
-            if (
-                field.annotation == EnvVar[str]
-                and isinstance(getattr(self, field_name), EnvVar)
-                and not getattr(self, field_name).is_valid()
-            ):
-                return False
-        return True
+        """Check if all required environment variables are set
+
+        The result is cached until ``refresh_env()`` is called or a field of the provider is reassigned.
+        """
+        generation = env_generation()
+        # Read straight from the private storage, going through BaseModel.__getattr__ costs more than the check.
+        # It is only None before __init__ has run
+        cached = (self.__pydantic_private__ or {}).get("_env_validity")
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        valid = all(
+            not isinstance(value, EnvVar) or value.is_valid()
+            for value in (getattr(self, field_name) for field_name in _env_var_fields(type(self)))
+        )
+        self._env_validity = (generation, valid)
+        return valid
+
+    def client_key(self) -> tuple[Any, ...]:
+        """What the pydantic-ai provider built by ``to_pydantic`` depends on
+
+        Type, id, current location and a fingerprint of the resolved settings. Secrets are part of the
+        fingerprint, so a rotated key gets a new client.
+        """
+        generation = env_generation()
+        cached = (self.__pydantic_private__ or {}).get("_fingerprint")
+        if cached is not None and cached[0] == generation:
+            fingerprint = cached[1]
+        else:
+            resolved = json.dumps(self.model_dump(), sort_keys=True, default=str)
+            fingerprint = hashlib.sha256(resolved.encode()).hexdigest()[:16]
+            self._fingerprint = (generation, fingerprint)
+        return (self.type, self.id, getattr(self, "current", None), fingerprint)
 
     @model_serializer
     def serialize_model(self) -> dict[str, Any]:
@@ -1,9 +1,10 @@
-import os
 from typing import Any, Generic, TypeVar
 
 from pydantic import GetCoreSchemaHandler
 from pydantic_core import CoreSchema, core_schema
 
+from no_llm.providers.secrets import resolve_secret
+
 T = TypeVar("T")
 
 
@@ -15,9 +16,8 @@ class EnvVar(Generic[T]):
         self.var_name = var_name
 
     def __get__(self, instance: Any, owner: Any) -> str:
-        env_name = self.var_name[1:]  # Remove '$'
-        env_value = os.getenv(env_name)
-        return env_value if env_value is not None else self.var_name
+        value = resolve_secret(self.var_name[1:])  # Remove '$'
+        return value if value is not None else self.var_name
 
     def __repr__(self) -> str:
         return self.__get__(None, None)
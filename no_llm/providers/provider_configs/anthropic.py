@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 from urllib.parse import urljoin
 
-import httpx
 from loguru import logger
 from pydantic import Field
-from pydantic_ai.providers.anthropic import (
-    AnthropicProvider as PydanticAnthropicProvider,
-)
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
 
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai.providers.anthropic import AnthropicProvider as PydanticAnthropicProvider
+
 
 class AnthropicProvider(ProviderConfiguration):
     """Anthropic provider configuration"""
@@ -27,6 +27,8 @@ class AnthropicProvider(ProviderConfiguration):
     base_url: str | None = Field(default=None, description="Optional base URL override")
 
     async def test(self) -> bool:
+        import httpx
+
         try:
             base_url = str(self.base_url)
             if not base_url.endswith("/"):
@@ -41,7 +43,10 @@ class AnthropicProvider(ProviderConfiguration):
             logger.opt(exception=e).error(f"Failed to test connectivity to {self.__class__.__name__}")
             return False
 
-    def to_pydantic(self) -> PydanticAnthropicProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticAnthropicProvider:
+        from pydantic_ai.providers.anthropic import AnthropicProvider as PydanticAnthropicProvider
+
         return PydanticAnthropicProvider(
             api_key=str(self.api_key),
+            http_client=http_client,
         )
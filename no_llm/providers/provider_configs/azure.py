@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Literal
 
 from pydantic import Field, PrivateAttr
-from pydantic_ai.providers.azure import AzureProvider as PydanticAzureProvider
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
@@ -11,6 +10,9 @@ from no_llm.providers.env_var import EnvVar
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    import httpx
+    from pydantic_ai.providers.azure import AzureProvider as PydanticAzureProvider
+
 
 class AzureProvider(ProviderConfiguration):
     """Azure provider configuration"""
@@ -47,11 +49,14 @@ class AzureProvider(ProviderConfiguration):
     def reset_variants(self) -> None:
         self._value = None
 
-    def to_pydantic(self) -> PydanticAzureProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticAzureProvider:
+        from pydantic_ai.providers.azure import AzureProvider as PydanticAzureProvider
+
         return PydanticAzureProvider(
             api_key=str(self.api_key),
             azure_endpoint=str(self.base_url),
             api_version=self.api_version,
+            http_client=http_client,
         )
 
     async def test(self) -> bool:
@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Literal
 
 from pydantic import Field, PrivateAttr
-from pydantic_ai.providers.bedrock import BedrockProvider as PydanticBedrockProvider
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
@@ -11,6 +10,9 @@ from no_llm.providers.env_var import EnvVar
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    import httpx
+    from pydantic_ai.providers.bedrock import BedrockProvider as PydanticBedrockProvider
+
 
 class BedrockProvider(ProviderConfiguration):
     """AWS Bedrock provider configuration"""
@@ -39,7 +41,10 @@ class BedrockProvider(ProviderConfiguration):
     def reset_variants(self) -> None:
         self._value = None
 
-    def to_pydantic(self) -> PydanticBedrockProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticBedrockProvider:
+        from pydantic_ai.providers.bedrock import BedrockProvider as PydanticBedrockProvider
+
+        # boto3 manages its own connections, http_client is not used
         return PydanticBedrockProvider(
             region_name=str(self.region),
         )
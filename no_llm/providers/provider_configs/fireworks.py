@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from pydantic import Field
-from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
 
 from no_llm.providers.env_var import EnvVar
 from no_llm.providers.provider_configs.openai import OpenAIProvider
 
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
+
 
 class FireworksProvider(OpenAIProvider):
     """Fireworks provider configuration"""
@@ -24,8 +27,11 @@ class FireworksProvider(OpenAIProvider):
         description="Base URL for Fireworks API",
     )
 
-    def to_pydantic(self) -> PydanticOpenAIProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticOpenAIProvider:
+        from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
+
         return PydanticOpenAIProvider(
             api_key=str(self.api_key),
             base_url=str(self.base_url),
+            http_client=http_client,
         )
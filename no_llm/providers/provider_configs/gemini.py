@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
-import httpx
 from loguru import logger
 from pydantic import Field
-from pydantic_ai.providers.google import GoogleProvider as PydanticGoogleProvider
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
 
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai.providers.google import GoogleProvider as PydanticGoogleProvider
+
 
 class GeminiProvider(ProviderConfiguration):
     """Gemini provider configuration"""
@@ -23,6 +25,8 @@ class GeminiProvider(ProviderConfiguration):
     )
 
     async def test(self) -> bool:
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(
@@ -34,7 +38,10 @@ class GeminiProvider(ProviderConfiguration):
             logger.opt(exception=e).error(f"Failed to test connectivity to {self.__class__.__name__}")
             return False
 
-    def to_pydantic(self) -> PydanticGoogleProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticGoogleProvider:
+        from pydantic_ai.providers.google import GoogleProvider as PydanticGoogleProvider
+
+        # google-genai manages its own connections, http_client is not used
         return PydanticGoogleProvider(
             api_key=str(self.api_key),
         )
@@ -1,13 +1,17 @@
-from typing import Literal
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
 
-import httpx
 from loguru import logger
 from pydantic import Field
-from pydantic_ai.providers.groq import GroqProvider as PydanticGroqProvider
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
 
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai.providers.groq import GroqProvider as PydanticGroqProvider
+
 
 class GroqProvider(ProviderConfiguration):
     """Groq provider configuration"""
@@ -21,6 +25,8 @@ class GroqProvider(ProviderConfiguration):
     )
 
     async def test(self) -> bool:
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(
@@ -32,7 +38,10 @@ class GroqProvider(ProviderConfiguration):
             logger.opt(exception=e).error(f"Failed to test connectivity to {self.__class__.__name__}")
             return False
 
-    def to_pydantic(self) -> PydanticGroqProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticGroqProvider:
+        from pydantic_ai.providers.groq import GroqProvider as PydanticGroqProvider
+
         return PydanticGroqProvider(
             api_key=str(self.api_key),
+            http_client=http_client,
         )
@@ -1,13 +1,17 @@
-from typing import Literal
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
 
-import httpx
 from loguru import logger
 from pydantic import Field
-from pydantic_ai.providers.mistral import MistralProvider as PydanticMistralProvider
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
 
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai.providers.mistral import MistralProvider as PydanticMistralProvider
+
 
 class MistralProvider(ProviderConfiguration):
     """Mistral provider configuration"""
@@ -21,6 +25,8 @@ class MistralProvider(ProviderConfiguration):
     )
 
     async def test(self) -> bool:
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(
@@ -31,7 +37,10 @@ class MistralProvider(ProviderConfiguration):
             logger.opt(exception=e).error(f"Failed to test connectivity to {self.__class__.__name__}")
             return False
 
-    def to_pydantic(self) -> PydanticMistralProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticMistralProvider:
+        from pydantic_ai.providers.mistral import MistralProvider as PydanticMistralProvider
+
         return PydanticMistralProvider(
             api_key=str(self.api_key),
+            http_client=http_client,
         )
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 from urllib.parse import urljoin
 
-import httpx
 from loguru import logger
 from pydantic import Field
-from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
 
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
+
 
 class OpenAIProvider(ProviderConfiguration):
     """OpenAI provider configuration"""
@@ -25,6 +27,8 @@ class OpenAIProvider(ProviderConfiguration):
     base_url: str | None = Field(default="https://api.openai.com/v1/", description="Optional base URL override")
 
     async def test(self) -> bool:
+        import httpx
+
         try:
             base_url = str(self.base_url)
             if not base_url.endswith("/"):
@@ -38,8 +42,11 @@ class OpenAIProvider(ProviderConfiguration):
             logger.opt(exception=e).error(f"Failed to test connectivity to {self.__class__.__name__}")
             return False
 
-    def to_pydantic(self) -> PydanticOpenAIProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticOpenAIProvider:
+        from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
+
         return PydanticOpenAIProvider(
             api_key=str(self.api_key),
             base_url=str(self.base_url),
+            http_client=http_client,
         )
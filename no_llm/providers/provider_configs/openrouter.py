@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 from urllib.parse import urljoin
 
-import httpx
 from loguru import logger
 from pydantic import Field
-from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
 
 from no_llm.providers.env_var import EnvVar
 from no_llm.providers.provider_configs.openai import OpenAIProvider
 
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
+
 
 class OpenRouterProvider(OpenAIProvider):
     """OpenRouter provider configuration"""
@@ -27,13 +29,18 @@ class OpenRouterProvider(OpenAIProvider):
         description="Base URL for OpenRouter API",
     )
 
-    def to_pydantic(self) -> PydanticOpenAIProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticOpenAIProvider:
+        from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
+
         return PydanticOpenAIProvider(
             api_key=str(self.api_key),
             base_url=str(self.base_url),
+            http_client=http_client,
         )
 
     async def test(self) -> bool:
+        import httpx
+
         base_url = str(self.base_url)
         if not base_url.endswith("/"):
             base_url += "/"
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from pydantic import Field
-from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
 
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
+
 
 class TestProvider(ProviderConfiguration):
     """Test provider configuration for testing purposes only"""
@@ -29,9 +32,12 @@ class TestProvider(ProviderConfiguration):
         """Always returns True for testing - doesn't require real env vars"""
         return True
 
-    def to_pydantic(self) -> PydanticOpenAIProvider:
+    def to_pydantic(self, http_client: httpx.AsyncClient | None = None) -> PydanticOpenAIProvider:
         """Returns a mock OpenAI provider for testing"""
+        from pydantic_ai.providers.openai import OpenAIProvider as PydanticOpenAIProvider
+
         return PydanticOpenAIProvider(
             api_key="test-key",
             base_url=str(self.base_url),
+            http_client=http_client,
         )
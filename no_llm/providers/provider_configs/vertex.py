@@ -3,19 +3,8 @@ from __future__ import annotations
 import sys
 from typing import TYPE_CHECKING, Literal, assert_never, cast
 
-from anthropic import AsyncAnthropicVertex
 from loguru import logger
-from mistralai_gcp import MistralGoogleCloud
 from pydantic import Field, PrivateAttr
-from pydantic_ai.providers.anthropic import (
-    AnthropicProvider as PydanticAnthropicProvider,
-)
-from pydantic_ai.providers.google import GoogleProvider as PydanticGoogleProvider
-from pydantic_ai.providers.google_vertex import (
-    GoogleVertexProvider as PydanticGoogleVertexProvider,
-)
-from pydantic_ai.providers.google_vertex import VertexAiRegion
-from pydantic_ai.providers.mistral import MistralProvider as PydanticMistralProvider
 
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.providers.env_var import EnvVar
@@ -23,8 +12,16 @@ from no_llm.providers.env_var import EnvVar
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    import httpx
+    from pydantic_ai.providers.anthropic import AnthropicProvider as PydanticAnthropicProvider
+    from pydantic_ai.providers.google import GoogleProvider as PydanticGoogleProvider
+    from pydantic_ai.providers.google_vertex import GoogleVertexProvider as PydanticGoogleVertexProvider
+    from pydantic_ai.providers.google_vertex import VertexAiRegion
+    from pydantic_ai.providers.mistral import MistralProvider as PydanticMistralProvider
+
 
 def pydantic_mistral_gcp_patch():
+    import pydantic_ai.models.mistral  # noqa: F401
     from mistralai_gcp import (
         CompletionChunk as MistralCompletionChunk,
     )
@@ -134,26 +131,39 @@ class VertexProvider(ProviderConfiguration):
         self._value = None
 
     def to_pydantic(
-        self, model_family: Literal["gemini", "claude", "mistral", "llama"]
+        self,
+        model_family: Literal["gemini", "claude", "mistral", "llama"],
+        http_client: httpx.AsyncClient | None = None,
     ) -> PydanticGoogleVertexProvider | PydanticAnthropicProvider | PydanticMistralProvider | PydanticGoogleProvider:
         if model_family == "gemini":
+            from pydantic_ai.providers.google import GoogleProvider as PydanticGoogleProvider
+
+            # google-genai manages its own connections, http_client is not used
             return PydanticGoogleProvider(
                 project=str(self.project_id),
-                location=cast(VertexAiRegion, self.current),
+                location=cast("VertexAiRegion", self.current),
             )
         elif model_family == "claude":
+            from anthropic import AsyncAnthropicVertex
+            from pydantic_ai.providers.anthropic import AnthropicProvider as PydanticAnthropicProvider
+
             return PydanticAnthropicProvider(
                 anthropic_client=AsyncAnthropicVertex(  # type: ignore
                     project_id=str(self.project_id),
-                    region=cast(VertexAiRegion, self.current),
+                    region=cast("VertexAiRegion", self.current),
+                    http_client=http_client,
                 ),
             )
         elif model_family == "mistral":
+            from mistralai_gcp import MistralGoogleCloud
+            from pydantic_ai.providers.mistral import MistralProvider as PydanticMistralProvider
+
             pydantic_mistral_gcp_patch()
             return PydanticMistralProvider(
                 mistral_client=MistralGoogleCloud(  # type: ignore
                     project_id=str(self.project_id),
-                    region=cast(VertexAiRegion, self.current),
+                    region=cast("VertexAiRegion", self.current),
+                    async_client=http_client,
                 ),
             )
         elif model_family == "llama":
@@ -166,7 +176,7 @@ class VertexProvider(ProviderConfiguration):
         if len(self.locations) == 0:
             return False
 
-        provider = cast(PydanticGoogleProvider, self.to_pydantic("gemini"))
+        provider = cast("PydanticGoogleProvider", self.to_pydantic("gemini"))
         try:
             # provider.client.models.list(config={"page_size": 5})
             try:
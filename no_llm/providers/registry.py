@@ -1,54 +1,91 @@
 from __future__ import annotations
 
+import builtins
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import yaml
 from loguru import logger
 from pydantic import TypeAdapter, ValidationError
 
-from no_llm._utils import _get_annotated_union_members
+from no_llm._base import ChangeSet
+from no_llm._state import Published
+from no_llm._utils import _get_annotated_union_members, list_yaml_files, load_yaml_files, scan_source_files
 from no_llm.errors import ProviderNotFoundError
 from no_llm.providers import AnyProvider
+from no_llm.providers._state import ProviderState
+from no_llm.settings import settings as no_llm_settings
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
 
+    from no_llm._utils import SourceFile
     from no_llm.providers.config import ProviderConfiguration
 
 
 class ProviderRegistry:
     def __init__(self, config_dir: str | Path | None = None):
-        self._providers: dict[str, ProviderConfiguration] = {}
-        self._config_dir = Path(config_dir) if config_dir else None
+        self._setup(config_dir)
 
         logger.debug("Initializing ProviderRegistry")
 
-        # Register builtin providers with default configurations
-        self._register_builtin_providers()
+        with self._published.writing() as draft:
+            # Register builtin providers with default configurations
+            self._register_builtin_providers(draft)
 
-        if config_dir:
-            logger.debug(f"Using config directory: {config_dir}")
-            self._load_configurations()
+            if config_dir:
+                logger.debug(f"Using config directory: {config_dir}")
+                self._load_configurations(draft)
 
-    def _register_builtin_providers(self) -> None:
-        """Register builtin providers with default configurations"""
-        logger.debug("Registering builtin providers")
+    def _setup(self, config_dir: str | Path | None) -> None:
+        self._published = Published(ProviderState())
+        self._sources: dict[Path, SourceFile] = {}
+        self._config_dir = Path(config_dir) if config_dir else None
 
+    @property
+    def state(self) -> ProviderState:
+        """The current contents of the registry, never modified once published"""
+        return self._published.state
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever a provider is added, replaced or removed, so caches can key on it"""
+        return self._published.state.generation
+
+    @property
+    def _providers(self) -> dict[str, ProviderConfiguration]:
+        return self._published.state.providers
+
+    @classmethod
+    def _restore(cls, configs: Iterable[dict], config_dir: str | Path | None = None) -> ProviderRegistry:
+        """Rebuild a registry from snapshot entries, without loading built-ins or config files"""
+        registry = cls.__new__(cls)
+        registry._setup(config_dir)
+        logger.debug("Restoring ProviderRegistry from snapshot")
+        with registry._published.writing() as draft:
+            for config in configs:
+                draft.register(registry._create_provider_from_config(config))
+        return registry
+
+    def _create_builtin_providers(self) -> Iterator[ProviderConfiguration]:
         # Get all provider classes from the AnyProvider union
         # AnyProvider is Annotated[Union[...], Discriminator(...)]
         provider_classes: list[type[AnyProvider]] = _get_annotated_union_members(AnyProvider)
 
         for provider_class in provider_classes:
             try:
-                provider = provider_class()
-
-                self.register(provider)
-                logger.debug(f"Registered builtin provider: {provider.id} ({provider.type})")
+                yield provider_class()
             except Exception as e:  # noqa: BLE001
                 logger.warning(f"Could not register builtin provider {provider_class.__name__}: {e}")
                 continue
 
+    def _register_builtin_providers(self, draft: ProviderState) -> None:
+        """Register builtin providers with default configurations"""
+        logger.debug("Registering builtin providers")
+
+        for provider in self._create_builtin_providers():
+            draft.register(provider)
+            logger.debug(f"Registered builtin provider: {provider.id} ({provider.type})")
+
     def _create_provider_from_config(self, config: dict) -> ProviderConfiguration:
         """Create a provider instance from YAML configuration"""
         try:
@@ -57,61 +94,97 @@ class ProviderRegistry:
             logger.error(f"Failed to create provider from config: {e}")
             raise
 
-    def register_providers_from_directory(self, providers_dir: Path | str) -> None:
+    def register_providers_from_directory(self, providers_dir: Path | str, *, workers: int | None = None) -> None:
+        """
+        Args:
+            providers_dir: Directory with one ``*.yml``/``*.yaml`` file per provider
+            workers: Parse the files with this many workers, defaults to ``settings.yaml_workers``
+        """
         providers_dir = Path(providers_dir)
         if not providers_dir.exists():
             logger.warning(f"Providers directory not found: {providers_dir}")
             return
 
         logger.debug(f"Loading providers from {providers_dir}")
-        logger.debug(f"Providers directory contents: {list(providers_dir.iterdir())}")
-
-        yaml_files = []
-        for ext in ["*.yml", "*.yaml"]:
-            yaml_files.extend(list(providers_dir.glob(ext)))
-
-        logger.debug(f"Found {len(yaml_files)} YAML files: {[f.name for f in yaml_files]}")
-
-        for provider_file in yaml_files:
+        logger.opt(lazy=True).debug("Providers directory contents: {}", lambda: list(providers_dir.iterdir()))
+        with self._published.writing() as draft:
+            self._load_provider_files(draft, list_yaml_files(providers_dir), workers=workers)
+
+    def _load_provider_files(
+        self,
+        draft: ProviderState,
+        yaml_files: list[Path],
+        *,
+        workers: int | None = None,
+        staged: dict[str, ProviderConfiguration | None] | None = None,
+    ) -> dict[Path, str | None]:
+        """Create a provider from each file, in order, and register it (or write it to ``staged``).
+
+        Returns the id each file produced, None if it failed.
+        """
+        logger.opt(lazy=True).debug(
+            "Found {} YAML files: {}", lambda: len(yaml_files), lambda: [f.name for f in yaml_files]
+        )
+        configs = load_yaml_files(
+            yaml_files,
+            workers=no_llm_settings.yaml_workers if workers is None else workers,
+            executor=no_llm_settings.yaml_executor,
+        )
+        results: dict[Path, str | None] = {}
+        for provider_file, config in zip(yaml_files, configs):
             provider_id = provider_file.stem
+            results[provider_file] = None
             try:
-                logger.debug(f"Loading provider config from file: {provider_file}")
-                with open(provider_file) as f:
-                    config = yaml.safe_load(f)
-                logger.debug(f"Loaded YAML config: {config}")
+                if isinstance(config, Exception):
+                    raise config
+                # The lambdas are called right away, if at all, so binding the loop variables late is fine
+                logger.opt(lazy=True).debug(
+                    "Loaded YAML config from {}: {}",
+                    lambda: provider_file,  # noqa: B023
+                    lambda: config,  # noqa: B023
+                )
 
                 provider = self._create_provider_from_config(config)
-                self.register(provider)
-                logger.debug(f"Registered provider from file: {provider_id} -> {provider.id} ({provider.type})")
             except Exception as e:  # noqa: BLE001
                 logger.opt(exception=e).error(f"Error loading provider {provider_id}")
+                continue
 
-    def _load_configurations(self) -> None:
+            if staged is None:
+                draft.register(provider)
+            else:
+                staged[provider.id] = provider
+            logger.debug(f"Registered provider from file: {provider_id} -> {provider.id} ({provider.type})")
+            results[provider_file] = provider.id
+        return results
+
+    def _load_configurations(self, draft: ProviderState) -> None:
         if not self._config_dir:
             logger.warning("No config directory set")
             return
 
         providers_dir = self._config_dir / "providers"
         logger.debug(f"Providers directory path: {providers_dir}")
-        logger.debug(f"Providers directory exists: {providers_dir.exists()}")
-        if providers_dir.exists():
-            logger.debug(f"Providers directory contents: {list(providers_dir.iterdir())}")
-        self.register_providers_from_directory(providers_dir)
+        if not providers_dir.exists():
+            logger.warning(f"Providers directory not found: {providers_dir}")
+            return
+
+        # Recorded before parsing, so an edit made while loading is picked up by the next reload
+        self._sources, _ = scan_source_files(list_yaml_files(providers_dir), {})
+        for path, provider_id in self._load_provider_files(draft, list(self._sources)).items():
+            self._sources[path].resource_id = provider_id
 
     def register(self, provider: ProviderConfiguration) -> None:
         """Register a provider instance"""
-        if provider.id in self._providers:
-            logger.debug(f"Overriding existing provider: {provider.id}")
-
-        self._providers[provider.id] = provider
-        logger.debug(f"Registered provider: {provider.id} ({provider.name}) type={provider.type}")
+        with self._published.writing() as draft:
+            draft.register(provider)
 
     def get(self, provider_id: str) -> ProviderConfiguration:
         """Get a provider by ID"""
-        if provider_id not in self._providers:
+        provider = self._published.state.providers.get(provider_id)
+        if provider is None:
             logger.error(f"Provider {provider_id} not found")
             raise ProviderNotFoundError(provider_id)
-        return self._providers[provider_id]
+        return provider
 
     def list_by_type(
         self, provider_type: str, *, only_valid: bool = False, only_active: bool = False
@@ -124,9 +197,9 @@ class ProviderRegistry:
             only_active: If True, only return providers that are active
         """
         logger.debug(f"Getting providers by type: {provider_type} (only_valid={only_valid}, only_active={only_active})")
-        for provider in self._providers.values():
-            if provider.type != provider_type:
-                continue
+        state = self._published.state
+        for provider_id in state.by_type.get(provider_type, ()):
+            provider = state.providers[provider_id]
             if only_active and not provider.is_active:
                 logger.debug(f"Skipping provider {provider.id} - inactive")
                 continue
@@ -144,7 +217,7 @@ class ProviderRegistry:
         """
         logger.debug(f"Listing providers (only_valid={only_valid}, only_active={only_active})")
 
-        for provider in self._providers.values():
+        for provider in self._published.state.providers.values():
             if only_active and not provider.is_active:
                 logger.debug(f"Skipping provider {provider.id} - inactive")
                 continue
@@ -155,24 +228,104 @@ class ProviderRegistry:
 
     def set_active(self, provider_id: str, is_active: bool) -> None:
         """Set the active status of a provider"""
-        if provider_id not in self._providers:
-            logger.error(f"Cannot set active status: provider {provider_id} not found")
-            raise ProviderNotFoundError(provider_id)
-
-        self._providers[provider_id].is_active = is_active
+        with self._published.writing() as draft:
+            provider = draft.providers.get(provider_id)
+            if provider is None:
+                logger.error(f"Cannot set active status: provider {provider_id} not found")
+                raise ProviderNotFoundError(provider_id)
+
+            # Registered providers are shared with readers of older states, so they are replaced, not modified
+            draft.register(provider.model_copy(update={"is_active": is_active}))
         logger.debug(f"Set provider {provider_id} active status to: {is_active}")
 
     def remove(self, provider_id: str) -> None:
         """Remove a provider by ID"""
-        if provider_id not in self._providers:
-            logger.error(f"Cannot remove: provider {provider_id} not found")
-            raise ProviderNotFoundError(provider_id)
-        del self._providers[provider_id]
+        with self._published.writing() as draft:
+            if not draft.discard(provider_id):
+                logger.error(f"Cannot remove: provider {provider_id} not found")
+                raise ProviderNotFoundError(provider_id)
         logger.debug(f"Removed provider: {provider_id}")
 
-    def reload(self) -> None:
-        """Reload all provider configurations"""
-        logger.debug("Reloading all configurations")
-        self._providers.clear()
-        self._register_builtin_providers()
-        self._load_configurations()
+    def reload(self, *, full: bool = False) -> ChangeSet:
+        """Bring the registry in line with its config directory.
+
+        Only the files that were added, edited or deleted since the last load are parsed again, and
+        only the providers they define are replaced. Every other provider is left as it is.
+
+        Args:
+            full: Rebuild every provider, built-ins included, into a fresh registry and swap it in
+
+        Returns:
+            The ids of the providers that were added, updated or removed
+        """
+        if full:
+            logger.debug("Reloading all configurations")
+            before = self._published.state.providers.keys()
+            fresh = type(self)(self._config_dir)
+            self._published.replace(fresh.state)
+            self._sources = fresh._sources
+            after = fresh.state.providers.keys()
+            return ChangeSet(added=after - before, updated=after & before, removed=before - after)
+        if not self._config_dir:
+            return ChangeSet()
+
+        providers_dir = self._config_dir / "providers"
+        yaml_files = list_yaml_files(providers_dir) if providers_dir.exists() else []
+        sources, changed = scan_source_files(yaml_files, self._sources)
+        deleted = self._sources.keys() - sources.keys()
+        if not changed and not deleted:
+            logger.debug("Provider configurations unchanged")
+            return ChangeSet()
+        logger.debug(f"Reloading provider configurations: {len(changed)} changed, {len(deleted)} deleted")
+
+        # Providers the changed files defined before go back to their built-in defaults
+        affected = set()
+        for path in [*changed, *deleted]:
+            known = self._sources.get(path)
+            if known is not None and known.resource_id is not None:
+                affected.add(known.resource_id)
+
+        with self._published.writing() as draft:
+            changes = self._reload_files(draft, sources, changed, affected)
+        self._sources = sources
+        logger.debug(
+            f"Reloaded providers: added={sorted(changes.added)}, updated={sorted(changes.updated)}, "
+            f"removed={sorted(changes.removed)}"
+        )
+        return changes
+
+    def _reload_files(
+        self, draft: ProviderState, sources: dict[Path, SourceFile], changed: builtins.list[Path], affected: set[str]
+    ) -> ChangeSet:
+        defaults = {provider.id: provider for provider in self._create_builtin_providers()}
+        while True:
+            # Re-apply, in directory order, the changed files and every file defining an affected provider
+            reapply = [path for path, record in sources.items() if path in changed or record.resource_id in affected]
+            staged: dict[str, ProviderConfiguration | None] = {
+                provider_id: defaults.get(provider_id) for provider_id in affected
+            }
+            results = self._load_provider_files(draft, reapply, staged=staged)
+            new_ids = {provider_id for provider_id in results.values() if provider_id is not None} - affected
+            if not new_ids:
+                break
+            affected |= new_ids
+
+        changes = ChangeSet()
+        for provider_id, provider in staged.items():
+            current = draft.providers.get(provider_id)
+            if provider is None:
+                if draft.discard(provider_id):
+                    changes.removed.add(provider_id)
+                continue
+            if (
+                current is not None
+                and type(current) is type(provider)
+                and current.model_dump() == provider.model_dump()
+            ):
+                continue
+            draft.register(provider)
+            (changes.updated if current is not None else changes.added).add(provider_id)
+
+        for path, resource_id in results.items():
+            sources[path].resource_id = resource_id
+        return changes
@@ -0,0 +1,239 @@
+"""Where the values of ``EnvVar`` settings come from.
+
+An ``EnvVar`` names a secret, e.g. ``$OPENAI_API_KEY``. The active ``SecretResolver`` asks its backends
+for the name in order: the process environment, files in a secrets mount, or the output of a command
+such as a vault agent CLI. Values from backends that are slow to query are cached for ``ttl`` seconds
+and names no backend has for ``negative_ttl`` seconds. An expired value keeps being served while a
+background thread fetches the current one, so only the first lookup of a name waits on a backend, and
+``prefetch_secrets()`` can do that one ahead of time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+_env_generation = 0
+_generation_lock = threading.Lock()
+
+
+def env_generation() -> int:
+    """Changes whenever a secret may have changed; values derived from secrets are cached against it"""
+    return _env_generation
+
+
+def _bump_env_generation() -> None:
+    global _env_generation
+    with _generation_lock:
+        _env_generation += 1
+
+
+class SecretBackend(ABC):
+    """A source of secret values"""
+
+    # Whether lookups are slow enough to be worth caching
+    cached: bool = True
+
+    @abstractmethod
+    def lookup(self, name: str) -> str | None:
+        """The value of ``name``, None if this backend doesn't have it"""
+
+
+class EnvBackend(SecretBackend):
+    """Process environment variables, read on every lookup"""
+
+    cached = False
+
+    def lookup(self, name: str) -> str | None:
+        return os.environ.get(name)
+
+
+class FileBackend(SecretBackend):
+    """One file per secret in a directory, like Docker and Kubernetes secret mounts
+
+    The file is named after the variable as is or in lower case (``OPENAI_API_KEY`` or
+    ``openai_api_key``). Surrounding whitespace is stripped from its contents.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+
+    def lookup(self, name: str) -> str | None:
+        if not name or "/" in name or os.sep in name or name.startswith("."):
+            return None
+        for file_name in dict.fromkeys((name, name.lower())):
+            try:
+                return (self.directory / file_name).read_text().strip()
+            except FileNotFoundError:
+                continue
+        return None
+
+
+class CommandBackend(SecretBackend):
+    """The output of a command, e.g. a vault agent CLI
+
+    ``{name}`` in the arguments is replaced with the variable name. The command is run without a
+    shell, and a non-zero exit status or empty output means it doesn't have the secret.
+
+    Args:
+        command: Program and arguments, e.g. ``["vault", "kv", "get", "-field=value", "secret/{name}"]``
+        timeout: Seconds to wait for the command before the lookup fails
+    """
+
+    def __init__(self, command: Sequence[str], *, timeout: float = 10.0) -> None:
+        if not command:
+            msg = "Command must not be empty"
+            raise ValueError(msg)
+        self.command = list(command)
+        self.timeout = timeout
+
+    def lookup(self, name: str) -> str | None:
+        args = [arg.replace("{name}", name) for arg in self.command]
+        result = subprocess.run(args, capture_output=True, text=True, timeout=self.timeout, check=False)
+        if result.returncode != 0:
+            logger.debug(f"{self.command[0]} exited with {result.returncode} looking up {name}")
+            return None
+        return result.stdout.strip() or None
+
+
+@dataclass
+class _Entry:
+    value: str | None
+    expires_at: float
+    refreshing: bool = False
+
+
+class SecretResolver:
+    """Looks secrets up in a list of backends, caching the ones that are slow to query
+
+    Args:
+        backends: Backends to ask in order, the first value found wins. Defaults to the environment only
+        ttl: Seconds a value is served before it is fetched again
+        negative_ttl: Seconds a missing secret, or a failed lookup, is remembered before it is retried
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[SecretBackend] | None = None,
+        *,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+    ) -> None:
+        self.backends = list(backends) if backends is not None else [EnvBackend()]
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._cache: dict[tuple[int, str], _Entry] = {}
+        self._lock = threading.Lock()
+        # Bumped by clear() so refreshes that were already running don't write into the new cache
+        self._epoch = 0
+
+    def resolve(self, name: str) -> str | None:
+        """The value of ``name``, None if no backend has it"""
+        for index, backend in enumerate(self.backends):
+            if backend.cached:
+                value = self._cached_lookup(index, backend, name)
+            else:
+                value = backend.lookup(name)
+            if value is not None:
+                return value
+        return None
+
+    def _cached_lookup(self, index: int, backend: SecretBackend, name: str) -> str | None:
+        key = (index, name)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry.refreshing or entry.expires_at > time.monotonic():
+                    return entry.value
+                entry.refreshing = True
+            epoch = self._epoch
+        if entry is None:
+            return self._load(key, backend, name, epoch).value
+        threading.Thread(
+            target=self._load, args=(key, backend, name, epoch), name="no-llm-secret-refresh", daemon=True
+        ).start()
+        return entry.value
+
+    def _load(self, key: tuple[int, str], backend: SecretBackend, name: str, epoch: int) -> _Entry:
+        failed = False
+        try:
+            value = backend.lookup(name)
+        except Exception as e:  # noqa: BLE001
+            logger.opt(exception=e).warning(f"Looking up {name} with {type(backend).__name__} failed")
+            value = None
+            failed = True
+
+        with self._lock:
+            previous = self._cache.get(key)
+            if failed and previous is not None:
+                # Keep serving the last good value, it is more likely right than nothing
+                value = previous.value
+            ttl = self.ttl if value is not None and not failed else self.negative_ttl
+            entry = _Entry(value, time.monotonic() + ttl)
+            if epoch != self._epoch:
+                return entry
+            self._cache[key] = entry
+
+        if previous is not None and previous.value != value:
+            logger.debug(f"Secret {name} changed")
+            _bump_env_generation()
+        return entry
+
+    async def prefetch(self, names: Iterable[str]) -> None:
+        """Fetch ``names`` into the cache in worker threads, so later lookups don't wait on a backend
+
+        Names may be given with or without the ``$`` of an ``EnvVar``.
+        """
+        unique = dict.fromkeys(name.removeprefix("$") for name in names)
+        await asyncio.gather(*(asyncio.to_thread(self.resolve, name) for name in unique))
+
+    def clear(self) -> None:
+        """Forget all cached values"""
+        with self._lock:
+            self._cache.clear()
+            self._epoch += 1
+
+
+_resolver = SecretResolver()
+
+
+def get_secret_resolver() -> SecretResolver:
+    return _resolver
+
+
+def set_secret_resolver(resolver: SecretResolver) -> None:
+    """Resolve ``EnvVar`` values with ``resolver`` from now on"""
+    global _resolver
+    _resolver = resolver
+    _bump_env_generation()
+
+
+def resolve_secret(name: str) -> str | None:
+    """The value of ``name`` from the active resolver, None if it has none"""
+    return _resolver.resolve(name)
+
+
+async def prefetch_secrets(names: Iterable[str]) -> None:
+    """Warm the active resolver's cache, see ``SecretResolver.prefetch``"""
+    await _resolver.prefetch(names)
+
+
+def refresh_env() -> None:
+    """Drop everything cached from environment variables and secrets, e.g. provider validity
+
+    Call it after changing ``os.environ`` (or rotating secrets) in a running process.
+    """
+    _resolver.clear()
+    _bump_env_generation()
@@ -1,26 +1,140 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from no_llm import _shared, _snapshot
 from no_llm.models.registry import ModelRegistry
 from no_llm.providers.registry import ProviderRegistry
+from no_llm.watcher import ConfigWatcher
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
     from pathlib import Path
 
+    from no_llm._base import ChangeSet
     from no_llm.models.config import ModelConfiguration
     from no_llm.providers.config import ProviderConfiguration
 
 
+@dataclass
+class RegistryChanges:
+    """What a ``Registry.reload`` changed"""
+
+    models: ChangeSet
+    providers: ChangeSet
+
+    def __bool__(self) -> bool:
+        return bool(self.models or self.providers)
+
+
 class Registry:
-    def __init__(self, config_dir: str | Path | None = None):
+    def __init__(self, config_dir: str | Path | None = None, *, lazy: bool = False):
         logger.debug("Initializing main Registry")
-        self.models = ModelRegistry(config_dir)
+        self._config_dir = config_dir
+        self.models = ModelRegistry(config_dir, lazy=lazy)
         self.providers = ProviderRegistry(config_dir)
 
+    @property
+    def config_dir(self) -> str | Path | None:
+        return self._config_dir
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever a model or provider is added, replaced or removed
+
+        Generation numbers are drawn from one counter shared by every registry, so this only ever grows
+        and caches derived from the registry contents can use it as their key.
+        """
+        return max(self.models.generation, self.providers.generation)
+
+    def _dump(self) -> tuple[list[dict], list[dict]]:
+        configs = list(self.models.list())
+        builtin_models = self.models.state.builtin_models
+        models = [_snapshot.dump_model(model, builtin=model.identity.id in builtin_models) for model in configs]
+        providers = [_snapshot.dump_provider(provider) for provider in self.providers.list()]
+        return models, providers
+
+    def save_snapshot(self, path: str | Path) -> None:
+        """Write every model and provider of this registry to a snapshot file
+
+        The snapshot records a hash of the package version, the built-in manifest and the YAML files
+        of the config directory, so ``load_snapshot`` can tell when it no longer matches its inputs.
+        Building every model first means a lazy registry imports all of its configurations here.
+        """
+        models, providers = self._dump()
+        _snapshot.write(path, _snapshot.fingerprint(self._config_dir), models, providers)
+        logger.debug(f"Saved registry snapshot to {path}: {len(models)} models, {len(providers)} providers")
+
+    @classmethod
+    def load_snapshot(cls, path: str | Path, config_dir: str | Path | None = None, *, lazy: bool = False) -> Registry:
+        """Restore a registry from a snapshot written by ``save_snapshot``
+
+        If the snapshot is missing, unreadable, or was built from a different package version, manifest
+        or config directory contents, the registry is built from ``config_dir`` as usual and the snapshot
+        is rewritten. With ``lazy=True`` models are only validated (and their modules imported) on first
+        access, which skips nearly all of the start-up work.
+
+        Args:
+            path: Snapshot file
+            config_dir: Config directory the registry is built from, used to check the snapshot is current
+            lazy: If True, restored models are only built on first access
+        """
+        source = _snapshot.fingerprint(config_dir)
+        try:
+            models, providers = _snapshot.read(path, source)
+        except _snapshot.SnapshotError as e:
+            logger.info(f"Rebuilding registry: {e}")
+            registry = cls(config_dir, lazy=lazy)
+            try:
+                registry.save_snapshot(path)
+            except OSError as write_error:
+                logger.warning(f"Could not write registry snapshot {path}: {write_error}")
+            return registry
+
+        registry = cls.__new__(cls)
+        registry._config_dir = config_dir
+        registry.models = ModelRegistry._restore(models, config_dir, lazy=lazy)
+        registry.providers = ProviderRegistry._restore(providers, config_dir)
+        logger.debug(f"Loaded registry snapshot from {path}")
+        return registry
+
+    def publish_shared(self, path: str | Path) -> None:
+        """Write a read-only image of this registry for worker processes to ``attach_shared``
+
+        Meant for pre-fork servers: the parent builds the registry once and publishes it, e.g. to a file
+        under ``/dev/shm``, and every worker maps the same image instead of building its own registry.
+        Republishing replaces the file atomically; workers keep the image they attached to.
+        """
+        models, providers = self._dump()
+        _shared.write(path, _snapshot.fingerprint(self._config_dir), models, providers)
+        logger.debug(f"Published shared registry to {path}: {len(models)} models, {len(providers)} providers")
+
+    @classmethod
+    def attach_shared(cls, path: str | Path, config_dir: str | Path | None = None) -> Registry:
+        """Attach to an image written by ``publish_shared``
+
+        The image is mapped read-only and a model's configuration is only decoded and built the first
+        time it is accessed, so attaching is cheap and the undecoded configs stay in memory shared with
+        every other process using the image.
+
+        Args:
+            path: Image file
+            config_dir: If given, the image must have been built from this config directory's current contents
+
+        Raises:
+            ValueError: If the image is missing, malformed, or stale for ``config_dir``
+        """
+        models, providers = _shared.attach(path, _snapshot.fingerprint(config_dir) if config_dir is not None else None)
+        registry = cls.__new__(cls)
+        registry._config_dir = config_dir
+        registry.models = ModelRegistry._restore(models, config_dir, lazy=True)
+        registry.providers = ProviderRegistry._restore(providers, config_dir)
+        logger.debug(f"Attached shared registry {path}")
+        return registry
+
     def get_compatible_providers(
         self, model_id: str, *, only_valid: bool = True, only_active: bool = True
     ) -> Iterator[ProviderConfiguration]:
@@ -33,13 +147,10 @@ class Registry:
         """
         logger.debug(f"Finding compatible providers for model: {model_id}")
 
-        model = self.models.get(model_id)
-
-        # Get provider types that this model supports
-        compatible_provider_types = {provider().type for provider in model._compatible_providers}  # noqa: SLF001
+        # Both lookups are answered from indexes kept up to date on register and remove
+        compatible_provider_types = self.models.compatible_provider_types(model_id)
         logger.debug(f"Model {model_id} supports provider types: {compatible_provider_types}")
 
-        # Find all providers of compatible types
         for provider_type in compatible_provider_types:
             yield from self.providers.list_by_type(provider_type, only_valid=only_valid, only_active=only_active)
 
@@ -58,14 +169,35 @@ class Registry:
         provider = self.providers.get(provider_id)
         logger.debug(f"Provider {provider_id} is of type: {provider.type}")
 
-        # Find all models that support this provider type
-        for model in self.models.list(only_valid=only_valid, only_active=only_active):
-            if type(provider) in model._compatible_providers:  # noqa: SLF001
-                logger.debug(f"Model {model.identity.id} is compatible with provider {provider_id}")
-                yield model
+        yield from self.models.list(compatible_provider=provider.type, only_valid=only_valid, only_active=only_active)
 
-    def reload(self) -> None:
-        """Reload all registry configurations"""
+    def reload(self, *, full: bool = False) -> RegistryChanges:
+        """Reload all registry configurations
+
+        Only the config files that changed since the last load are parsed again, see
+        ``ModelRegistry.reload``. With ``full=True`` everything is rebuilt from scratch.
+        """
         logger.debug("Reloading all registries")
-        self.models.reload()
-        self.providers.reload()
+        changes = RegistryChanges(models=self.models.reload(full=full), providers=self.providers.reload(full=full))
+        if changes:
+            logger.info(f"Registry reloaded: models {changes.models}, providers {changes.providers}")
+        return changes
+
+    def watch(
+        self,
+        *,
+        debounce: float = 0.5,
+        poll_interval: float = 1.0,
+        on_reload: Callable[[RegistryChanges, float], None] | None = None,
+    ) -> ConfigWatcher:
+        """Reload this registry in the background whenever its config directory changes
+
+        Returns the started watcher; call ``stop()`` on it to stop watching. See ``ConfigWatcher`` for
+        the options and for running it on an event loop instead.
+
+        Args:
+            debounce: Quiet period, in seconds, that ends a burst of changes
+            poll_interval: How often files are checked when inotify is not available
+            on_reload: Called with the changes and the duration of every reload that changed something
+        """
+        return ConfigWatcher(self, debounce=debounce, poll_interval=poll_interval, on_reload=on_reload).start()
@@ -16,6 +16,38 @@ class Settings(BaseModel):
         default=ValidationMode(os.getenv("NO_LLM_VALIDATION_MODE", ValidationMode.CLAMP.value)),
         description="Validation mode for model configurations",
     )
+    settings_cache_size: int = Field(
+        default=int(os.getenv("NO_LLM_SETTINGS_CACHE_SIZE", "1024")),
+        description="Number of resolved model settings to keep in memory, 0 disables the cache",
+    )
+    yaml_workers: int = Field(
+        default=int(os.getenv("NO_LLM_YAML_WORKERS", "0")),
+        description="Workers used to parse the YAML files of a config directory, 0 or 1 parses them serially",
+    )
+    yaml_executor: Literal["thread", "process"] = Field(
+        default=os.getenv("NO_LLM_YAML_EXECUTOR", "thread"),  # type: ignore[arg-type]
+        description="Pool used when yaml_workers > 1: threads for slow filesystems, processes for CPU-bound parsing",
+    )
+    client_cache_size: int = Field(
+        default=int(os.getenv("NO_LLM_CLIENT_CACHE_SIZE", "128")),
+        description="Number of pydantic-ai providers (and their SDK clients) to keep for reuse, 0 disables the cache",
+    )
+    http_max_connections: int = Field(
+        default=int(os.getenv("NO_LLM_HTTP_MAX_CONNECTIONS", "100")),
+        description="Connections the shared HTTP client opens at most, per event loop",
+    )
+    http_max_keepalive_connections: int = Field(
+        default=int(os.getenv("NO_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        description="Idle connections the shared HTTP client keeps open, per event loop",
+    )
+    http_keepalive_expiry: float = Field(
+        default=float(os.getenv("NO_LLM_HTTP_KEEPALIVE_EXPIRY", "5.0")),
+        description="Seconds an idle connection is kept open",
+    )
+    http2: bool = Field(
+        default=os.getenv("NO_LLM_HTTP2", "false").lower() in ("1", "true", "yes"),
+        description="Use HTTP/2 where the server supports it, requires the h2 package",
+    )
     logging_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(
         default="INFO",
         description="Logging level for the no_llm library",
@@ -0,0 +1,372 @@
+"""Hot reloading of a ``Registry`` from its config directory.
+
+A ``ConfigWatcher`` waits for changes under ``models/`` and ``providers/``, lets a burst of edits
+settle, then applies them with an incremental ``Registry.reload()``. Changes are detected with
+inotify on Linux and by polling file modification times elsewhere.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+import time
+from dataclasses import dataclass
+from errno import ENOENT
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from no_llm._utils import _stamp, list_yaml_files
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from typing_extensions import Self
+
+    from no_llm.registry import Registry, RegistryChanges
+
+_WATCHED_DIRS = ("models", "providers")
+
+# How long a blocking wait runs before checking whether the watcher was stopped
+_WAIT_SLICE = 0.25
+
+# inotify(7) event masks
+_IN_MODIFY = 0x2
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+
+class _Inotify:
+    """Change notifications for the config directory and its ``models/`` and ``providers/`` folders"""
+
+    def __init__(self, config_dir: Path) -> None:
+        libc_path = ctypes.util.find_library("c")
+        if libc_path is None:
+            msg = "C library not found"
+            raise OSError(msg)
+        libc = ctypes.CDLL(libc_path, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._config_dir = config_dir
+        try:
+            self._watch_dirs()
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_dirs(self) -> None:
+        # Adding a watch twice is a no-op, so folders created after start are picked up here
+        for directory in (self._config_dir, *(self._config_dir / name for name in _WATCHED_DIRS)):
+            if not directory.is_dir():
+                continue
+            if self._add_watch(self._fd, os.fsencode(directory), _IN_MASK) < 0:
+                errno = ctypes.get_errno()
+                # Removed since the check, there is nothing left to watch
+                if errno != ENOENT:
+                    raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def _drain(self) -> None:
+        # Which file changed doesn't matter, the reload finds out from the file contents
+        while True:
+            try:
+                if not os.read(self._fd, 64 * 1024):
+                    break
+            except BlockingIOError:
+                break
+        self._watch_dirs()
+
+    def wait(self, timeout: float) -> bool:
+        """Whether anything changed within ``timeout`` seconds"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        self._drain()
+        return True
+
+    async def wait_async(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        loop.add_reader(self._fd, readable.set)
+        try:
+            await asyncio.wait_for(readable.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(self._fd)
+        self._drain()
+        return True
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _Poller:
+    """Change detection by comparing the modification time and size of the config files"""
+
+    def __init__(self, config_dir: Path, interval: float) -> None:
+        self._config_dir = config_dir
+        self._interval = interval
+        self._stamps = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        stamps = {}
+        for name in _WATCHED_DIRS:
+            directory = self._config_dir / name
+            if not directory.is_dir():
+                continue
+            for path in list_yaml_files(directory):
+                try:
+                    stamps[path] = _stamp(path)
+                except OSError:
+                    continue
+        return stamps
+
+    def _changed(self) -> bool:
+        stamps = self._scan()
+        if stamps == self._stamps:
+            return False
+        self._stamps = stamps
+        return True
+
+    def wait(self, timeout: float) -> bool:
+        """Whether anything changed within ``timeout`` seconds"""
+        deadline = time.monotonic() + timeout
+        while not self._changed():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._interval, remaining))
+        return True
+
+    async def wait_async(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while not await asyncio.to_thread(self._changed):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(self._interval, remaining))
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass
+class ReloadMetrics:
+    """Counters and timings of the reloads a ``ConfigWatcher`` ran"""
+
+    reloads: int = 0
+    failures: int = 0
+    last_duration: float | None = None
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+
+    @property
+    def mean_duration(self) -> float | None:
+        return self.total_duration / self.reloads if self.reloads else None
+
+    def record(self, duration: float) -> None:
+        self.reloads += 1
+        self.last_duration = duration
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+
+
+class ConfigWatcher:
+    """Reloads a registry whenever its config directory changes.
+
+    Edits are debounced: after a change the watcher waits until no further change arrives for
+    ``debounce`` seconds (but never longer than ``max_delay``) and then applies all of them with one
+    incremental reload. Run it on a background thread with ``start()`` / ``stop()`` or as a context
+    manager, or on an event loop with ``await watcher.run()``.
+
+    Args:
+        registry: Registry to reload, it must have a config directory
+        debounce: Quiet period, in seconds, that ends a burst of changes
+        max_delay: Longest a reload is postponed while changes keep arriving, defaults to ten debounces
+        poll_interval: How often files are checked when inotify is not available
+        use_inotify: Set to False to always poll
+        on_reload: Called with the changes and the duration of every reload that changed something
+    """
+
+    def __init__(
+        self,
+        registry: Registry,
+        *,
+        debounce: float = 0.5,
+        max_delay: float | None = None,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+        on_reload: Callable[[RegistryChanges, float], None] | None = None,
+    ) -> None:
+        if registry.config_dir is None:
+            msg = "Cannot watch a registry without a config directory"
+            raise ValueError(msg)
+        self.registry = registry
+        self.config_dir = Path(registry.config_dir)
+        self.debounce = debounce
+        self.max_delay = max_delay if max_delay is not None else debounce * 10
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.on_reload = on_reload
+        self.metrics = ReloadMetrics()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._source: _Inotify | _Poller | None = None
+
+    def _open_source(self) -> _Inotify | _Poller:
+        if self.use_inotify:
+            try:
+                source = _Inotify(self.config_dir)
+            except (AttributeError, OSError) as e:
+                logger.debug(f"inotify not available, polling {self.config_dir} instead: {e}")
+            else:
+                logger.debug(f"Watching {self.config_dir} with inotify")
+                return source
+        logger.debug(f"Polling {self.config_dir} every {self.poll_interval}s")
+        return _Poller(self.config_dir, self.poll_interval)
+
+    def _fall_back(self, error: OSError) -> None:
+        """Replace a failing inotify source with polling"""
+        logger.warning(f"inotify failed, polling {self.config_dir} instead: {error}")
+        assert self._source is not None
+        self._source.close()
+        self._source = _Poller(self.config_dir, self.poll_interval)
+
+    def _wait(self, timeout: float) -> bool:
+        """Whether anything changed within ``timeout`` seconds, returning early once stopped"""
+        assert self._source is not None
+        deadline = time.monotonic() + timeout
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                if self._source.wait(min(remaining, _WAIT_SLICE)):
+                    return True
+            except OSError as e:
+                # The event that made the watch fail may have been a change
+                self._fall_back(e)
+                return True
+        return False
+
+    async def _wait_async(self, timeout: float) -> bool:
+        assert self._source is not None
+        try:
+            return await self._source.wait_async(timeout)
+        except OSError as e:
+            self._fall_back(e)
+            return True
+
+    def _wait_for_changes(self) -> bool:
+        """Block until a burst of changes has settled, False if the watcher was stopped first"""
+        while not self._wait(_WAIT_SLICE):
+            if self._stop.is_set():
+                return False
+        settle_by = time.monotonic() + self.max_delay
+        while self._wait(self._quiet_period(settle_by)):
+            pass
+        return not self._stop.is_set()
+
+    async def _await_changes(self) -> None:
+        while not await self._wait_async(_WAIT_SLICE):
+            pass
+        settle_by = time.monotonic() + self.max_delay
+        while await self._wait_async(self._quiet_period(settle_by)):
+            pass
+
+    def _quiet_period(self, settle_by: float) -> float:
+        return min(self.debounce, max(settle_by - time.monotonic(), 0))
+
+    def reload(self) -> RegistryChanges | None:
+        """Apply pending config changes now, returning None if the reload failed"""
+        start = time.perf_counter()
+        try:
+            changes = self.registry.reload()
+        except Exception as e:  # noqa: BLE001
+            self.metrics.failures += 1
+            logger.opt(exception=e).error(f"Failed to reload configurations from {self.config_dir}")
+            return None
+        duration = time.perf_counter() - start
+        self.metrics.record(duration)
+        logger.opt(lazy=True).debug("Reloaded {} in {:.1f}ms", lambda: self.config_dir, lambda: duration * 1000)
+        if changes and self.on_reload is not None:
+            try:
+                self.on_reload(changes, duration)
+            except Exception as e:  # noqa: BLE001
+                logger.opt(exception=e).error("on_reload callback failed")
+        return changes
+
+    def _run(self) -> None:
+        try:
+            while self._wait_for_changes():
+                self.reload()
+        finally:
+            if self._source is not None:
+                self._source.close()
+                self._source = None
+
+    def start(self) -> Self:
+        """Watch on a daemon thread until ``stop()``"""
+        if self._thread is not None or self._source is not None:
+            msg = "Watcher already started"
+            raise RuntimeError(msg)
+        self._stop.clear()
+        self._source = self._open_source()
+        self._thread = threading.Thread(target=self._run, name="no-llm-config-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop watching, waiting up to ``timeout`` seconds for an ongoing reload to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            # Still reloading, keep the thread so the watcher can't be started twice
+            if not self._thread.is_alive():
+                self._thread = None
+
+    async def run(self) -> None:
+        """Watch until cancelled, reloading in a worker thread to keep the event loop free"""
+        if self._source is not None:
+            msg = "Watcher already started"
+            raise RuntimeError(msg)
+        self._source = self._open_source()
+        try:
+            while True:
+                await self._await_changes()
+                await asyncio.to_thread(self.reload)
+        finally:
+            self._source.close()
+            self._source = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *_: object) -> None:
+        self.stop()
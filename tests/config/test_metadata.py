@@ -10,6 +10,7 @@ from no_llm.models.config.metadata import (
     ModelPricing,
     PrivacyLevel,
     TokenPrices,
+    privacy_level_mask,
 )
 from pydantic import ValidationError
 
@@ -111,6 +112,23 @@ def test_model_metadata():
     assert metadata.data_cutoff_date is None
 
 
+def test_model_metadata_privacy_mask():
+    metadata = ModelMetadata(
+        privacy_level=[PrivacyLevel.BASIC],
+        pricing=ModelPricing(token_prices=TokenPrices(input_price_per_1k=0.5, output_price_per_1k=1.0)),
+        release_date=datetime(2023, 1, 1),
+    )
+    assert metadata.privacy_mask == privacy_level_mask([PrivacyLevel.BASIC])
+
+    copied = metadata.model_copy(update={"privacy_level": [PrivacyLevel.GDPR]})
+    assert copied.privacy_mask == privacy_level_mask([PrivacyLevel.GDPR])
+    metadata.privacy_level = [PrivacyLevel.HIPAA, PrivacyLevel.SOC2]
+    assert metadata.privacy_mask == privacy_level_mask([PrivacyLevel.HIPAA, PrivacyLevel.SOC2])
+    metadata.privacy_level.remove(PrivacyLevel.SOC2)
+    metadata.privacy_level.append(PrivacyLevel.GDPR)
+    assert metadata.privacy_mask == privacy_level_mask([PrivacyLevel.HIPAA, PrivacyLevel.GDPR])
+
+
 def test_pricing_validation():
     # Test negative prices are not allowed
     with pytest.raises(ValidationError):
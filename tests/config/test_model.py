@@ -5,12 +5,13 @@ from typing import Literal
 
 import pytest
 from no_llm.errors import InvalidPricingConfigError
-from no_llm.models.config.enums import ModelCapability, ModelMode
+from no_llm.models.config.enums import CapabilitySet, ModelCapability, ModelMode, capability_mask
 from no_llm.models.config.errors import MissingCapabilitiesError
-from no_llm.models.config.model import ModelConfiguration
+from no_llm.models.config.model import ModelConfiguration, _settings_cache, clear_settings_cache
 from no_llm.models.config.parameters import ConfigurableModelParameters, ModelParameters
 from no_llm.providers import EnvVar, Provider
-from pydantic import Field
+from no_llm.settings import settings as no_llm_settings
+from pydantic import Field, ValidationError
 from pydantic_ai.providers.openai import OpenAIProvider
 
 
@@ -141,6 +142,27 @@ def test_model_capability_checks():
     )
 
 
+def test_model_capability_mask_tracks_mutations():
+    """Test the capability mask stays in sync with the capability set"""
+    model = create_test_model()
+    model.capabilities = {ModelCapability.STREAMING}
+    assert isinstance(model.capabilities, CapabilitySet)
+    assert model.capability_mask == capability_mask({ModelCapability.STREAMING})
+
+    model.capabilities.add(ModelCapability.VISION)
+    model.capabilities |= {ModelCapability.TOOLS}
+    model.capabilities.discard(ModelCapability.STREAMING)
+    model.capabilities.discard("teleportation")
+    assert model.capability_mask == capability_mask({ModelCapability.VISION, ModelCapability.TOOLS})
+    assert model.model_copy(deep=True).capability_mask == model.capability_mask
+
+    required = capability_mask({ModelCapability.VISION, ModelCapability.TOOLS})
+    assert model.check_capabilities(required, mode="all")
+    assert not model.check_capabilities(capability_mask({ModelCapability.STREAMING}), mode="any")
+    # Unknown capabilities can never be satisfied
+    assert not model.check_capabilities({ModelCapability.VISION, "teleportation"}, mode="all")  # type: ignore
+
+
 def test_model_assert_capabilities():
     """Test model capability assertion method"""
     model = create_test_model()
@@ -201,6 +223,100 @@ def test_model_parameter_handling():
     assert isinstance(params, ConfigurableModelParameters)
 
 
+def test_model_with_parameters_leaves_base_untouched():
+    """Test per-request parameter overlays do not copy or modify the base configuration"""
+    model = create_test_model()
+    base_temperature = model.parameters.temperature
+
+    overlaid = model.with_parameters(ModelParameters(temperature=0.7))
+
+    assert overlaid.parameters.temperature.value == 0.7
+    assert model.parameters.temperature is base_temperature
+    # Everything except the parameters is shared with the base configuration
+    assert overlaid.identity is model.identity
+    assert overlaid.metadata is model.metadata
+    assert overlaid.parameters.top_p is model.parameters.top_p
+
+
+def test_model_with_parameters_edits_do_not_reach_base():
+    """Test an edit to a per-request overlay leaves the base configuration's parameters alone"""
+    model = create_test_model()
+    base_top_p = model.parameters.top_p.value
+
+    overlaid = model.with_parameters(ModelParameters(temperature=0.7))
+    # Shared values are frozen, so they can only be replaced on the overlay
+    with pytest.raises(ValidationError):
+        overlaid.parameters.top_p.value = 0.1
+    overlaid.parameters.top_p = 0.2
+
+    assert overlaid.parameters.top_p.value == 0.2
+    assert model.parameters.top_p.value == base_top_p
+
+
+def test_model_resolve_settings_is_memoized():
+    """Test resolved settings are cached and invalidated when the configuration changes"""
+    clear_settings_cache()
+    model = create_test_model()
+    params = ModelParameters(temperature=0.7)
+
+    settings = model.resolve_settings(params)
+    assert settings["temperature"] == 0.7
+    assert len(_settings_cache) == 1
+
+    # Same combination, even from a different object, hits the cache
+    settings["temperature"] = 0.1
+    assert model.resolve_settings(ModelParameters(temperature=0.7))["temperature"] == 0.7
+    assert len(_settings_cache) == 1
+
+    # Changing the configuration's parameters produces a new entry
+    model.set_parameters(ModelParameters(top_p=0.5))
+    assert model.resolve_settings(params) == {"temperature": 0.7, "top_p": 0.5}
+    model.parameters.top_p = 0.4
+    assert model.resolve_settings(params)["top_p"] == 0.4
+
+    clear_settings_cache()
+    assert len(_settings_cache) == 0
+
+
+def test_model_resolve_settings_copies_nested_values():
+    """Test mutating the nested values of resolved settings doesn't reach the cache"""
+    clear_settings_cache()
+    model = create_test_model()
+    params = ModelParameters(stop=["END"], logit_bias={"50256": -100.0})
+
+    settings = model.resolve_settings(params)
+    settings["stop"].append("STOP")
+    settings["logit_bias"]["50256"] = 0.0
+    assert model.resolve_settings(params) == {"stop": ["END"], "logit_bias": {"50256": -100.0}}
+
+
+def test_model_resolve_settings_cache_follows_size_setting(monkeypatch):
+    """Test settings_cache_size changed at runtime resizes the cache"""
+    clear_settings_cache()
+    model = create_test_model()
+    for temperature in (0.1, 0.2, 0.3):
+        model.resolve_settings(ModelParameters(temperature=temperature))
+    assert len(_settings_cache) == 3
+
+    monkeypatch.setattr(no_llm_settings, "settings_cache_size", 1)
+    model.resolve_settings(ModelParameters(temperature=0.4))
+    assert len(_settings_cache) == 1
+    monkeypatch.setattr(no_llm_settings, "settings_cache_size", 0)
+    model.resolve_settings(ModelParameters(temperature=0.5))
+    assert len(_settings_cache) == 0
+
+
+def test_model_resolve_settings_batch():
+    """Test resolving many parameter sets at once"""
+    model = create_test_model()
+    rows = [ModelParameters(temperature=0.7), ModelParameters(temperature=0.7, top_p=0.5), {"top_p": 0.2}]
+
+    result = model.resolve_settings_batch(rows)
+
+    assert result.values == [{"temperature": 0.7}, {"temperature": 0.7, "top_p": 0.5}, {"top_p": 0.2}]
+    assert result.errors == [[], [], []]
+
+
 def test_model_constraints():
     """Test model constraints"""
     model = create_test_model()
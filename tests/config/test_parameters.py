@@ -1,5 +1,5 @@
 import pytest
-from no_llm.models.config.enums import ModelCapability
+from no_llm.models.config.enums import ModelCapability, capability_mask
 from no_llm.models.config.errors import (
     FixedParameterError,
     InvalidEnumError,
@@ -16,6 +16,7 @@ from no_llm.models.config.parameters import (
     RangeValidation,
     ValidationRule,
 )
+from pydantic import ValidationError
 
 
 def test_parameter_value_yaml():
@@ -103,6 +104,8 @@ def test_capability_requirements():
     param = param.check_capability({ModelCapability.REASONING})
     assert not param.is_unsupported()
     assert param.get() is True
+    assert not param.check_capability(capability_mask({ModelCapability.REASONING})).is_unsupported()
+    assert param.check_capability(capability_mask({ModelCapability.STREAMING})).is_unsupported()
 
     # Test capability check when capability is missing
     param = param.check_capability({ModelCapability.STREAMING})
@@ -650,6 +653,33 @@ def test_subclassed_model_parameters():
     assert "presence_penalty" not in final_dump
 
 
+def test_parameter_defaults_are_shared_per_class():
+    """Test instances share their class defaults without leaking updates between each other"""
+    from no_llm.models.model_configs.openai.o3_mini import O3MiniConfiguration
+
+    first = ConfigurableModelParameters()
+    second = ConfigurableModelParameters()
+    assert first.temperature is second.temperature
+
+    first.temperature = 0.5
+    assert first.temperature.value == 0.5
+    assert second.temperature.value == NOT_GIVEN
+    assert ConfigurableModelParameters().temperature.value == NOT_GIVEN
+
+    # Shared defaults can't be edited in place, so an edit can't reach other instances
+    with pytest.raises(ValidationError):
+        second.top_p.value = 0.9
+    with pytest.raises(ValidationError):
+        second.top_p.validation_rule.max_value = 5
+    assert ConfigurableModelParameters().top_p.value == NOT_GIVEN
+    assert ConfigurableModelParameters().top_p.validation_rule.max_value == 1.0
+
+    # Subclasses get their own defaults
+    o3_params = O3MiniConfiguration.Parameters()
+    assert o3_params.temperature.variant == ParameterVariant.FIXED
+    assert first.temperature.variant == ParameterVariant.VARIABLE
+
+
 def test_model_loading_with_base_config_parameters(tmp_path):
     """Test parameter validation when loading model from config directory with base_config"""
     from no_llm.models.registry import ModelRegistry
@@ -748,3 +778,67 @@ extra:
     assert model_params.temperature == 1.0
     assert model_params.top_p == 1.0
     assert model_params.frequency_penalty == 0.0
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [
+        ("clamp", [{"temperature": 0.5}, {"temperature": 2.0}, {"temperature": 0.0}, {}]),
+        ("warn", [{"temperature": 0.5}, {}, {}, {}]),
+        ("error", [{"temperature": 0.5}, None, None, None]),
+    ],
+)
+def test_validate_batch_matches_validation_modes(monkeypatch, mode, expected):
+    """Test batch validation applies the same ValidationMode semantics as single updates"""
+    from no_llm.settings import ValidationMode, settings
+
+    monkeypatch.setattr(settings, "validation_mode", ValidationMode(mode))
+    params = ConfigurableModelParameters()
+    rows = [
+        ModelParameters(temperature=0.5),
+        ModelParameters(temperature=3.0),
+        {"temperature": -1.0},
+        {"reasoning_effort": "low"},
+    ]
+
+    result = params.validate_batch(rows)
+
+    assert result.values == expected
+    assert [len(errors) for errors in result.errors] == [0, 1, 1, 1]
+    assert isinstance(result.errors[1][0], InvalidRangeError)
+    assert isinstance(result.errors[3][0], UnsupportedParameterError)
+    # The parameters themselves are left untouched
+    assert params.temperature.value == NOT_GIVEN
+
+
+def test_validate_batch_columnar():
+    """Test batch validation over columns, large enough to take the vectorized path when NumPy is installed"""
+    params = ConfigurableModelParameters()
+    temperatures = [i / 10 for i in range(100)]
+
+    result = params.validate_batch(
+        {"temperature": temperatures, "top_k": [None] * 99 + [5]},
+        capabilities={ModelCapability.REASONING},
+    )
+
+    assert [row["temperature"] for row in result.values] == [min(t, 2.0) for t in temperatures]
+    assert sum(1 for errors in result.errors if errors) == 79
+    assert result.values[-1]["top_k"] == 5
+
+    with pytest.raises(ValueError, match="same length"):
+        params.validate_batch({"temperature": [0.1], "top_p": [0.1, 0.2]})
+
+
+@pytest.mark.parametrize("size", [4, 100])
+def test_validate_batch_reports_non_numeric_values_per_row(size):
+    """Test a value that can't be compared to its range only fails its own row, in rows and columns"""
+    params = ConfigurableModelParameters()
+    temperatures: list = [0.5] * size
+    temperatures[1] = "hot"
+
+    for rows in ({"temperature": temperatures}, [{"temperature": t} for t in temperatures]):
+        result = params.validate_batch(rows)
+        assert result.values[0] == {"temperature": 0.5}
+        assert result.values[1] == {}
+        assert "not a number" in str(result.errors[1][0])
+        assert sum(1 for errors in result.errors if errors) == 1
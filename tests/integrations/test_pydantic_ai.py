@@ -1,7 +1,25 @@
+import asyncio
+import time
+
 import pytest
+from no_llm.integrations._routing import (
+    BreakerState,
+    CircuitBreakers,
+    HedgePolicy,
+    RouteTracker,
+    StreamDeadlines,
+    StreamRace,
+    circuit_breakers,
+    route_key,
+)
 from no_llm.integrations.pydantic_ai import NoLLMModel
 from no_llm.models.registry import ModelRegistry
+from no_llm.providers import OpenAIProvider
 from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.function import AgentInfo, FunctionModel
 from vcr import VCR
 
 
@@ -38,3 +56,249 @@ async def test_stream_chat(openai_model: NoLLMModel):
     async with agent.run_stream("What is the capital of the UK?") as response:
         data = await response.get_output()
         assert "london" in data.lower()
+
+
+class FakeModels:
+    """Stands in for `_iter_pydantic_models`, giving each config two FunctionModels (like two regions)"""
+
+    def __init__(self):
+        self.built: list[str] = []
+        self.called: list[str] = []
+        self.failing: set[str] = set()
+        # Fail with a 400, as if the request was invalid
+        self.rejecting: set[str] = set()
+        self.delays: dict[str, float] = {}
+        self.cancelled: list[str] = []
+
+    def __call__(self, model_cfg):
+        for region in range(2):
+            name = f'{model_cfg.identity.id}/{region}'
+            self.built.append(name)
+            model = FunctionModel(self._respond(name), stream_function=self._stream(name), model_name=name)
+            yield model, model_cfg, OpenAIProvider(id=f'region-{region}')
+
+    def _respond(self, name: str):
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            self.called.append(name)
+            try:
+                await asyncio.sleep(self.delays.get(name, 0))
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            if name in self.failing:
+                raise ModelHTTPError(503, name, f'{name} is down')
+            if name in self.rejecting:
+                raise ModelHTTPError(400, name, 'Invalid request')
+            return ModelResponse(parts=[TextPart(name)])
+
+        return respond
+
+    def _stream(self, name: str):
+        async def stream(messages: list[ModelMessage], info: AgentInfo):
+            self.called.append(name)
+            # Opens the stream without content, like the first chunk of most providers
+            yield ''
+            try:
+                await asyncio.sleep(self.delays.get(name, 0))
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            if name in self.failing:
+                raise ModelHTTPError(503, name, f'{name} is down')
+            yield name
+
+        return stream
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    fake = FakeModels()
+    circuit_breakers.reset()
+    monkeypatch.setattr('no_llm.integrations.pydantic_ai._iter_pydantic_models', fake)
+    return fake
+
+
+def test_fallback_models_are_built_on_first_use(builtin_model_registry: ModelRegistry, fake_models: FakeModels):
+    model = NoLLMModel(
+        builtin_model_registry.get('gpt-4o'), builtin_model_registry.get('gpt-4o-mini'), tracker=None
+    )
+    assert fake_models.built == ['gpt-4o/0']
+
+    agent = Agent(model)
+    assert agent.run_sync('Hi').output == 'gpt-4o/0'
+    assert fake_models.built == ['gpt-4o/0']
+
+    fake_models.failing.add('gpt-4o/0')
+    assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    assert fake_models.built == ['gpt-4o/0', 'gpt-4o/1']
+
+    assert [m.model_name for m, _ in model.models] == ['gpt-4o/0', 'gpt-4o/1', 'gpt-4o-mini/0', 'gpt-4o-mini/1']
+    assert len(fake_models.built) == 4
+
+
+def test_failing_routes_are_tried_last(builtin_model_registry: ModelRegistry, fake_models: FakeModels):
+    model = NoLLMModel(builtin_model_registry.get('gpt-4o'), tracker=RouteTracker())
+    agent = Agent(model)
+    fake_models.failing.add('gpt-4o/0')
+
+    for _ in range(2):
+        assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    assert fake_models.called == ['gpt-4o/0', 'gpt-4o/1', 'gpt-4o/0', 'gpt-4o/1']
+
+    # Two failures in a row make the first region unhealthy, requests stop waiting on it
+    fake_models.called.clear()
+    assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    assert fake_models.called == ['gpt-4o/1']
+
+
+def test_open_circuits_are_skipped(builtin_model_registry: ModelRegistry, fake_models: FakeModels):
+    breakers = CircuitBreakers(failure_threshold=2, cooldown=60)
+    model = NoLLMModel(builtin_model_registry.get('gpt-4o'), tracker=None, breakers=breakers)
+    agent = Agent(model)
+    fake_models.failing.add('gpt-4o/0')
+
+    for _ in range(2):
+        assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    first, second = (route.key for route in model._routes)  # noqa: SLF001
+    assert breakers.state(first) == BreakerState.OPEN
+    assert breakers.state(second) == BreakerState.CLOSED
+
+    fake_models.called.clear()
+    assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    assert fake_models.called == ['gpt-4o/1']
+
+    fake_models.failing.add('gpt-4o/1')
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match='Last error'):
+            agent.run_sync('Hi')
+    fake_models.called.clear()
+    with pytest.raises(RuntimeError, match='Circuits are open'):
+        agent.run_sync('Hi')
+    assert fake_models.called == []
+
+
+def test_rejected_requests_fall_back_without_blaming_the_route(
+    builtin_model_registry: ModelRegistry, fake_models: FakeModels
+):
+    breakers = CircuitBreakers(failure_threshold=2, cooldown=60)
+    tracker = RouteTracker()
+    model = NoLLMModel(builtin_model_registry.get('gpt-4o'), tracker=tracker, breakers=breakers)
+    agent = Agent(model)
+    fake_models.rejecting.add('gpt-4o/0')
+
+    for _ in range(5):
+        assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    first, _ = (route.key for route in model._routes)  # noqa: SLF001
+    assert breakers.state(first) == BreakerState.CLOSED
+    assert tracker.is_healthy(first)
+    assert fake_models.called.count('gpt-4o/0') == 5
+
+
+def test_slow_requests_are_hedged(builtin_model_registry: ModelRegistry, fake_models: FakeModels):
+    tracker = RouteTracker()
+    hedge = HedgePolicy(delay=0.05, budget=0, burst=1)
+    model = NoLLMModel(builtin_model_registry.get('gpt-4o'), tracker=tracker, breakers=None, hedge=hedge)
+    agent = Agent(model)
+    fake_models.delays['gpt-4o/0'] = 0.3
+
+    async def run() -> tuple[str, list[str]]:
+        response = await model.request([ModelRequest.user_text_prompt('Hi')], None, ModelRequestParameters())
+        # The loser was cancelled and waited for before the request returned
+        return response.parts[0].content, list(fake_models.cancelled)
+
+    started = time.perf_counter()
+    assert asyncio.run(run()) == ('gpt-4o/1', ['gpt-4o/0'])
+    assert time.perf_counter() - started < 0.25
+    assert fake_models.called == ['gpt-4o/0', 'gpt-4o/1']
+    assert model.current_model_config.identity.id == 'gpt-4o'
+    assert (hedge.hedged, hedge.hedges_won) == (1, 1)
+    first, second = (route.key for route in model._routes)  # noqa: SLF001
+    assert hedge.wins == {second: 1}
+    # The cancelled route was at least as slow as the hedge delay
+    assert tracker.stats(first).latency >= 0.05
+    assert tracker.stats(second).latency < 0.05
+
+    # The budget is used up, the next slow request waits for its route
+    fake_models.called.clear()
+    assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    fake_models.delays['gpt-4o/1'] = 0.1
+    fake_models.called.clear()
+    assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    assert fake_models.called == ['gpt-4o/1']
+    assert hedge.hedged == 1
+    assert hedge.wins == {second: 3}
+
+
+def test_hedges_are_only_paid_for_when_they_start(builtin_model_registry: ModelRegistry, fake_models: FakeModels):
+    breakers = CircuitBreakers(failure_threshold=1, cooldown=60)
+    hedge = HedgePolicy(delay=0.02, budget=0, burst=1)
+    config = builtin_model_registry.get('gpt-4o')
+    model = NoLLMModel(config, tracker=None, breakers=breakers, hedge=hedge)
+    agent = Agent(model)
+    fake_models.delays['gpt-4o/0'] = 0.1
+
+    # No route to hedge on, the budget is kept
+    breakers.record(route_key(config, OpenAIProvider(id='region-1')), ok=False)
+    assert agent.run_sync('Hi').output == 'gpt-4o/0'
+    assert hedge.hedged == 0
+
+    breakers.reset()
+    assert agent.run_sync('Hi').output == 'gpt-4o/1'
+    assert hedge.hedged == 1
+
+
+def test_streams_race_to_the_first_token(builtin_model_registry: ModelRegistry, fake_models: FakeModels):
+    race = StreamRace(routes=2)
+    model = NoLLMModel(
+        builtin_model_registry.get('gpt-4o'),
+        builtin_model_registry.get('gpt-4o-mini'),
+        tracker=None,
+        breakers=None,
+        race=race,
+    )
+    agent = Agent(model)
+
+    async def run() -> str:
+        async with agent.run_stream('Hi') as response:
+            return await response.get_output()
+
+    fake_models.delays['gpt-4o/0'] = 1.0
+    started = time.perf_counter()
+    assert asyncio.run(run()) == 'gpt-4o/1'
+    assert time.perf_counter() - started < 0.5
+    assert fake_models.called == ['gpt-4o/0', 'gpt-4o/1']
+    assert fake_models.cancelled == ['gpt-4o/0']
+    assert model.current_model_config.identity.id == 'gpt-4o'
+    assert (race.races, race.wasted) == (1, 1)
+
+    # A failed stream is replaced by the next route
+    fake_models.called.clear()
+    fake_models.failing.add('gpt-4o/1')
+    fake_models.delays['gpt-4o-mini/0'] = 0.05
+    assert asyncio.run(run()) == 'gpt-4o-mini/0'
+    assert fake_models.called == ['gpt-4o/0', 'gpt-4o/1', 'gpt-4o-mini/0']
+    assert (race.races, race.wasted) == (2, 2)
+
+
+def test_stalled_streams_fall_back(builtin_model_registry: ModelRegistry, fake_models: FakeModels):
+    deadlines = StreamDeadlines(idle=0.05)
+    model = NoLLMModel(builtin_model_registry.get('gpt-4o'), tracker=None, breakers=None, deadlines=deadlines)
+    agent = Agent(model)
+
+    async def run() -> str:
+        async with agent.run_stream('Hi') as response:
+            return await response.get_output()
+
+    fake_models.delays['gpt-4o/0'] = 1.0
+    started = time.perf_counter()
+    assert asyncio.run(run()) == 'gpt-4o/1'
+    assert time.perf_counter() - started < 0.5
+    assert fake_models.cancelled == ['gpt-4o/0']
+
+    deadlines.idle = None
+    deadlines.first_token = 0.05
+    fake_models.delays['gpt-4o/1'] = 1.0
+    with pytest.raises(RuntimeError, match='stalled waiting for its first token'):
+        asyncio.run(run())
+    assert fake_models.cancelled == ['gpt-4o/0', 'gpt-4o/0', 'gpt-4o/1']
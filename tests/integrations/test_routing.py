@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from no_llm.integrations._routing import (
+    BreakerState,
+    CircuitBreakers,
+    HedgePolicy,
+    Route,
+    RouteTracker,
+    is_transient,
+)
+from pydantic_ai.exceptions import ModelHTTPError, UnexpectedModelBehavior
+from pydantic_ai.models.test import TestModel
+
+
+def _routes(*names: str) -> list[Route]:
+    return [Route(TestModel(), None, (name, "openai", "openai", None), i) for i, name in enumerate(names)]  # type: ignore[arg-type]
+
+
+def _names(routes: list[Route]) -> list[str]:
+    return [route.key[0] for route in routes]
+
+
+def test_preference_breaks_latency_ties():
+    tracker = RouteTracker(tolerance=0.25)
+    routes = _routes("a", "b", "c")
+    tracker.record(routes[0].key, 1.0, ok=True)
+    tracker.record(routes[1].key, 0.9, ok=True)
+    tracker.record(routes[2].key, 1.1, ok=True)
+    assert _names(tracker.order(routes)[0]) == ["a", "b", "c"]
+
+
+def test_fastest_route_goes_first():
+    tracker = RouteTracker(alpha=1.0)
+    routes = _routes("a", "b", "c")
+    tracker.record(routes[0].key, 3.0, ok=True)
+    tracker.record(routes[1].key, 0.5, ok=True)
+    # Unmeasured routes are assumed to be as fast as the best one
+    assert _names(tracker.order(routes)[0]) == ["b", "c", "a"]
+
+    tracker.record(routes[0].key, 0.5, ok=True)
+    assert _names(tracker.order(routes)[0]) == ["a", "b", "c"]
+
+
+def test_unhealthy_routes_recover():
+    tracker = RouteTracker(alpha=0.5, error_half_life=0.05)
+    routes = _routes("a", "b")
+    tracker.record(routes[0].key, 0.1, ok=False)
+    tracker.record(routes[0].key, 0.1, ok=False)
+    healthy, unhealthy = tracker.order(routes)
+    assert _names(healthy) == ["b"]
+    assert _names(unhealthy) == ["a"]
+
+    time.sleep(0.1)
+    assert tracker.is_healthy(routes[0].key)
+    assert _names(tracker.order(routes)[0]) == ["a", "b"]
+
+
+def test_circuit_breaker_states():
+    breakers = CircuitBreakers(failure_threshold=2, cooldown=0.05)
+    key = _routes("a")[0].key
+
+    breakers.record(key, ok=False)
+    assert breakers.acquire(key)
+    breakers.record(key, ok=False)
+    assert breakers.state(key) == BreakerState.OPEN
+    assert not breakers.acquire(key)
+
+    # After the cooldown one probe goes through, a failed probe reopens the breaker right away
+    time.sleep(0.1)
+    assert breakers.state(key) == BreakerState.HALF_OPEN
+    assert breakers.acquire(key)
+    assert not breakers.acquire(key)
+    breakers.record(key, ok=False)
+    assert breakers.state(key) == BreakerState.OPEN
+    assert breakers.snapshot()[key].failures == 3
+
+    time.sleep(0.1)
+    assert breakers.acquire(key)
+    breakers.release(key)
+    assert breakers.acquire(key)
+    breakers.record(key, ok=True)
+    assert breakers.state(key) == BreakerState.CLOSED
+    assert breakers.snapshot() == {}
+
+
+def test_hedge_delay_and_budget():
+    tracker = RouteTracker(window=10)
+    key = _routes("a")[0].key
+    hedge = HedgePolicy(quantile=0.9, default_delay=1.5, budget=0.5, burst=1)
+    assert hedge.delay_for(key, tracker) == 1.5
+
+    for latency in range(1, 21):
+        tracker.record(key, latency / 10, ok=True)
+    # Only the latest 10 latencies count
+    assert tracker.latency_quantile(key, 0.5) == 1.6
+    assert hedge.delay_for(key, tracker) == 2.0
+
+    assert hedge.spend()
+    assert not hedge.spend()
+    hedge.deposit()
+    assert not hedge.spend()
+    hedge.deposit()
+    assert hedge.spend()
+
+
+def _wrapped(error: Exception) -> Exception:
+    # Like the SDKs, which raise their own connection error from the HTTP client's
+    wrapper = RuntimeError("Connection error.")
+    wrapper.__cause__ = error
+    return wrapper
+
+
+@pytest.mark.parametrize(
+    ("error", "transient"),
+    [
+        (ModelHTTPError(503, "gpt-4o"), True),
+        (ModelHTTPError(429, "gpt-4o"), True),
+        (ModelHTTPError(400, "gpt-4o"), False),
+        (ModelHTTPError(404, "gpt-4o"), False),
+        (asyncio.TimeoutError(), True),
+        (ConnectionResetError(), True),
+        (_wrapped(httpx.ConnectError("refused")), True),
+        (UnexpectedModelBehavior("bad tool call"), False),
+        (ValueError("invalid settings"), False),
+    ],
+)
+def test_only_transient_errors_blame_the_route(error: Exception, transient: bool):
+    assert is_transient(error) is transient
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from no_llm.providers import AzureProvider, OpenAIProvider, refresh_env
+from no_llm.providers.clients import ClientPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_providers_are_reused(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-first")
+    refresh_env()
+    pool = ClientPool(maxsize=8)
+
+    provider = pool.provider(OpenAIProvider())
+    assert pool.provider(OpenAIProvider()) is provider
+    assert provider.client._client is pool.http_client
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-second")
+    refresh_env()
+    rotated = pool.provider(OpenAIProvider())
+    assert rotated is not provider
+    assert rotated.client.api_key == "sk-second"
+    assert rotated.client._client is provider.client._client
+
+
+def test_locations_get_their_own_provider(monkeypatch):
+    monkeypatch.setenv("AZURE_API_KEY", "key")
+    monkeypatch.setenv("AZURE_BASE_URL", "https://example.openai.azure.com")
+    refresh_env()
+    pool = ClientPool(maxsize=8)
+
+    eastus, eastus2 = AzureProvider().iter()
+    assert pool.provider(eastus) is not pool.provider(eastus2)
+    assert pool.provider(eastus) is pool.provider(AzureProvider())
+
+
+def test_pool_is_bounded(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    refresh_env()
+    pool = ClientPool(maxsize=1)
+
+    first = pool.provider(OpenAIProvider())
+    pool.provider(OpenAIProvider(id="other"))
+    assert pool.provider(OpenAIProvider()) is not first
+
+
+def test_http_client_works_across_event_loops(server_url: str):
+    pool = ClientPool()
+    client = pool.http_client
+
+    for _ in range(2):
+        response = asyncio.run(client.get(server_url))
+        assert response.text == "ok"
+
+    asyncio.run(pool.aclose())
+    assert client.is_closed
+    assert pool.http_client is not client
+
+
+def test_aclose_closes_every_loops_connections(server_url: str):
+    pool = ClientPool()
+    client = pool.http_client
+    # One loop still running on another thread, one that has since been closed
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(client.get(server_url), other).result(5)
+        assert asyncio.run(client.get(server_url)).text == "ok"
+        transports = list(client._transport._transports.values())
+        assert len(transports) == 2
+
+        asyncio.run(pool.aclose())
+        assert all(not transport._pool.connections for transport in transports)
+        assert not client._transport._transports
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join(5)
+        other.close()
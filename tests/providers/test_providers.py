@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Literal
 
 import pytest
-from no_llm.providers import EnvVar
+from no_llm.providers import AnthropicProvider, EnvVar, refresh_env
 from no_llm.providers.config import ProviderConfiguration
 from pydantic_ai.providers.openai import OpenAIProvider
 
@@ -33,3 +33,21 @@ async def test_provider_reset_iterator():
     provider.reset_iterator()
     assert provider._iterator_index == 0
 
+
+def test_env_validity_is_cached_until_refresh(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    refresh_env()
+    provider = AnthropicProvider()
+    assert not provider.is_valid
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-test")
+    assert not provider.is_valid
+    assert list(provider.iter()) == []
+
+    refresh_env()
+    assert provider.is_valid
+    assert list(provider.iter()) == [provider]
+
+    # Reassigning a field invalidates the cached result
+    provider.api_key = EnvVar[str]("$NO_LLM_TEST_UNSET_API_KEY")
+    assert not provider.is_valid
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from no_llm.providers import (
+    AnthropicProvider,
+    CommandBackend,
+    EnvBackend,
+    EnvVar,
+    FileBackend,
+    SecretBackend,
+    SecretResolver,
+    get_secret_resolver,
+    prefetch_secrets,
+    refresh_env,
+    set_secret_resolver,
+)
+from no_llm.providers.secrets import env_generation
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class CountingBackend(SecretBackend):
+    def __init__(self, values: dict[str, str]) -> None:
+        self.values = values
+        self.lookups: list[str] = []
+
+    def lookup(self, name: str) -> str | None:
+        self.lookups.append(name)
+        return self.values.get(name)
+
+
+class FailingBackend(SecretBackend):
+    def lookup(self, name: str) -> str | None:
+        msg = "vault agent unreachable"
+        raise ConnectionError(msg)
+
+
+@pytest.fixture(autouse=True)
+def restore_resolver():
+    resolver = get_secret_resolver()
+    yield
+    set_secret_resolver(resolver)
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_environment_takes_precedence(monkeypatch, tmp_path: Path):
+    (tmp_path / "no_llm_test_secret").write_text("from-file\n")
+    set_secret_resolver(SecretResolver([EnvBackend(), FileBackend(tmp_path)]))
+    secret = EnvVar[str]("$NO_LLM_TEST_SECRET")
+
+    monkeypatch.delenv("NO_LLM_TEST_SECRET", raising=False)
+    assert str(secret) == "from-file"
+    monkeypatch.setenv("NO_LLM_TEST_SECRET", "from-env")
+    assert str(secret) == "from-env"
+
+
+def test_rotated_file_is_picked_up_after_ttl(tmp_path: Path):
+    secret_file = tmp_path / "NO_LLM_TEST_SECRET"
+    secret_file.write_text("v1")
+    set_secret_resolver(SecretResolver([FileBackend(tmp_path)], ttl=0.1))
+    secret = EnvVar[str]("$NO_LLM_TEST_SECRET")
+    assert str(secret) == "v1"
+
+    secret_file.write_text("v2")
+    assert str(secret) == "v1"
+
+    generation = env_generation()
+    time.sleep(0.15)
+    # The expired value is served while the new one is fetched in the background
+    assert str(secret) == "v1"
+    assert _wait_for(lambda: str(secret) == "v2")
+    assert env_generation() > generation
+
+
+def test_missing_secrets_are_cached():
+    backend = CountingBackend({})
+    set_secret_resolver(SecretResolver([backend], negative_ttl=60))
+    provider = AnthropicProvider(api_key="$NO_LLM_TEST_MISSING")
+    assert not provider.has_valid_env()
+    assert str(provider.api_key) == "$NO_LLM_TEST_MISSING"
+    assert backend.lookups == ["NO_LLM_TEST_MISSING"]
+
+    backend.values["NO_LLM_TEST_MISSING"] = "sk-test"
+    assert str(provider.api_key) == "$NO_LLM_TEST_MISSING"
+    refresh_env()
+    assert str(provider.api_key) == "sk-test"
+    assert provider.has_valid_env()
+
+
+def test_failed_lookup_keeps_last_value():
+    backend = CountingBackend({"NO_LLM_TEST_SECRET": "v1"})
+    resolver = SecretResolver([backend], ttl=0, negative_ttl=60)
+    set_secret_resolver(resolver)
+    assert resolver.resolve("NO_LLM_TEST_SECRET") == "v1"
+
+    resolver.backends[0] = FailingBackend()
+    resolver.resolve("NO_LLM_TEST_SECRET")
+    # The refresh fails, so the old value stays cached until negative_ttl runs out
+    assert _wait_for(lambda: not resolver._cache[(0, "NO_LLM_TEST_SECRET")].refreshing)
+    assert resolver.resolve("NO_LLM_TEST_SECRET") == "v1"
+
+
+def test_command_backend():
+    backend = CommandBackend(
+        [
+            sys.executable,
+            "-c",
+            "import sys; sys.exit(1) if sys.argv[1] == 'MISSING' else print(sys.argv[1].lower())",
+            "{name}",
+        ]
+    )
+    assert backend.lookup("NO_LLM_TEST_SECRET") == "no_llm_test_secret"
+    assert backend.lookup("MISSING") is None
+
+
+def test_prefetch_secrets():
+    backend = CountingBackend({"NO_LLM_TEST_A": "a", "NO_LLM_TEST_B": "b"})
+    set_secret_resolver(SecretResolver([backend]))
+
+    asyncio.run(prefetch_secrets(["$NO_LLM_TEST_A", "NO_LLM_TEST_B", "$NO_LLM_TEST_A"]))
+    assert sorted(backend.lookups) == ["NO_LLM_TEST_A", "NO_LLM_TEST_B"]
+
+    assert str(EnvVar[str]("$NO_LLM_TEST_A")) == "a"
+    assert len(backend.lookups) == 2
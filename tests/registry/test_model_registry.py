@@ -1,12 +1,16 @@
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
-from no_llm._utils import find_yaml_file
+from no_llm._utils import find_yaml_file, load_yaml_files
 from no_llm.errors import (
     ConfigurationLoadError,
     ModelNotFoundError,
 )
+from no_llm.models._manifest import BUILTIN_MODELS, generate_manifest
+from no_llm.models._state import ModelState
 from no_llm.models.config.enums import ModelCapability, ModelMode
 from no_llm.models.config.metadata import (
     ModelMetadata,
@@ -278,6 +282,65 @@ def test_builtin_models_registration(base_registry: ModelRegistry   ):
     assert len(list(registry.list())) > 0
 
 
+def test_builtin_manifest_is_up_to_date():
+    """The static manifest must match the built-in configuration classes"""
+    assert generate_manifest() == BUILTIN_MODELS
+
+
+def test_lazy_registry_builds_models_on_get():
+    """Test that a lazy registry only instantiates the models that are accessed"""
+    registry = ModelRegistry(lazy=True)
+    assert registry._models == {}
+
+    model = registry.get("gpt-4o")
+    assert model.identity.id == "gpt-4o"
+    assert list(registry._models) == ["gpt-4o"]
+    assert registry.get("gpt-4o") is model
+
+    registry.remove("claude-3-haiku")
+    with pytest.raises(ModelNotFoundError):
+        registry.get("claude-3-haiku")
+    with pytest.raises(ModelNotFoundError):
+        registry.get("non-existent-model")
+
+
+def test_lazy_registry_lists_same_models_as_eager():
+    """Test that listing a lazy registry yields the same models as an eager one"""
+    eager_ids = [model.identity.id for model in ModelRegistry().list()]
+    lazy_ids = [model.identity.id for model in ModelRegistry(lazy=True).list()]
+    assert lazy_ids == eager_ids
+
+
+def test_lazy_registry_list_publishes_once():
+    """Test that listing a lazy registry builds all its pending models in one new state"""
+    registry = ModelRegistry(lazy=True)
+    generation = registry.generation
+    with patch.object(ModelState, "copy", autospec=True, side_effect=ModelState.copy) as copy:
+        models = list(registry.list())
+        assert copy.call_count == 1
+        assert list(registry.list()) == models
+        assert copy.call_count == 1
+    assert registry.generation == generation
+
+
+def test_lazy_registry_applies_config_overrides(tmp_path: Path):
+    """Test that YAML overrides merge with lazily registered built-in models"""
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    (models_dir / "claude-3-haiku.yml").write_text(
+        """
+identity:
+  id: claude-3-haiku
+  description: Customized version of Claude 3 Haiku
+""".strip()
+    )
+
+    registry = ModelRegistry(tmp_path, lazy=True)
+    model = registry.get("claude-3-haiku")
+    assert model.identity.description == "Customized version of Claude 3 Haiku"
+    assert "gpt-4o" not in registry._models
+
+
 def test_custom_config_overrides_builtin(tmp_path: Path):
     """Test that custom YAML configurations can override built-in models"""
     # Create a config directory with models subdirectory
@@ -525,6 +588,22 @@ def test_model_listing_with_active_filter(base_registry: ModelRegistry):
     assert "model1" in all_model_ids
 
 
+def test_model_active_status_set_in_place():
+    """Test that setting is_active on a registered model is honoured by the active filter"""
+    registry = ModelRegistry()
+    registry.register(create_test_model("model1"))
+    registry.register(create_test_model("model2"))
+
+    registry.get("model1").is_active = False
+    active_ids = {m.identity.id for m in registry.list(only_valid=False, only_active=True)}
+    assert "model1" not in active_ids
+    assert "model2" in active_ids
+
+    registry.set_active("model2", False)
+    registry.get("model2").is_active = True
+    assert "model2" in {m.identity.id for m in registry.list(only_valid=False, only_active=True)}
+
+
 def test_model_combined_active_and_valid_filtering():
     """Test combined filtering by both is_active and is_valid"""
     registry = ModelRegistry()
@@ -586,3 +665,287 @@ def test_model_filtering_with_other_criteria():
         only_valid=False
     ))
     assert len(streaming_models_all) == 1
+
+
+def _scan(registry: ModelRegistry, **filters) -> list[str]:
+    provider = filters.get("provider")
+    capabilities = filters.get("capabilities")
+    privacy_levels = filters.get("privacy_levels")
+    mode = filters.get("mode")
+    result = []
+    for model in registry._models.values():
+        if filters.get("only_active") and not model.is_active:
+            continue
+        if provider and not any(p.type == provider for p in model.providers):
+            continue
+        if capabilities:
+            caps = set(model.capabilities)
+            if not (caps & capabilities.values if capabilities.mode == "any" else capabilities.values <= caps):
+                continue
+        if privacy_levels:
+            levels = set(model.metadata.privacy_level)
+            if not (levels & privacy_levels.values if privacy_levels.mode == "any" else privacy_levels.values <= levels):
+                continue
+        if mode and model.mode != mode:
+            continue
+        result.append(model.identity.id)
+    return result
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"provider": "openai"},
+        {"provider": "unknown"},
+        {"capabilities": SetFilter({ModelCapability.STREAMING, ModelCapability.VISION}, "any")},
+        {"capabilities": SetFilter({ModelCapability.STREAMING, ModelCapability.VISION}, "all")},
+        {"capabilities": SetFilter(set(), "any")},
+        {"privacy_levels": SetFilter({PrivacyLevel.BASIC, PrivacyLevel.HIPAA}, "all")},
+        {"mode": ModelMode.CHAT, "provider": "vertex", "only_active": True},
+    ],
+)
+def test_registry_index_matches_scan(filters):
+    eager, lazy = ModelRegistry(), ModelRegistry(lazy=True)
+    for registry in (eager, lazy):
+        registry.set_active("gpt-4o", False)
+        registry.remove("claude-3-haiku")
+        registry.register(registry.get("gpt-4o-mini"))
+
+    expected = _scan(eager, **filters)
+    assert [m.identity.id for m in eager.list(**filters)] == expected
+    assert [m.identity.id for m in lazy.list(**filters)] == expected
+
+
+def test_registry_index_tracks_reregistration(base_registry: ModelRegistry):
+    model = create_test_model("model1")
+    model.capabilities = {ModelCapability.STREAMING}
+    base_registry.register(model)
+    model2 = create_test_model("model2")
+    model2.capabilities = {ModelCapability.TOOLS}
+    base_registry.register(model2)
+
+    replacement = create_test_model("model1")
+    replacement.capabilities = {ModelCapability.VISION}
+    base_registry.register(replacement)
+
+    assert list(base_registry.list(capabilities={ModelCapability.STREAMING})) == []
+    assert [m.identity.id for m in base_registry.list(capabilities={ModelCapability.VISION})] == ["model1"]
+    assert [m.identity.id for m in base_registry.list()] == ["model1", "model2"]
+
+
+def test_registry_index_reuses_discarded_slots():
+    registry = ModelRegistry()
+    models = [m.identity.id for m in registry.list()]
+    for _ in range(500):
+        registry.register(create_test_model("churn"))
+        registry.remove("churn")
+    registry.register(create_test_model("last"))
+
+    # Holes are compacted away, the slots stay bounded by the live models
+    assert len(registry._published.state.index._ids) <= 2 * (len(models) + 1)
+    assert [m.identity.id for m in registry.list()] == [*models, "last"]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_load_yaml_files_in_parallel(tmp_path, executor):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"model-{i}.yml"
+        path.write_text(f"identity:\n  id: model-{i}\n")
+        paths.append(path)
+    broken = tmp_path / "broken.yml"
+    broken.write_text("invalid: : yaml")
+    paths.insert(7, broken)
+
+    serial = load_yaml_files(paths)
+    parallel = load_yaml_files(paths, workers=4, executor=executor)
+
+    assert isinstance(serial[7], Exception)
+    assert isinstance(parallel[7], Exception)
+    assert parallel[:7] + parallel[8:] == serial[:7] + serial[8:]
+    assert [config["identity"]["id"] for config in parallel if not isinstance(config, Exception)] == [
+        f"model-{i}" for i in range(20)
+    ]
+
+
+def test_register_models_from_directory_with_workers(tmp_path):
+    for i in range(20):
+        (tmp_path / f"tenant-{i}.yml").write_text(
+            f"identity:\n  id: tenant-{i}\n  base_config: gpt-4o\n  description: Tenant {i}\n"
+        )
+    serial = ModelRegistry(lazy=True)
+    serial.register_models_from_directory(tmp_path, workers=0)
+    parallel = ModelRegistry(lazy=True)
+    parallel.register_models_from_directory(tmp_path, workers=4)
+
+    assert [m.model_dump() for m in parallel.list()] == [m.model_dump() for m in serial.list()]
+    assert parallel.get("tenant-3").identity.description == "Tenant 3"
+
+
+def _model_states(registry: ModelRegistry) -> dict[str, dict]:
+    return {model.identity.id: model.model_dump() for model in registry.list()}
+
+
+def test_incremental_reload_matches_full_rebuild(tmp_path):
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+
+    def write(name: str, description: str, base_config: str | None = None) -> None:
+        base = f"  base_config: {base_config}\n" if base_config else ""
+        (models_dir / f"{name}.yml").write_text(f"identity:\n  id: {name}\n{base}  description: {description}\n")
+
+    write("gpt-4o", "Override")
+    write("tenant-a", "Tenant A", base_config="gpt-4o")
+    write("tenant-b", "Tenant B", base_config="claude-3.5-haiku")
+    registry = ModelRegistry(tmp_path)
+    untouched = registry.get("tenant-b")
+
+    # Editing a base model rebuilds the models merged onto it, and nothing else
+    write("gpt-4o", "Edited override")
+    changes = registry.reload()
+    assert _model_states(registry) == _model_states(ModelRegistry(tmp_path))
+    assert "gpt-4o" in changes.updated
+    assert not changes.added and not changes.removed
+    assert registry.get("tenant-b") is untouched
+
+    write("tenant-c", "Tenant C", base_config="gpt-4o")
+    (models_dir / "tenant-a.yml").unlink()
+    changes = registry.reload()
+    assert _model_states(registry) == _model_states(ModelRegistry(tmp_path))
+    assert changes.added == {"tenant-c"}
+    assert changes.removed == {"tenant-a"}
+
+    # Deleting a built-in override restores the built-in
+    (models_dir / "gpt-4o.yml").unlink()
+    changes = registry.reload()
+    assert _model_states(registry) == _model_states(ModelRegistry(tmp_path))
+    assert registry.get("gpt-4o").identity.description == ModelRegistry().get("gpt-4o").identity.description
+    assert "gpt-4o" in changes.updated
+
+    assert not registry.reload()
+
+
+def test_reload_keeps_models_while_rebuilding(tmp_path):
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    (models_dir / "gpt-4o.yml").write_text("identity:\n  id: gpt-4o\n  description: First\n")
+    registry = ModelRegistry(tmp_path, lazy=True)
+    registry.set_active("gpt-4", False)
+
+    (models_dir / "gpt-4o.yml").write_text("identity:\n  id: gpt-4o\n  description: Second\n")
+    with patch.object(registry, "remove", side_effect=AssertionError("model removed during reload")):
+        changes = registry.reload()
+
+    assert changes.updated == {"gpt-4o"}
+    assert registry.get("gpt-4o").identity.description == "Second"
+    assert "gpt-4" not in {model.identity.id for model in registry.list(only_active=True)}
+
+    assert registry.reload(full=True).updated >= {"gpt-4o", "gpt-4"}
+    assert "gpt-4" in {model.identity.id for model in registry.list(only_active=True)}
+
+
+def test_generation_tracks_changes():
+    registry = ModelRegistry(lazy=True)
+    generation = registry.generation
+
+    # Building a lazily registered model doesn't change what the registry answers
+    registry.get("gpt-4o")
+    assert registry.generation == generation
+
+    registry.register(create_test_model())
+    assert registry.generation > generation
+    generation = registry.generation
+
+    registry.set_active("test-model", False)
+    assert registry.generation > generation
+    generation = registry.generation
+
+    with pytest.raises(ModelNotFoundError):
+        registry.remove("missing-model")
+    assert registry.generation == generation
+
+    registry.remove("test-model")
+    assert registry.generation > generation
+
+
+def test_published_state_is_never_modified():
+    registry = ModelRegistry()
+    model = registry.get("gpt-4o")
+    state = registry.state
+
+    registry.register(create_test_model())
+    registry.set_active("gpt-4o", False)
+    registry.remove("gpt-4")
+
+    assert "test-model" not in state.models
+    assert "gpt-4" in state.models
+    assert state.models["gpt-4o"] is model
+    assert model.is_active
+    assert not registry.get("gpt-4o").is_active
+    assert registry.state is not state
+
+
+def test_list_while_registering():
+    registry = ModelRegistry(lazy=True)
+    errors: list[Exception] = []
+    done = threading.Event()
+
+    def write() -> None:
+        try:
+            for i in range(200):
+                registry.register(create_test_model(f"test-model-{i}"))
+                if i % 2:
+                    registry.remove(f"test-model-{i}")
+        finally:
+            done.set()
+
+    def read() -> None:
+        while not done.is_set():
+            try:
+                ids = [model.identity.id for model in registry.list()]
+                assert len(ids) == len(set(ids))
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=write), *(threading.Thread(target=read) for _ in range(4))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert {f"test-model-{i}" for i in range(0, 200, 2)} <= {model.identity.id for model in registry.list()}
+    assert "test-model-1" not in {model.identity.id for model in registry.list()}
+
+
+def test_base_config_chains(tmp_path):
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+
+    def write(name: str, base_config: str, extra: str = "") -> None:
+        (models_dir / f"{name}.yml").write_text(f"identity:\n  id: {name}\n  base_config: {base_config}\n{extra}")
+
+    # Each file sorts before the file it inherits from
+    write("a-tenant", "b-family", "  description: Tenant\n")
+    write("b-family", "c-base", "constraints:\n  max_input_tokens: 1234\n")
+    write("c-base", "gpt-4o", "  description: Base\n")
+    write("x-loop", "y-loop")
+    write("y-loop", "x-loop")
+    write("z-orphan", "x-loop")
+
+    registry = ModelRegistry(tmp_path)
+    tenant = registry.get("a-tenant")
+    assert tenant.identity.description == "Tenant"
+    assert tenant.constraints.max_input_tokens == 1234
+    assert type(tenant) is type(registry.get("gpt-4o"))
+    assert registry.get("b-family").identity.description == "Base"
+    for model_id in ("x-loop", "y-loop", "z-orphan"):
+        with pytest.raises(ModelNotFoundError):
+            registry.get(model_id)
+
+    # Editing the middle of a chain rebuilds the models below it
+    write("b-family", "c-base", "constraints:\n  max_input_tokens: 4321\n")
+    assert registry.reload().updated == {"a-tenant", "b-family"}
+    assert registry.get("a-tenant").constraints.max_input_tokens == 4321
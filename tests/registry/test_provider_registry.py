@@ -427,6 +427,28 @@ def test_provider_set_active_functionality(base_registry: ProviderRegistry):
     assert provider.is_active is True
 
 
+def test_provider_set_active_keeps_order(base_registry: ProviderRegistry):
+    """Test replacing a provider keeps its position among the providers of its type"""
+
+    def register(provider_type: str, provider_id: str) -> None:
+        config = create_test_provider_config(provider_type, provider_id)
+        base_registry.register(base_registry._create_provider_from_config(config))
+
+    register("anthropic", "anthropic-1")
+    register("anthropic", "anthropic-2")
+    order = [p.id for p in base_registry.list_by_type("anthropic")]
+
+    base_registry.set_active("anthropic-1", False)
+    assert [p.id for p in base_registry.list_by_type("anthropic")] == order
+    register("anthropic", "anthropic-1")
+    assert [p.id for p in base_registry.list_by_type("anthropic")] == order
+
+    # A provider that changes type moves to the end of its new type
+    register("openai", "anthropic-1")
+    assert "anthropic-1" not in {p.id for p in base_registry.list_by_type("anthropic")}
+    assert [p.id for p in base_registry.list_by_type("openai")][-1] == "anthropic-1"
+
+
 def test_provider_set_active_nonexistent_provider(base_registry: ProviderRegistry):
     """Test setting active status on non-existent provider raises error"""
     with pytest.raises(ProviderNotFoundError) as exc_info:
@@ -507,3 +529,44 @@ def test_provider_combined_active_and_valid_filtering(base_registry: ProviderReg
     assert len(providers_active_valid) <= len(providers_any_valid)
     assert len(providers_active_any) <= len(providers_any_any)
     assert len(providers_any_valid) <= len(providers_any_any)
+
+
+def test_incremental_reload(tmp_path):
+    providers_dir = tmp_path / "providers"
+    providers_dir.mkdir()
+    (providers_dir / "anthropic.yml").write_text("type: anthropic\nid: anthropic\nname: Anthropic Test\n")
+    (providers_dir / "openai-eu.yml").write_text("type: openai\nid: openai-eu\nname: OpenAI EU\n")
+    registry = ProviderRegistry(tmp_path)
+    openai_eu = registry.get("openai-eu")
+
+    (providers_dir / "anthropic.yml").write_text("type: anthropic\nid: anthropic\nname: Anthropic Edited\n")
+    changes = registry.reload()
+    assert changes.updated == {"anthropic"}
+    assert not changes.added and not changes.removed
+    assert registry.get("anthropic").name == "Anthropic Edited"
+    assert registry.get("openai-eu") is openai_eu
+
+    # Deleting an override brings back the built-in default, deleting a custom provider removes it
+    (providers_dir / "anthropic.yml").unlink()
+    (providers_dir / "openai-eu.yml").unlink()
+    changes = registry.reload()
+    assert changes.updated == {"anthropic"}
+    assert changes.removed == {"openai-eu"}
+    assert registry.get("anthropic").name == "Anthropic"
+    with pytest.raises(ProviderNotFoundError):
+        registry.get("openai-eu")
+
+    assert not registry.reload()
+
+
+def test_set_active_publishes_a_new_state(base_registry: ProviderRegistry):
+    state = base_registry.state
+    generation = base_registry.generation
+    provider = base_registry.get("anthropic")
+
+    base_registry.set_active("anthropic", False)
+
+    assert base_registry.generation > generation
+    assert provider.is_active is True
+    assert state.providers["anthropic"] is provider
+    assert base_registry.get("anthropic").is_active is False
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import json
+import multiprocessing
+import os
+import sys
 from unittest.mock import Mock, patch
 
 import pytest
+from no_llm.errors import ModelNotFoundError
 from no_llm.models.config import ModelConfiguration
+from no_llm.models.config.model import ModelIdentity
+from no_llm.providers import AnthropicProvider, OpenAIProvider
 from no_llm.providers.config import ProviderConfiguration
 from no_llm.registry import Registry
 
 
+def _describe_shared(image, model_id: str) -> str:
+    return Registry.attach_shared(image).models.get(model_id).identity.description
+
+
 class TestRegistry:
     @pytest.fixture
     def registry(self):
@@ -34,59 +45,37 @@ class TestRegistry:
         assert hasattr(registry.providers, 'list_by_type')
         assert callable(registry.providers.list_by_type)
 
-    @patch('no_llm.models.registry.ModelRegistry.get')
     @patch('no_llm.providers.registry.ProviderRegistry.list_by_type')
-    def test_get_compatible_providers(self, mock_list_by_type, mock_get_model, registry: Registry):
-        # Mock model with compatible providers
-        mock_provider_class = Mock()
-        mock_provider_class.return_value.type = "anthropic"
-
-        mock_model = Mock(spec=ModelConfiguration)
-        mock_model._compatible_providers = {mock_provider_class}
-        mock_model.identity = Mock()
-        mock_model.identity.id = "test-model"
-        mock_get_model.return_value = mock_model
-
-        # Mock provider response
+    def test_get_compatible_providers(self, mock_list_by_type, registry: Registry):
         mock_provider = Mock(spec=ProviderConfiguration)
-        mock_list_by_type.return_value = [mock_provider]
+        mock_list_by_type.side_effect = lambda provider_type, **_: [mock_provider] if provider_type == "groq" else []
 
-        # Test
-        result = list(registry.get_compatible_providers("test-model"))
+        with patch('no_llm.models.registry.ModelRegistry.get') as mock_get_model:
+            result = list(registry.get_compatible_providers("groq-mixtral"))
 
-        mock_get_model.assert_called_once_with("test-model")
-        mock_list_by_type.assert_called_once_with("anthropic", only_valid=True, only_active=True)
+        # Answered from the index, without building the model or instantiating provider classes
+        mock_get_model.assert_not_called()
+        assert [call.args[0] for call in mock_list_by_type.call_args_list] == ["groq", "openrouter"]
+        mock_list_by_type.assert_called_with("openrouter", only_valid=True, only_active=True)
         assert result == [mock_provider]
 
-    @patch('no_llm.providers.registry.ProviderRegistry.get')
-    @patch('no_llm.models.registry.ModelRegistry.list')
-    def test_get_models_for_provider(self, mock_list_models, mock_get_provider, registry: Registry):
-        # Mock provider
-        mock_provider = Mock(spec=ProviderConfiguration)
-        mock_provider.type = "anthropic"
-        mock_get_provider.return_value = mock_provider
-
-        # Mock models with compatible provider types
-        mock_provider_class = type(mock_provider)
-
-        compatible_model = Mock(spec=ModelConfiguration)
-        compatible_model._compatible_providers = {mock_provider_class}
-        compatible_model.identity = Mock()
-        compatible_model.identity.id = "compatible-model"
-
-        incompatible_model = Mock(spec=ModelConfiguration)
-        incompatible_model._compatible_providers = {Mock}  # Different provider type
-        incompatible_model.identity = Mock()
-        incompatible_model.identity.id = "incompatible-model"
-
-        mock_list_models.return_value = [compatible_model, incompatible_model]
+    def test_get_models_for_provider(self, registry: Registry):
+        registry.models.set_active("gpt-4", False)
+        registry.models.register(registry.models.get("gpt-4o").model_copy(update={"identity": ModelIdentity(
+            id="custom-gpt", name="Custom", version="1", description="Custom", creator="test"
+        )}))
 
-        # Test
-        result = list(registry.get_models_for_provider("test-provider"))
+        result = [model.identity.id for model in registry.get_models_for_provider("openai", only_valid=False)]
 
-        mock_get_provider.assert_called_once_with("test-provider")
-        mock_list_models.assert_called_once_with(only_valid=True, only_active=True)
-        assert result == [compatible_model]
+        expected = [
+            model.identity.id
+            for model in registry.models.list(only_active=True)
+            if OpenAIProvider in model._compatible_providers
+        ]
+        assert result == expected
+        assert "gpt-4o" in result and "custom-gpt" in result
+        assert "gpt-4" not in result
+        assert "claude-3.5-haiku" not in result
 
     @patch('no_llm.models.registry.ModelRegistry.reload')
     @patch('no_llm.providers.registry.ProviderRegistry.reload')
@@ -97,68 +86,178 @@ class TestRegistry:
         mock_providers_reload.assert_called_once()
 
     def test_get_compatible_providers_with_filters(self, registry: Registry):
-        with patch.object(registry.models, 'get') as mock_get_model, \
-             patch.object(registry.providers, 'list_by_type') as mock_list_by_type:
-
-            mock_provider_class = Mock()
-            mock_provider_class.return_value.type = "anthropic"
-
-            mock_model = Mock(spec=ModelConfiguration)
-            mock_model._compatible_providers = {mock_provider_class}
-            mock_model.identity = Mock()
-            mock_model.identity.id = "test-model"
-            mock_get_model.return_value = mock_model
-
+        with patch.object(registry.providers, 'list_by_type') as mock_list_by_type:
             mock_list_by_type.return_value = []
 
-            list(registry.get_compatible_providers("test-model", only_valid=False, only_active=False))
+            list(registry.get_compatible_providers("groq-mixtral", only_valid=False, only_active=False))
 
-            mock_list_by_type.assert_called_once_with("anthropic", only_valid=False, only_active=False)
+            mock_list_by_type.assert_any_call("groq", only_valid=False, only_active=False)
+            mock_list_by_type.assert_any_call("openrouter", only_valid=False, only_active=False)
 
     def test_get_models_for_provider_with_filters(self, registry: Registry):
-        with patch.object(registry.providers, 'get') as mock_get_provider, \
-             patch.object(registry.models, 'list') as mock_list_models:
-
-            mock_provider = Mock(spec=ProviderConfiguration)
-            mock_provider.type = "anthropic"
-            mock_get_provider.return_value = mock_provider
-
+        with patch.object(registry.models, 'list') as mock_list_models:
             mock_list_models.return_value = []
 
-            list(registry.get_models_for_provider("test-provider", only_valid=False, only_active=False))
+            list(registry.get_models_for_provider("anthropic", only_valid=False, only_active=False))
 
-            mock_list_models.assert_called_once_with(only_valid=False, only_active=False)
+            mock_list_models.assert_called_once_with(compatible_provider="anthropic", only_valid=False, only_active=False)
 
     def test_multiple_provider_types_compatibility(self, registry: Registry):
-        with patch.object(registry.models, 'get') as mock_get_model, \
-             patch.object(registry.providers, 'list_by_type') as mock_list_by_type:
-
-            # Model supports multiple provider types
-            mock_provider_class1 = Mock()
-            mock_provider_class1.return_value.type = "anthropic"
-            mock_provider_class2 = Mock()
-            mock_provider_class2.return_value.type = "openai"
-
-            mock_model = Mock(spec=ModelConfiguration)
-            mock_model._compatible_providers = {mock_provider_class1, mock_provider_class2}
-            mock_model.identity = Mock()
-            mock_model.identity.id = "multi-provider-model"
-            mock_get_model.return_value = mock_model
-
-            mock_provider1 = Mock(spec=ProviderConfiguration)
-            mock_provider2 = Mock(spec=ProviderConfiguration)
-
-            def side_effect(provider_type, **kwargs):
-                if provider_type == "anthropic":
-                    return [mock_provider1]
-                elif provider_type == "openai":
-                    return [mock_provider2]
-                return []
-
-            mock_list_by_type.side_effect = side_effect
-
-            result = list(registry.get_compatible_providers("test-model"))
-
-            assert len(result) == 2
-            assert mock_provider1 in result
-            assert mock_provider2 in result
+        registry.providers.register(AnthropicProvider(id="anthropic-eu", name="Anthropic EU"))
+        registry.providers.remove("bedrock")
+
+        result = {provider.id for provider in registry.get_compatible_providers("claude-3.5-haiku", only_valid=False)}
+
+        assert result == {"anthropic", "anthropic-eu", "openrouter", "vertex"}
+
+    def test_compatibility_for_unknown_model(self, registry: Registry):
+        with pytest.raises(ModelNotFoundError):
+            list(registry.get_compatible_providers("missing-model"))
+
+    def test_generation(self, registry: Registry):
+        generation = registry.generation
+        registry.providers.set_active("anthropic", False)
+        assert registry.generation > generation
+        generation = registry.generation
+        registry.models.set_active("gpt-4o", False)
+        assert registry.generation > generation
+        generation = registry.generation
+        assert not registry.reload()
+        assert registry.generation == generation
+
+    def test_snapshot_round_trip(self, tmp_path):
+        config_dir = tmp_path / "config"
+        (config_dir / "models").mkdir(parents=True)
+        (config_dir / "models" / "tenant-gpt.yml").write_text(
+            "identity:\n  id: tenant-gpt\n  base_config: gpt-4o\n  description: Tenant model\n"
+            "parameters:\n  temperature: 0.3\n"
+        )
+        registry = Registry(config_dir)
+        registry.models.set_active("gpt-4", False)
+        snapshot = tmp_path / "registry.snapshot"
+        registry.save_snapshot(snapshot)
+
+        restored = Registry.load_snapshot(snapshot, config_dir, lazy=True)
+
+        def state(model: ModelConfiguration):
+            parameters = {name: getattr(model.parameters, name) for name in type(model.parameters).model_fields}
+            return type(model), model.model_dump(), parameters
+
+        assert [state(m) for m in restored.models.list()] == [state(m) for m in registry.models.list()]
+        assert [p.model_dump() for p in restored.providers.list()] == [p.model_dump() for p in registry.providers.list()]
+        assert restored.models.get("tenant-gpt").parameters.temperature.get() == 0.3
+        assert "gpt-4" not in {m.identity.id for m in restored.models.list(only_active=True)}
+
+    def test_snapshot_keeps_env_var_references(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-secret")
+        snapshot = tmp_path / "registry.snapshot"
+        Registry().save_snapshot(snapshot)
+
+        assert "sk-secret" not in snapshot.read_text()
+        assert str(Registry.load_snapshot(snapshot).providers.get("openai").api_key) == "sk-secret"
+
+    def test_snapshot_rebuilt_when_config_changes(self, tmp_path):
+        config_dir = tmp_path / "config"
+        (config_dir / "models").mkdir(parents=True)
+        model_file = config_dir / "models" / "gpt-4o.yml"
+        model_file.write_text("identity:\n  id: gpt-4o\n  description: First\n")
+        snapshot = tmp_path / "registry.snapshot"
+        Registry(config_dir).save_snapshot(snapshot)
+
+        model_file.write_text("identity:\n  id: gpt-4o\n  description: Second\n")
+        with patch("no_llm.models.registry.ModelRegistry._restore") as restore:
+            registry = Registry.load_snapshot(snapshot, config_dir)
+        restore.assert_not_called()
+        assert registry.models.get("gpt-4o").identity.description == "Second"
+
+        # The rebuilt registry replaced the stale snapshot
+        assert Registry.load_snapshot(snapshot, config_dir).models.get("gpt-4o").identity.description == "Second"
+
+    def test_snapshot_missing_or_corrupt(self, tmp_path):
+        snapshot = tmp_path / "registry.snapshot"
+        assert "gpt-4o" in {m.identity.id for m in Registry.load_snapshot(snapshot).models.list()}
+        assert snapshot.exists()
+
+        snapshot.write_text("{not json")
+        assert "gpt-4o" in {m.identity.id for m in Registry.load_snapshot(snapshot).models.list()}
+
+    def test_snapshot_rebuilt_when_model_sources_change(self, tmp_path, monkeypatch):
+        from no_llm import _snapshot
+
+        sources = tmp_path / "model_configs"
+        (sources / "openai").mkdir(parents=True)
+        source = sources / "openai" / "gpt_4o.py"
+        source.write_text("DESCRIPTION = 'First'\n")
+        monkeypatch.setattr(_snapshot, "_MODEL_CONFIGS", sources)
+        before = _snapshot.fingerprint(None)
+
+        source.write_text("DESCRIPTION = 'Second'\n")
+        assert _snapshot.fingerprint(None) != before
+
+    def test_snapshot_unloadable_model_is_skipped(self, tmp_path):
+        snapshot = tmp_path / "registry.snapshot"
+        Registry().save_snapshot(snapshot)
+        document = json.loads(snapshot.read_text())
+        for entry in document["models"]:
+            if entry["config"]["identity"]["id"] == "gpt-4o":
+                entry["module"] = "antigravity"
+        snapshot.write_text(json.dumps(document))
+
+        restored = Registry.load_snapshot(snapshot, lazy=True)
+        assert restored.models.get("gpt-4") is not None
+        assert "gpt-4o" not in {m.identity.id for m in restored.models.list()}
+        with pytest.raises(ModelNotFoundError):
+            restored.models.get("gpt-4o")
+        assert "antigravity" not in sys.modules
+
+    def test_snapshot_model_class_never_imports_unknown_modules(self):
+        from no_llm._snapshot import SnapshotError, load_model_class
+
+        assert load_model_class("no_llm.models.config.model", "ModelConfiguration") is ModelConfiguration
+        gpt_4o = load_model_class("no_llm.models.model_configs.openai.gpt_4o", "GPT4OConfiguration")
+        assert gpt_4o.__name__ == "GPT4OConfiguration"
+        with pytest.raises(SnapshotError):
+            load_model_class("no_llm.errors", "ModelNotFoundError")
+        with pytest.raises(SnapshotError):
+            load_model_class("antigravity", "ModelConfiguration")
+        assert "antigravity" not in sys.modules
+    def test_shared_registry(self, tmp_path):
+        config_dir = tmp_path / "config"
+        (config_dir / "models").mkdir(parents=True)
+        (config_dir / "models" / "tenant-gpt.yml").write_text(
+            "identity:\n  id: tenant-gpt\n  base_config: gpt-4o\n  description: Tenant model\n"
+        )
+        registry = Registry(config_dir)
+        registry.models.set_active("gpt-4", False)
+        image = tmp_path / "registry.shm"
+        registry.publish_shared(image)
+
+        attached = Registry.attach_shared(image, config_dir)
+
+        # Nothing is decoded until it is accessed
+        assert attached.models.state.models == {}
+        assert attached.models.get("tenant-gpt").identity.description == "Tenant model"
+        assert list(attached.models.state.models) == ["tenant-gpt"]
+        assert [(type(m), m.model_dump()) for m in attached.models.list()] == [
+            (type(m), m.model_dump()) for m in registry.models.list()
+        ]
+        assert [p.model_dump() for p in attached.providers.list()] == [p.model_dump() for p in registry.providers.list()]
+        assert "gpt-4" not in {m.identity.id for m in attached.models.list(only_active=True)}
+
+        (config_dir / "models" / "tenant-gpt.yml").write_text("identity:\n  id: tenant-gpt\n  description: Edited\n")
+        with pytest.raises(ValueError, match="stale"):
+            Registry.attach_shared(image, config_dir)
+        image.write_bytes(b"garbage")
+        with pytest.raises(ValueError, match="not a registry image"):
+            Registry.attach_shared(image)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+    def test_shared_registry_in_forked_worker(self, tmp_path):
+        image = tmp_path / "registry.shm"
+        Registry(lazy=True).publish_shared(image)
+
+        context = multiprocessing.get_context("fork")
+        with context.Pool(1) as pool:
+            description = pool.apply(_describe_shared, (image, "gpt-4o"))
+        assert description == Registry().models.get("gpt-4o").identity.description
+
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+from no_llm.registry import Registry
+from no_llm.watcher import ConfigWatcher, _Inotify, _Poller
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    (tmp_path / "models").mkdir()
+    (tmp_path / "providers").mkdir()
+    (tmp_path / "models" / "tenant.yml").write_text(
+        "identity:\n  id: tenant\n  base_config: gpt-4o\n  description: First\n"
+    )
+    return tmp_path
+
+
+def _edit(config_dir: Path, description: str) -> None:
+    (config_dir / "models" / "tenant.yml").write_text(
+        f"identity:\n  id: tenant\n  base_config: gpt-4o\n  description: {description}\n"
+    )
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_debounces_changes(config_dir: Path, use_inotify: bool):
+    registry = Registry(config_dir, lazy=True)
+    reloaded = threading.Event()
+    reloads = []
+
+    def on_reload(changes, duration):
+        reloads.append((changes, duration))
+        reloaded.set()
+
+    watcher = ConfigWatcher(registry, debounce=0.2, poll_interval=0.05, use_inotify=use_inotify, on_reload=on_reload)
+    with watcher:
+        for i in range(5):
+            _edit(config_dir, f"Edit {i}")
+        (config_dir / "providers" / "openai-eu.yml").write_text("type: openai\nid: openai-eu\nname: OpenAI EU\n")
+        assert reloaded.wait(5)
+
+    assert len(reloads) == 1
+    changes, duration = reloads[0]
+    assert changes.models.updated == {"tenant"}
+    assert changes.providers.added == {"openai-eu"}
+    assert registry.models.get("tenant").identity.description == "Edit 4"
+    assert watcher.metrics.reloads == 1
+    assert watcher.metrics.last_duration == duration
+
+
+def test_watcher_runs_on_event_loop(config_dir: Path):
+    registry = Registry(config_dir, lazy=True)
+    watcher = ConfigWatcher(registry, debounce=0.1)
+
+    async def main() -> None:
+        reloaded = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        watcher.on_reload = lambda *_: loop.call_soon_threadsafe(reloaded.set)
+        task = asyncio.create_task(watcher.run())
+        await asyncio.sleep(0.1)
+        _edit(config_dir, "Second")
+        await asyncio.wait_for(reloaded.wait(), 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert registry.models.get("tenant").identity.description == "Second"
+    assert watcher.metrics.reloads == 1
+
+
+def test_watcher_requires_config_dir():
+    with pytest.raises(ValueError, match="config directory"):
+        ConfigWatcher(Registry(lazy=True))
+
+
+def test_watcher_polls_when_inotify_fails(config_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    registry = Registry(config_dir, lazy=True)
+    monkeypatch.setattr("ctypes.util.find_library", lambda _: None)
+    assert isinstance(ConfigWatcher(registry)._open_source(), _Poller)
+    monkeypatch.undo()
+
+    def fail(self, timeout):
+        raise OSError(28, "inotify_add_watch failed")
+
+    reloaded = threading.Event()
+    watcher = ConfigWatcher(registry, debounce=0.1, poll_interval=0.05, on_reload=lambda *_: reloaded.set())
+    monkeypatch.setattr(_Inotify, "wait", fail)
+    with watcher:
+        _edit(config_dir, "Second")
+        assert reloaded.wait(5)
+        assert isinstance(watcher._source, _Poller)
+    assert registry.models.get("tenant").identity.description == "Second"
+
+
+def test_watcher_stop_keeps_a_running_thread(config_dir: Path):
+    registry = Registry(config_dir, lazy=True)
+    reloading, release = threading.Event(), threading.Event()
+
+    def on_reload(*_):
+        reloading.set()
+        release.wait(5)
+
+    watcher = ConfigWatcher(registry, debounce=0.05, use_inotify=False, poll_interval=0.05, on_reload=on_reload)
+    watcher.start()
+    _edit(config_dir, "Second")
+    assert reloading.wait(5)
+    watcher.stop(timeout=0.05)
+    with pytest.raises(RuntimeError, match="already started"):
+        watcher.start()
+    release.set()
+    watcher.stop()
+    assert watcher.start() is watcher
+    watcher.stop()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative `python -X importtime` budget for `import no_llm`, in milliseconds. Importing a single
+# provider SDK at module level is enough to blow through it.
+IMPORT_BUDGET_MS = float(os.getenv("NO_LLM_IMPORT_BUDGET_MS", "1000"))
+
+SDK_MODULES = [
+    "anthropic",
+    "boto3",
+    "google.genai",
+    "groq",
+    "httpx",
+    "mistralai",
+    "mistralai_gcp",
+    "openai",
+    "pydantic_ai",
+]
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_import_us(stderr: str, module: str) -> int:
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, _, cumulative, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        if name == module:
+            return int(cumulative)
+    msg = f"{module} not found in -X importtime output"
+    raise AssertionError(msg)
+
+
+@pytest.mark.parametrize("statement", ["import no_llm", "from no_llm import Registry"])
+def test_import_does_not_load_provider_sdks(statement: str):
+    result = _run(f"import sys; {statement}; print(','.join(m for m in {SDK_MODULES!r} if m in sys.modules))")
+    assert result.stdout.strip() == ""
+
+
+def test_import_time_budget():
+    # Take the best of a few runs to keep the check stable on noisy machines
+    timings = [_cumulative_import_us(_run("import no_llm", "-X", "importtime").stderr, "no_llm") for _ in range(3)]
+    assert min(timings) / 1000 < IMPORT_BUDGET_MS
@@ -175,6 +175,9 @@ class TestIterMethod:
         configs = list(preset.iter(registry_with_test_models))
 
         assert len(configs) >= 1
+        assert all(config.parameters.temperature.value == 0.7 for config in configs)
+        # The registry's configuration is not modified by the preset parameters
+        assert registry_with_test_models.get(model_id).parameters.temperature.value != 0.7
 
     def test_iter_nested_presets(self, registry_with_test_models: ModelRegistry, available_models: list[str]):
         nested_preset = ModelPreset(models=[available_models[1]])